@@ -2,9 +2,31 @@
 # agents/builder.py
 import re
 import json
+import asyncio
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Optional
+from ..utils.config import Config
+from ..tracker.pipeline_tracker import emit_nodes
+
+_NODE_NAME_RE = re.compile(r"<node_name>(.*?)</node_name>")
+
+
+def estimate_tokens(messages: List[Any]) -> int:
+    """Rough prompt size (~4 chars per token) — used when the provider reports no usage."""
+    chars = 0
+    for m in messages:
+        chars += len(str(getattr(m, "content", "") or ""))
+        tool_calls = getattr(m, "tool_calls", None)
+        if tool_calls:
+            chars += len(json.dumps(tool_calls, default=str))
+    return chars // 4
+
+
+# Tools that only read the node catalogue. Calls to these are independent of
+# each other and of the workflow, so one response's batch can run concurrently.
+# Every other tool mutates the workflow and is applied in the order the LLM issued it.
+READ_ONLY_TOOLS = frozenset({"search_nodes", "get_node_details", "resolve_node_type"})
 
 #
 # JSON comment/trailing-comma stripper#
@@ -156,10 +178,25 @@ User request: {user_input}"""
         # A simple 4-node workflow needs ~8 tool calls, well within 12.
         MAX_ITER = 12
 
+        # ── Compaction bookkeeping ────────────────────────────────
+        # `messages` keeps the full history; what is actually sent is
+        # compacted so the prompt stays ~flat instead of growing every round.
+        resolved: Dict[str, str] = {}     # requested node_type → resolved type
+        seen_nodes: List[str] = []        # node names returned by catalogue lookups
+        token_log: List[Dict[str, int]] = []
+
         done = False
+        llm_calls = 0
         for iteration in range(MAX_ITER):
+            prompt = (
+                self._compact_messages(messages, workflow, resolved, seen_nodes)
+                if Config.BUILDER_COMPACTION else list(messages)
+            )
+            prompt_estimate  = estimate_tokens(prompt)
+            history_estimate = estimate_tokens(messages)
             try:
-                response = await self.llm_with_tools.ainvoke(messages)
+                llm_calls += 1
+                response = await self.llm_with_tools.ainvoke(prompt)
             except Exception as e:
                 err = str(e)
                 if 'tool calling' in err.lower() and 'not supported' in err.lower():
@@ -177,13 +214,32 @@ User request: {user_input}"""
             response = sanitize_tool_calls(response)
             messages.append(response)
 
+            usage = getattr(response, "usage_metadata", None) or {}
+            entry = {
+                "iteration":    iteration + 1,
+                "sent":         usage.get("input_tokens") or prompt_estimate,
+                "full_history": history_estimate,
+                "estimated":    prompt_estimate,
+            }
+            token_log.append(entry)
+            print(
+                f"   📉 iter {entry['iteration']}: prompt ~{entry['estimated']} tok "
+                f"(full history ~{entry['full_history']})"
+            )
+
             tool_calls = getattr(response, "tool_calls", None)
             if not tool_calls:
                 # LLM finished naturally — no more tool calls
                 break
 
-            for tc in tool_calls:
-                result = await self._execute_tool(tc["name"], tc["args"])
+            known_ids = {n.id for n in workflow.nodes}
+            results = await self._execute_tool_calls(tool_calls)
+            if state.get("session_id"):
+                await emit_nodes(state["session_id"], "builder",
+                                 [n for n in workflow.nodes if n.id not in known_ids])
+
+            for tc, result in zip(tool_calls, results):
+                self._track_progress(tc, result, workflow, resolved, seen_nodes)
                 short  = str(result)[:120]
                 print(f"   🔧 {tc['name']}({list(tc['args'].keys())}) → {short}")
                 messages.append(ToolMessage(content=str(result), tool_call_id=tc["id"]))
@@ -201,36 +257,148 @@ User request: {user_input}"""
                 break
 
         # ── Safety net: auto-connect if LLM forgot ────────────────
-        connection_count = sum(
-            len(arr[0]) if arr else 0
-            for conns in workflow.connections.values()
-            for arr in conns.values()
-        )
-
-        if connection_count == 0 and len(workflow.nodes) > 1:
+        if workflow.connection_count == 0 and len(workflow.nodes) > 1:
             print("   ⚠️  No connections — auto-linking nodes in sequence")
-            from ..types.workflow import WorkflowConnection
             for i in range(len(workflow.nodes) - 1):
                 src, tgt = workflow.nodes[i], workflow.nodes[i + 1]
-                workflow.connections.setdefault(src.name, {}).setdefault("main", [[]])
-                workflow.connections[src.name]["main"][0].append(
-                    WorkflowConnection(node=tgt.name, type="main", index=0)
-                )
+                workflow.connect(src.name, tgt.name)
                 print(f"   🔗 Auto-linked: '{src.name}' → '{tgt.name}'")
 
-        connection_count = sum(
-            len(arr[0]) if arr else 0
-            for conns in workflow.connections.values()
-            for arr in conns.values()
-        )
+        connection_count = workflow.connection_count
 
         print(f"   → {len(workflow.nodes)} nodes, {connection_count} connections, {iteration+1} iterations used")
 
+        sent_total = sum(e["estimated"] for e in token_log)
+        full_total = sum(e["full_history"] for e in token_log)
+        if full_total:
+            print(
+                f"   📉 prompt tokens ~{sent_total} sent vs ~{full_total} uncompacted "
+                f"({100 - (100 * sent_total // full_total)}% saved)"
+            )
+
         return {
             "summary": f"Built workflow with {len(workflow.nodes)} nodes and {connection_count} connections",
             "nodes_added": len(workflow.nodes),
+            "llm_calls": llm_calls,
+            "token_usage": {
+                "prompt_tokens":         sum(e["sent"] for e in token_log),
+                "estimated_sent_tokens": sent_total,
+                "uncompacted_tokens":    full_total,
+                "per_iteration":         token_log,
+            },
         }
 
+    # ──────────────────────────────────────────────────────────────
+    # Prompt compaction
+    # ──────────────────────────────────────────────────────────────
+
+    def _compact_messages(
+        self,
+        messages: List[Any],
+        workflow,
+        resolved: Dict[str, str],
+        seen_nodes: List[str],
+    ) -> List[Any]:
+        """
+        Keep the system prompt, the build request and the last
+        BUILDER_KEEP_ROUNDS rounds verbatim; fold everything older into one
+        progress summary. A round is an AIMessage plus the ToolMessages
+        answering it, so tool_call ids in the kept tail always have replies.
+        """
+        head, rounds = messages[:2], []
+        for m in messages[2:]:
+            if isinstance(m, AIMessage) or not rounds:
+                rounds.append([m])
+            else:
+                rounds[-1].append(m)
+
+        keep = max(1, Config.BUILDER_KEEP_ROUNDS)
+        if len(rounds) <= keep:
+            return messages
+
+        tail = [m for r in rounds[-keep:] for m in r]
+        summary = self._progress_summary(workflow, resolved, seen_nodes)
+        return head + [HumanMessage(content=summary)] + tail
+
+    def _progress_summary(self, workflow, resolved: Dict[str, str], seen_nodes: List[str]) -> str:
+        """Compact running state of the build — replaces the raw tool history."""
+        lines = ["PROGRESS SO FAR (earlier tool results compacted):"]
+
+        if workflow.nodes:
+            lines.append(f"Nodes ({len(workflow.nodes)}):")
+            for n in workflow.nodes:
+                lines.append(f"  - {n.name} [{n.type}, {n.role or 'auto'}]")
+        else:
+            lines.append("Nodes: none yet")
+
+        edges = [
+            f"{src} → {c.node}" + ("" if ct == "main" else f" ({ct})")
+            for src, conns in workflow.connections.items()
+            for ct, arrays in conns.items()
+            for arr in arrays
+            for c in arr
+        ]
+        lines.append("Connections: " + (", ".join(edges) if edges else "none yet"))
+
+        if resolved:
+            lines.append("Resolved types: " + ", ".join(f"{k} → {v}" for k, v in resolved.items()))
+        if seen_nodes:
+            lines.append("Catalogue nodes already looked up: " + ", ".join(seen_nodes))
+
+        lines.append("Continue from here — do not re-add or re-connect existing nodes.")
+        return "\n".join(lines)
+
+    def _track_progress(
+        self,
+        tc: Dict,
+        result: Optional[str],
+        workflow,
+        resolved: Dict[str, str],
+        seen_nodes: List[str],
+    ) -> None:
+        """Record what a tool call taught us so the summary can replace its raw output."""
+        if result is None:
+            return
+        name = tc["name"]
+        if name in READ_ONLY_TOOLS:
+            for node_name in _NODE_NAME_RE.findall(result):
+                if node_name not in seen_nodes:
+                    seen_nodes.append(node_name)
+        elif name == "add_node":
+            requested = str(tc["args"].get("node_type", ""))
+            node = workflow.get_node_by_name(tc["args"].get("name", ""))
+            if node and requested and requested != node.type:
+                resolved[requested] = node.type
+
+    async def _execute_tool_calls(self, tool_calls: List[Dict]) -> List[Optional[str]]:
+        """
+        Execute one response's tool calls.
+
+        Read-only lookups start straight away and run concurrently; mutating
+        calls run one at a time in the order the LLM issued them, so the
+        workflow ends up the same as with sequential execution. Results are
+        returned in tool_call order so the ToolMessages line up with the
+        AIMessage. Mutations after a passing validate_workflow are skipped
+        (result None) — the builder loop stops there anyway.
+        """
+        lookups = {
+            i: asyncio.ensure_future(self._execute_tool(tc["name"], tc["args"]))
+            for i, tc in enumerate(tool_calls)
+            if tc["name"] in READ_ONLY_TOOLS
+        }
+
+        results: List[Optional[str]] = [None] * len(tool_calls)
+        validated = False
+        for i, tc in enumerate(tool_calls):
+            if i in lookups or validated:
+                continue
+            results[i] = await self._execute_tool(tc["name"], tc["args"])
+            validated = tc["name"] == "validate_workflow" and "-->>" in results[i]
+
+        for i, task in lookups.items():
+            results[i] = await task
+        return results
+
     async def _execute_tool(self, tool_name: str, tool_args: Dict) -> str:
         t = self._tool_map.get(tool_name)
         if not t:
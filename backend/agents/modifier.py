@@ -0,0 +1,156 @@
+# agents/modifier.py
+"""
+Modify path for WORKFLOW_MODIFY turns on an existing session workflow.
+
+Instead of discovery + a builder that starts from an empty canvas, the LLM
+gets a compact listing of the current SimpleWorkflow and edit tools
+(update_parameters, remove_node, rewire_connection, add_node, connect).
+A round whose edits all succeed ends the loop without asking the LLM to
+confirm, so a small edit ("change the schedule to 8am", "remove the email
+node") is ONE call; a new node type that needs a search is two.
+validate_workflow runs once at the end outside the LLM loop.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+
+from .builder import READ_ONLY_TOOLS, BuilderAgent, estimate_tokens, sanitize_tool_calls
+from ..tracker.pipeline_tracker import emit_nodes
+from ..utils.config import Config
+
+_PARAM_CHARS = 240   # per-node parameter JSON in the listing
+
+
+def _failed(result: Optional[str]) -> bool:
+    text = (result or "").lstrip()
+    return not text or text.startswith(("❌", "Error", "Tool error"))
+
+
+def describe_workflow(workflow) -> str:
+    """Compact listing: one line per node (type, role, parameters) and one per edge."""
+    lines = [f"Workflow '{workflow.name}' — {len(workflow.nodes)} nodes"]
+    for n in workflow.nodes:
+        params = json.dumps(n.parameters, ensure_ascii=False, default=str, separators=(",", ":"))
+        if len(params) > _PARAM_CHARS:
+            params = params[:_PARAM_CHARS] + "…"
+        lines.append(f"  - {n.name} [{n.type}, {n.role or 'action'}] {params}")
+
+    edges = []
+    for src, conn_types in workflow.connections.items():
+        for conn_type, arrays in conn_types.items():
+            for branch, arr in enumerate(arrays):
+                for c in arr:
+                    label = f" (output {branch})" if len(arrays) > 1 else ""
+                    if conn_type != "main":
+                        label += f" ({conn_type})"
+                    edges.append(f"  {src} → {c.node}{label}")
+    lines.append("Connections:" if edges else "Connections: none")
+    lines.extend(edges)
+    return "\n".join(lines)
+
+
+class ModifierAgent(BuilderAgent):
+    """Edits the session's existing workflow in as few LLM calls as possible."""
+
+    def __init__(self, llm: BaseChatModel, tools: List[Any], search_engine, validate_tool):
+        super().__init__(llm, tools, search_engine)
+        self.validate_tool = validate_tool
+
+    async def build_workflow(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        workflow   = state["workflow_json"]
+        user_input = self._extract_last_user_message(state)
+
+        system_prompt = f"""You are a workflow editor. The user wants to CHANGE the existing workflow below — do not rebuild it.
+
+CURRENT WORKFLOW
+{describe_workflow(workflow)}
+
+TOOLS
+  update_parameters  → change values of an existing node (schedule, message, URL, condition ...)
+  remove_node        → delete a node; its neighbours are reconnected automatically
+  rewire_connection  → move an existing connection to another node, or delete it
+  add_node + connect_nodes_by_name → only when a NEW step is needed
+  search_nodes       → only if you do not know the exact node type for add_node
+
+RULES
+1. Use the exact node names listed above.
+2. Make ALL the needed edits in ONE response (several tool calls at once) — no extra checks.
+3. Touch only what the user asked for; everything else stays as it is.
+4. Parameters pure JSON — no // comments, no trailing commas.
+User request: {user_input}"""
+
+        messages = [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=f"Apply this change now: {user_input}"),
+        ]
+
+        token_log: List[Dict[str, int]] = []
+        llm_calls = 0
+        edits = 0
+        for iteration in range(Config.MODIFIER_MAX_ITERATIONS):
+            prompt_estimate = estimate_tokens(messages)
+            try:
+                llm_calls += 1
+                response = await self.llm_with_tools.ainvoke(messages)
+            except Exception as e:
+                err = str(e)
+                if 'Failed to parse tool call' in err or 'tool_use_failed' in err:
+                    messages.append(HumanMessage(
+                        content="JSON parse error: remove all // comments and trailing commas from parameters, then retry."
+                    ))
+                    continue
+                raise
+
+            response = sanitize_tool_calls(response)
+            messages.append(response)
+            usage = getattr(response, "usage_metadata", None) or {}
+            token_log.append({
+                "iteration": iteration + 1,
+                "sent":      usage.get("input_tokens") or prompt_estimate,
+                "estimated": prompt_estimate,
+            })
+
+            tool_calls = getattr(response, "tool_calls", None)
+            if not tool_calls:
+                break
+
+            known_ids = {n.id for n in workflow.nodes}
+            results = await self._execute_tool_calls(tool_calls)
+            if state.get("session_id"):
+                await emit_nodes(state["session_id"], "builder",
+                                 [n for n in workflow.nodes if n.id not in known_ids])
+
+            failed = False
+            round_edits = 0
+            for tc, result in zip(tool_calls, results):
+                print(f"   🔧 {tc['name']}({list(tc['args'].keys())}) → {str(result)[:120]}")
+                messages.append(ToolMessage(content=str(result), tool_call_id=tc["id"]))
+                if tc["name"] in READ_ONLY_TOOLS or tc["name"] == "validate_workflow":
+                    continue
+                if _failed(result):
+                    failed = True
+                else:
+                    round_edits += 1
+            edits += round_edits
+
+            # Edits applied cleanly → done, no confirmation round trip.
+            # Lookups only, or a failed edit → one more call with the results.
+            if round_edits and not failed:
+                break
+
+        validation = str(self.validate_tool.invoke({}))
+        print(f"   -->> Modify: {edits} edit(s) in {llm_calls} LLM call(s); {validation.splitlines()[0]}")
+
+        return {
+            "summary": f"Applied {edits} edit(s) to the workflow ({len(workflow.nodes)} nodes)",
+            "nodes_added": len(workflow.nodes),
+            "llm_calls": llm_calls,
+            "token_usage": {
+                "prompt_tokens":         sum(e["sent"] for e in token_log),
+                "estimated_sent_tokens": sum(e["estimated"] for e in token_log),
+                "per_iteration":         token_log,
+            },
+        }
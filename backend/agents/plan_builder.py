@@ -0,0 +1,280 @@
+# agents/plan_builder.py
+"""
+PlanBuilderAgent — plan-then-apply alternative to the BuilderAgent tool loop.
+
+The tool loop needs one LLM round trip per tool-call batch (trigger, actions,
+connections, validation). Here the model returns the WHOLE workflow as one
+JSON plan (nodes, roles, parameters, edges). The plan is applied locally:
+
+  1. node types resolved via search_engine.resolve_node_type
+  2. nodes / connections written into the SimpleWorkflow
+  3. structural problems collected (unknown types, dangling edges, trigger)
+  4. validate_workflow run for the final auto-fixes
+
+Only when step 3 finds problems is the model re-prompted — with a compact
+list of the problems, not the tool history.
+"""
+
+import json
+import re
+import uuid
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel, Field, ValidationError
+
+from .builder import strip_json_comments
+from ..tracker.pipeline_tracker import emit_nodes
+from ..types.workflow import SimpleWorkflow, WorkflowNode
+
+
+class PlannedNode(BaseModel):
+    name: str = Field(description="Unique descriptive label")
+    node_type: str = Field(description="Exact node name from the catalogue")
+    role: Literal["trigger", "action", "conditional"] = "action"
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+
+
+# Highest output index a plan may use — SWITCH outputs 0..MAX_BRANCH. Bounds
+# SimpleWorkflow.connect, which pads the branch list up to the index.
+MAX_BRANCH = 15
+
+
+class PlannedEdge(BaseModel):
+    source: str
+    target: str
+    branch: int = Field(default=0, ge=0, le=MAX_BRANCH,
+                        description=f"Output index: IF 0=true 1=false, SWITCH 0..{MAX_BRANCH}")
+
+
+class WorkflowPlan(BaseModel):
+    nodes: List[PlannedNode]
+    edges: List[PlannedEdge] = Field(default_factory=list)
+
+
+PLAN_SYSTEM_PROMPT = """You are a workflow planner. Return the COMPLETE workflow for the user's request as ONE JSON object.
+
+AVAILABLE NODES
+  Triggers    (start the workflow): {triggers}
+  Actions     (do something):       {actions}
+  Conditionals (branch the flow):   {conditionals}
+
+RULES:
+1. The FIRST node is always exactly one trigger (role "trigger").
+   - Time words (every, daily, hourly, at 9am, schedule, cron, interval) → SCHEDULE trigger, never MANUAL
+   - Webhook / HTTP event / API call → WEBHOOK trigger
+   - Otherwise → MANUAL trigger
+2. node_type must be an EXACT name from the lists above.
+3. Node names are unique, descriptive labels.
+4. Every node except the trigger has at least one incoming edge.
+5. Conditionals: IF for one true/false split (branch 0 = true, 1 = false).
+   SWITCH for 3+ branches or separate explicit conditions (branch 0..{max_branch}).
+   Every other node has one output — branch 0.
+6. Parameters are pure JSON — no comments, no trailing commas.
+
+Respond with ONLY the JSON object — no markdown, no explanation:
+{{
+  "nodes": [
+    {{"name": "Every Morning", "node_type": "SCHEDULE", "role": "trigger", "parameters": {{}}}},
+    {{"name": "Send Message", "node_type": "TELEGRAM", "role": "action", "parameters": {{"message": "Hi"}}}}
+  ],
+  "edges": [
+    {{"source": "Every Morning", "target": "Send Message", "branch": 0}}
+  ]
+}}"""
+
+
+def _output_count(node_type: str) -> int:
+    """Outputs a node exposes on the canvas (see types/workflow._compile_geometry)."""
+    kind = (node_type or "").upper()
+    if kind == "IF":
+        return 2
+    if kind == "SWITCH":
+        return MAX_BRANCH + 1
+    return 1
+
+
+def _extract_json(text: str) -> dict:
+    """Extract the first JSON object from an LLM response (fences / comments tolerated)."""
+    text = re.sub(r"```(?:json)?", "", text or "").replace("```", "").strip()
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if match:
+        try:
+            return json.loads(strip_json_comments(match.group()))
+        except json.JSONDecodeError:
+            pass
+    return {}
+
+
+class PlanBuilderAgent:
+    """Builds the workflow from a single structured plan instead of a tool loop."""
+
+    # Plan + at most two corrections
+    MAX_ROUNDS = 3
+
+    def __init__(self, llm: BaseChatModel, search_engine, validate_tool):
+        self.llm = llm
+        self.search_engine = search_engine
+        self.validate_tool = validate_tool
+
+    async def build_workflow(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        workflow   = state["workflow_json"]
+        user_input = self._extract_last_user_message(state)
+
+        messages = [
+            SystemMessage(content=self._system_prompt()),
+            HumanMessage(content=f"User request: {user_input}"),
+        ]
+
+        problems: List[str] = []
+        llm_calls = 0
+        for round_no in range(1, self.MAX_ROUNDS + 1):
+            response = await self.llm.ainvoke(messages)
+            llm_calls += 1
+            content = response.content if hasattr(response, "content") else str(response)
+            messages.append(AIMessage(content=content))
+
+            plan, parse_error = self._parse_plan(content)
+            if plan is None:
+                problems = [parse_error]
+            else:
+                problems = self._apply_plan(workflow, plan)
+
+            print(f"   📐 Plan round {round_no}: {len(workflow.nodes)} nodes, {len(problems)} problem(s)")
+            if not problems:
+                break
+            if round_no < self.MAX_ROUNDS:
+                messages.append(HumanMessage(content=(
+                    "Your plan has these problems:\n"
+                    + "\n".join(f"- {p}" for p in problems)
+                    + "\nReturn the corrected COMPLETE plan as JSON only."
+                )))
+
+        # validate_workflow auto-fixes whatever is left (missing trigger, loose nodes)
+        validation = self.validate_tool.invoke({}) if workflow.nodes else "❌ Workflow is empty"
+        print(f"   🔧 validate_workflow → {str(validation)[:120]}")
+        if state.get("session_id"):
+            # Plans are applied whole — nodes are streamed once the last round settled
+            await emit_nodes(state["session_id"], "builder", workflow.nodes)
+
+        connection_count = workflow.connection_count
+        print(f"   → {len(workflow.nodes)} nodes, {connection_count} connections, {llm_calls} LLM call(s)")
+
+        return {
+            "summary": f"Built workflow with {len(workflow.nodes)} nodes and {connection_count} connections (plan mode)",
+            "nodes_added": len(workflow.nodes),
+            "llm_calls": llm_calls,
+            "unresolved_problems": problems,
+        }
+
+    # ──────────────────────────────────────────────────────────────
+    # Plan handling
+    # ──────────────────────────────────────────────────────────────
+
+    def _parse_plan(self, content: str) -> Tuple[Optional[WorkflowPlan], str]:
+        data = _extract_json(content)
+        if not data:
+            return None, "Response was not a JSON object with 'nodes' and 'edges'."
+        try:
+            return WorkflowPlan.model_validate(data), ""
+        except ValidationError as e:
+            fields = sorted({".".join(str(p) for p in err["loc"]) for err in e.errors()})
+            return None, f"Plan JSON does not match the schema (fields: {', '.join(fields)})."
+
+    def _apply_plan(self, workflow: SimpleWorkflow, plan: WorkflowPlan) -> List[str]:
+        """
+        Write the plan into the workflow (replacing any previous attempt) and
+        return the problems a re-prompt should fix. Problems are phrased
+        relative to the plan so the model can patch it directly.
+        """
+        workflow.clear()
+        problems: List[str] = []
+
+        for index, planned in enumerate(plan.nodes):
+            if workflow.get_node_by_name(planned.name):
+                problems.append(f"Duplicate node name '{planned.name}' — names must be unique.")
+                continue
+
+            resolved, reason = self.search_engine.resolve_node_type(planned.node_type)
+            if not (reason.startswith("Exact") or reason.startswith("Case-insensitive")):
+                problems.append(
+                    f"Node '{planned.name}': node_type '{planned.node_type}' is not in the catalogue "
+                    f"(closest is '{resolved}')."
+                )
+
+            workflow.add_node(WorkflowNode(
+                id=str(uuid.uuid4()),
+                name=planned.name,
+                type=resolved,
+                type_version=1,
+                position=(250 + index * 280, 300),
+                parameters=planned.parameters,
+                role=planned.role,
+            ))
+
+        if not workflow.nodes:
+            return problems + ["Plan has no nodes."]
+
+        triggers = [n for n in workflow.nodes if n.role == "trigger"]
+        if not triggers:
+            problems.append("No node has role 'trigger' — the first node must be a trigger.")
+        elif workflow.nodes[0].role != "trigger":
+            problems.append(f"First node '{workflow.nodes[0].name}' is not the trigger.")
+        if len(triggers) > 1:
+            problems.append("More than one trigger: " + ", ".join(n.name for n in triggers) + ".")
+
+        has_incoming = set()
+        for edge in plan.edges:
+            source = workflow.get_node_by_name(edge.source)
+            target = workflow.get_node_by_name(edge.target)
+            if not source or not target:
+                missing = edge.source if not source else edge.target
+                problems.append(f"Edge {edge.source} → {edge.target}: unknown node '{missing}'.")
+                continue
+            if source is target:
+                problems.append(f"Edge {edge.source} → {edge.target}: self-loop.")
+                continue
+            outputs = _output_count(source.type)
+            if edge.branch >= outputs:
+                valid = "branch 0 only" if outputs == 1 else f"branches 0..{outputs - 1}"
+                problems.append(
+                    f"Edge {edge.source} → {edge.target}: '{edge.source}' ({source.type}) has {valid}, "
+                    f"not branch {edge.branch}."
+                )
+                continue
+
+            workflow.connect(source.name, target.name, "main", edge.branch)
+            has_incoming.add(target.name)
+
+        for node in workflow.nodes:
+            if node.role != "trigger" and node.name not in has_incoming:
+                problems.append(f"Node '{node.name}' has no incoming edge.")
+
+        return problems
+
+    # ──────────────────────────────────────────────────────────────
+    # Helpers
+    # ──────────────────────────────────────────────────────────────
+
+    def _system_prompt(self) -> str:
+        all_nodes = self.search_engine.get_all_node_names()
+
+        def fmt(node_type: str) -> str:
+            return ", ".join(n["name"] for n in all_nodes if n["nodeType"] == node_type)
+
+        return PLAN_SYSTEM_PROMPT.format(
+            triggers=fmt("trigger"),
+            actions=fmt("action"),
+            conditionals=fmt("conditional"),
+            max_branch=MAX_BRANCH,
+        )
+
+    def _extract_last_user_message(self, state: Dict[str, Any]) -> str:
+        messages = state.get("messages", [])
+        if not messages:
+            return "Build the workflow"
+        last = messages[-1]
+        if isinstance(last, dict):
+            return last.get("content") or last.get("text") or "Build the workflow"
+        return getattr(last, "content", None) or str(last)
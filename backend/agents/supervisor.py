@@ -29,12 +29,21 @@ class SupervisorAgent:
         node_count = len(workflow.nodes)
         print(f" ->> Supervisor: Workflow has {node_count} nodes")
 
+        # Only this turn counts — a stored session carries earlier turns' log
+        turn_started_at = state.get("turn_started_at", 0.0)
         completed_phases = set()
         for entry in state.get("coordination_log", []):
-            if entry.status == "completed":
+            if entry.status == "completed" and entry.timestamp >= turn_started_at:
                 completed_phases.add(entry.phase)
 
         # Hard-coded routing logic to avoid LLM call overhead and avoid loops
+
+        # Edit of the session's existing workflow → no discovery, no configurator
+        if state.get("greeter_intent") == "WORKFLOW_MODIFY" and (
+            node_count > 0 or "builder" in completed_phases
+        ):
+            return "builder" if "builder" not in completed_phases else "responder"
+
         if not has_categorization or not has_best_practices:
             return "discovery"
 
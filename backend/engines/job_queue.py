@@ -0,0 +1,244 @@
+# engines/job_queue.py
+"""
+In-process job queue behind POST /workflow/jobs.
+
+A submitted job gets an id straight away; a fixed pool of asyncio workers
+(JOB_WORKERS) drains a priority queue and runs each job through the
+orchestrator. Clients poll GET /workflow/jobs/{id}, so no HTTP connection
+is held open for the whole multi-agent run.
+
+Priority: "high" jobs run before "normal" before "low"; FIFO within one.
+Cancelling a queued job just marks it (the worker skips it); a running
+job's task is cancelled, which cancels its pending LLM call.
+
+Finished jobs are kept for JOB_RETENTION_SECONDS (at most JOB_MAX_STORED)
+so results can still be fetched after completion.
+"""
+
+import asyncio
+import itertools
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..utils.config import Config
+from ..utils.metrics import JOB_QUEUE_DEPTH, JOB_RUN_SECONDS, JOB_WAIT_SECONDS, JOBS, JOBS_RUNNING
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+
+class JobStatus(str, Enum):
+    QUEUED    = "queued"
+    RUNNING   = "running"
+    DONE      = "done"
+    ERROR     = "error"
+    CANCELLED = "cancelled"
+
+
+FINISHED = (JobStatus.DONE, JobStatus.ERROR, JobStatus.CANCELLED)
+
+
+class QueueFull(Exception):
+    """More than JOB_MAX_QUEUED jobs are waiting."""
+
+
+@dataclass
+class Job:
+    id:           str
+    message:      str
+    session_id:   Optional[str] = None
+    builder_mode: Optional[str] = None
+    priority:     str = "normal"
+    status:       JobStatus = JobStatus.QUEUED
+    created_at:   float = field(default_factory=time.time)
+    started_at:   Optional[float] = None
+    finished_at:  Optional[float] = None
+    result:       Optional[Dict[str, Any]] = None
+    error:        Optional[str] = None
+    task:         Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {
+            "job_id":      self.id,
+            "status":      self.status.value,
+            "priority":    self.priority,
+            "session_id":  self.session_id,
+            "created_at":  self.created_at,
+            "started_at":  self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.started_at:
+            d["wait_ms"] = round((self.started_at - self.created_at) * 1000, 1)
+        if self.finished_at and self.started_at:
+            d["run_ms"] = round((self.finished_at - self.started_at) * 1000, 1)
+        if self.result is not None:
+            d["result"] = self.result
+        if self.error is not None:
+            d["error"] = self.error
+        return d
+
+
+class JobQueue:
+    """Bounded asyncio worker pool draining a priority queue of Jobs."""
+
+    def __init__(
+        self,
+        runner: Callable[[Job], Awaitable[Dict[str, Any]]],
+        workers: int = Config.JOB_WORKERS,
+        max_queued: int = Config.JOB_MAX_QUEUED,
+        retention: float = Config.JOB_RETENTION_SECONDS,
+        max_stored: int = Config.JOB_MAX_STORED,
+    ):
+        self.runner = runner
+        self.workers = workers
+        self.max_queued = max_queued
+        self.retention = retention
+        self.max_stored = max_stored
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._seq = itertools.count()
+        self._queued = 0       # waiting, not cancelled
+        self._running = 0
+        self._workers: List[asyncio.Task] = []
+        JOB_QUEUE_DEPTH.set_function(lambda: self._queued)
+        JOBS_RUNNING.set_function(lambda: self._running)
+
+    # ── Lifecycle ──
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.workers)
+        ]
+        print(f"--> Job queue: {self.workers} workers, max {self.max_queued} queued")
+
+    async def stop(self) -> None:
+        """Cancel the workers and whatever they are running."""
+        for w in self._workers:
+            w.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    # ── API ──
+
+    def submit(
+        self,
+        message: str,
+        session_id: Optional[str] = None,
+        builder_mode: Optional[str] = None,
+        priority: str = "normal",
+    ) -> Job:
+        if self._queued >= self.max_queued:
+            raise QueueFull(f"{self._queued} jobs waiting")
+        self._collect_finished()
+
+        job = Job(id=uuid.uuid4().hex, message=message, session_id=session_id,
+                  builder_mode=builder_mode, priority=priority)
+        self._jobs[job.id] = job
+        self._queued += 1
+        self._queue.put_nowait((PRIORITIES.get(priority, 1), next(self._seq), job))
+        JOBS.labels("submitted").inc()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def position(self, job: Job) -> Optional[int]:
+        """Jobs ahead of `job` in the queue (None once it has started)."""
+        if job.status != JobStatus.QUEUED:
+            return None
+        key = (PRIORITIES.get(job.priority, 1), job.created_at)
+        return sum(
+            1 for j in self._jobs.values()
+            if j.status == JobStatus.QUEUED and j is not job
+            and (PRIORITIES.get(j.priority, 1), j.created_at) <= key
+        )
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None or job.status in FINISHED:
+            return job
+        if job.status == JobStatus.QUEUED:
+            # Still in the heap — the worker drops it when it comes up
+            self._queued -= 1
+            self._finish(job, JobStatus.CANCELLED)
+        elif job.task is not None:
+            job.task.cancel()   # the worker sees it cancelled; _finish is idempotent
+            self._finish(job, JobStatus.CANCELLED)
+        return job
+
+    # ── Workers ──
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job = await self._queue.get()
+            if job.status != JobStatus.QUEUED:
+                continue   # cancelled while waiting
+            self._queued -= 1
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        JOB_WAIT_SECONDS.labels(job.priority).observe(job.started_at - job.created_at)
+        self._running += 1
+        task = job.task = asyncio.create_task(self.runner(job))
+        try:
+            # wait() instead of awaiting the task: a cancelled JOB must not
+            # look like a cancelled WORKER
+            await asyncio.wait([task])
+        except asyncio.CancelledError:
+            task.cancel()   # shutdown
+            self._finish(job, JobStatus.CANCELLED, "Server shutting down")
+            raise
+        finally:
+            self._running -= 1
+
+        if task.cancelled():
+            self._finish(job, JobStatus.CANCELLED)
+        elif task.exception() is not None:
+            e = task.exception()
+            print(f"X Job {job.id} failed: {e}")
+            self._finish(job, JobStatus.ERROR, f"Error building workflow: {e}")
+        else:
+            job.result = task.result()
+            self._finish(job, JobStatus.DONE)
+
+    def _finish(self, job: Job, status: JobStatus, error: Optional[str] = None) -> None:
+        if job.status in FINISHED:
+            return
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        job.task = None
+        if job.started_at:
+            JOB_RUN_SECONDS.labels(status.value).observe(job.finished_at - job.started_at)
+        JOBS.labels(status.value).inc()
+
+    def _collect_finished(self) -> None:
+        """Forget finished jobs past retention, and the oldest beyond max_stored."""
+        cutoff = time.time() - self.retention
+        stale = [
+            jid for jid, j in self._jobs.items()
+            if j.status in FINISHED and j.finished_at < cutoff
+        ]
+        for jid in stale:
+            del self._jobs[jid]
+        if len(self._jobs) >= self.max_stored:
+            for jid in [jid for jid, j in self._jobs.items() if j.status in FINISHED]:
+                if len(self._jobs) < self.max_stored:
+                    break
+                del self._jobs[jid]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued": self._queued,
+            "running": self._running,
+            "stored": len(self._jobs),
+        }
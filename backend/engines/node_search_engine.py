@@ -251,6 +251,8 @@ Public methods (unchanged):
   get_node_details(name, version)    → Optional[NodeDetails]
   get_all_node_names()               → List[Dict]
   format_result(result)              → str
+  list_nodes(after, limit, fields)   → (page, next name)   GET /nodes
+  catalog_version                    → content hash, changes on add/update/delete
 
 ES index schema:
   name          keyword + text (exact + full-text)
@@ -264,19 +266,31 @@ ES index schema:
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import orjson
 from elasticsearch import Elasticsearch, NotFoundError, ConnectionError as ESConnectionError
 
 from ..types.nodes import NodeSearchResult, NodeDetails
 from ..utils.node_normalizer import normalize_nodes
 from ..types.workflow import register_node_types
+from ..utils.metrics import SEARCH_ERRORS, SEARCH_SECONDS
 
 # ── Index name (override via env) ─────────────────────────────────────────────
 ES_INDEX = os.getenv("ES_NODE_INDEX", "yzero_nodes")
 
+# ── GET /nodes projection: fields returned unless the client asks for more ────
+# properties (the bulk of every node) / codex / class_* only on request
+NODE_LIST_FIELDS = (
+    "name", "displayName", "description", "nodeType", "version",
+    "id", "icon", "category_id", "category_name",
+)
+
 # ── Index mapping ─────────────────────────────────────────────────────────────
 INDEX_MAPPING = {
     "settings": {
@@ -390,10 +404,15 @@ class NodeSearchEngine:
     so development without a running ES instance still works.
     """
 
-    def __init__(self, node_types: List[Dict[str, Any]]):
+    def __init__(self, node_types: List[Dict[str, Any]], prepared: bool = False):
         # ── Normalize & dedupe ────────────────────────────────────
-        node_types = normalize_nodes(node_types)
-        self.node_types = self._dedupe(node_types)
+        # prepared=True: already normalized, deduped AND indexed (prefork
+        # parent) — used as is, so the dicts stay shared with the parent
+        if prepared:
+            self.node_types = node_types
+        else:
+            node_types = normalize_nodes(node_types)
+            self.node_types = self._dedupe(node_types)
 
         # ── Fast in-memory name lookup (always kept) ───────────────
         # Used for exact/case-insensitive resolve + fallback search
@@ -401,6 +420,10 @@ class NodeSearchEngine:
             n.get("name", ""): n for n in self.node_types
         }
 
+        # ── Listing state (GET /nodes) — built lazily, reset on every change
+        self._sorted_names: Optional[List[str]] = None
+        self._catalog_version: Optional[str] = None
+
         # ── Register for workflow.py parameter extraction ─────────
         register_node_types(self.node_types)
 
@@ -430,8 +453,9 @@ class NodeSearchEngine:
             if self._es.ping():
                 print(f"-->> Elasticsearch connected: {es_url}")
                 self._es_available = True
-                self._ensure_index()
-                self._index_nodes()
+                if not prepared:
+                    self._ensure_index()
+                    self._index_nodes()
             else:
                 raise ESConnectionError("Ping failed")
 
@@ -455,9 +479,13 @@ class NodeSearchEngine:
         Full-text fuzzy search across name, displayName, aliases, description.
         Uses ES multi_match with fuzziness AUTO when available, else in-memory.
         """
+        t0 = time.perf_counter()
         if self._es_available:
-            return self._es_search_by_name(query, limit)
-        return self._mem_search_by_name(query, limit)
+            results = self._es_search_by_name(query, limit)
+        else:
+            results = self._mem_search_by_name(query, limit)
+        SEARCH_SECONDS.labels("by_name", self._backend).observe(time.perf_counter() - t0)
+        return results
 
     def search_by_node_type(
         self,
@@ -466,13 +494,17 @@ class NodeSearchEngine:
     ) -> List[NodeSearchResult]:
         """Return all nodes of a given nodeType (trigger | action | conditional)."""
         t = node_type.lower().strip()
+        t0 = time.perf_counter()
 
         if self._es_available:
-            return self._es_search_by_type(t, limit)
+            results = self._es_search_by_type(t, limit)
+        else:
+            # in-memory fallback
+            matches = [n for n in self.node_types if n.get("nodeType", "").lower() == t]
+            results = [self._to_result(n, 100.0) for n in matches[:limit]]
 
-        # in-memory fallback
-        matches = [n for n in self.node_types if n.get("nodeType", "").lower() == t]
-        return [self._to_result(n, 100.0) for n in matches[:limit]]
+        SEARCH_SECONDS.labels("by_type", self._backend).observe(time.perf_counter() - t0)
+        return results
 
     def resolve_node_type(self, requested: str) -> Tuple[str, str]:
         """
@@ -540,6 +572,59 @@ class NodeSearchEngine:
             for n in self.node_types
         ]
 
+    def list_nodes(
+        self,
+        after: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of the catalogue ordered by name, starting after `after`
+        (keyset pagination — stable while nodes are added or deleted).
+        Returns (projected nodes, name to continue after or None).
+        """
+        names = self._names_in_order()
+        start = bisect_right(names, after) if after else 0
+        page = names[start:start + limit]
+        keep = tuple(fields) if fields is not None else NODE_LIST_FIELDS
+        if "*" in keep:
+            # everything except internal bookkeeping (_normalized, _source_format)
+            nodes = [
+                {k: v for k, v in self._by_name[name].items() if not k.startswith("_")}
+                for name in page
+            ]
+        else:
+            nodes = [
+                {k: node[k] for k in keep if k in node}
+                for node in (self._by_name[name] for name in page)
+            ]
+        more = start + limit < len(names)
+        return nodes, (page[-1] if more and page else None)
+
+    @property
+    def catalog_version(self) -> str:
+        """Hash of the whole catalogue — strong ETag base for GET /nodes."""
+        if self._catalog_version is None:
+            digest = hashlib.blake2b(digest_size=10)
+            for name in self._names_in_order():
+                digest.update(orjson.dumps(self._by_name[name], default=str, option=orjson.OPT_SORT_KEYS))
+            self._catalog_version = digest.hexdigest()
+        return self._catalog_version
+
+    def _names_in_order(self) -> List[str]:
+        if self._sorted_names is None:
+            self._sorted_names = sorted(name for name in self._by_name if name)
+        return self._sorted_names
+
+    def _catalog_changed(self) -> None:
+        self._sorted_names = None
+        self._catalog_version = None
+
+    @property
+    def _backend(self) -> str:
+        """Metrics label for the backend serving queries."""
+        return "elasticsearch" if self._es_available else "memory"
+
     def format_result(self, result: NodeSearchResult) -> str:
         """XML-like string for LLM — same as before."""
         return (
@@ -673,6 +758,7 @@ class NodeSearchEngine:
 
         except Exception as e:
             print(f"⚠️  ES search failed ({e}), falling back to in-memory")
+            SEARCH_ERRORS.labels("by_name").inc()
             return self._mem_search_by_name(query, limit)
 
     def _es_search_by_type(self, node_type: str, limit: int) -> List[NodeSearchResult]:
@@ -691,6 +777,7 @@ class NodeSearchEngine:
 
         except Exception as e:
             print(f"⚠️  ES type filter failed ({e}), falling back to in-memory")
+            SEARCH_ERRORS.labels("by_type").inc()
             matches = [n for n in self.node_types if n.get("nodeType", "").lower() == node_type]
             return [self._to_result(n, 100.0) for n in matches[:limit]]
 
@@ -806,6 +893,7 @@ class NodeSearchEngine:
         self.node_types = [n for n in self.node_types if n.get("name") != name]
         self.node_types.append(node)
         register_node_types(self.node_types)
+        self._catalog_changed()
 
         if self._es_available:
             try:
@@ -823,6 +911,7 @@ class NodeSearchEngine:
         self._by_name.pop(node_name, None)
         self.node_types = [n for n in self.node_types if n.get("name") != node_name]
         register_node_types(self.node_types)
+        self._catalog_changed()
 
         if self._es_available:
             try:
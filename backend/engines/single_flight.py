@@ -0,0 +1,97 @@
+# engines/single_flight.py
+"""
+Request coalescing and idempotent replay for POST /workflow.
+
+SingleFlight       concurrent calls with the same key share ONE in-flight
+                   task — a double-click or a proxy retry of an identical
+                   request waits for the first run instead of paying for a
+                   second full pipeline. Key = (session, builder_mode,
+                   normalized message).
+IdempotencyCache   completed results by client `Idempotency-Key`, bounded
+                   (IDEMPOTENCY_MAX_ENTRIES, LRU) and expiring after
+                   IDEMPOTENCY_TTL_SECONDS, so a retry after the response
+                   was lost replays it instead of running another turn.
+
+The shared task is shielded: a waiter that goes away does not cancel the
+run for the others (and a session turn is still stored once it finishes).
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from ..utils.config import Config
+from ..utils.metrics import record_cache
+
+
+def normalize_message(message: str) -> str:
+    """Whitespace and case differences don't make a different request."""
+    return " ".join(message.split()).casefold()
+
+
+def request_key(message: str, session_id: Optional[str], builder_mode: Optional[str]) -> Tuple[str, str, str]:
+    return (session_id or "", builder_mode or "", normalize_message(message))
+
+
+class SingleFlight:
+    """key → the one task computing it right now."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run fn() for `key`, or join the run already in flight. Returns (result, shared)."""
+        task = self._inflight.get(key)
+        shared = task is not None
+        record_cache("single_flight", shared)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._done(k, t))
+        return await asyncio.shield(task), shared
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()   # retrieved — no "never retrieved" warning if every waiter left
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+class IdempotencyCache:
+    """Idempotency-Key → (request key, response body) with LRU bound and TTL."""
+
+    def __init__(self, max_entries: int = Config.IDEMPOTENCY_MAX_ENTRIES,
+                 ttl: float = Config.IDEMPOTENCY_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Hashable, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[Hashable, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] > self.ttl:
+            del self._entries[key]
+            entry = None
+        record_cache("idempotency", entry is not None)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1], entry[2]
+
+    def put(self, key: str, fingerprint: Hashable, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic(), fingerprint, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+SINGLE_FLIGHT = SingleFlight()
+IDEMPOTENCY_CACHE = IdempotencyCache()
@@ -0,0 +1,182 @@
+# state/serde.py
+"""
+Compact binary (de)serialization of WorkflowState values for the checkpointer.
+
+SimpleWorkflow, PromptCategorization and the coordination log are packed
+as positional msgpack arrays (no field names, no module paths) under their
+own type tags; everything else (LangChain messages, checkpoint dicts,
+metadata) goes through LangGraph's JsonPlusSerializer unchanged.
+
+    "yz.wf1"    SimpleWorkflow
+    "yz.cat1"   PromptCategorization
+    "yz.log1"   List[CoordinationLogEntry]
+
+A SimpleWorkflow nested inside another value (the "__start__" channel holds
+the whole input state dict with durability="async") goes through the generic
+msgpack path as ext type EXT_WORKFLOW, packed the same way as "yz.wf1".
+
+Bump the tag suffix when a layout changes; old tags must keep loading.
+"""
+
+import pickle
+from typing import Any, List, Tuple
+
+import ormsgpack
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer, _msgpack_default, _option
+
+from ..types.categorization import PromptCategorization, WorkflowTechnique
+from ..types.coordination import CoordinationLogEntry
+from ..types.workflow import SimpleWorkflow, WorkflowConnection, WorkflowNode
+
+_OPTS = ormsgpack.OPT_NON_STR_KEYS
+
+
+# ── SimpleWorkflow ──
+# [name, nodes, connections]
+#   node        [id, name, type, type_version, x, y, parameters, role]
+#   connections [[source_name, [[conn_type, [[[target, type, index], ...], ...]], ...]], ...]
+
+def _pack_workflow(wf: SimpleWorkflow) -> list:
+    nodes = [
+        [n.id, n.name, n.type, n.type_version, n.position[0], n.position[1], n.parameters, n.role]
+        for n in wf.nodes
+    ]
+    # straight from the edge table — decoding `connections` builds a
+    # WorkflowConnection per edge (index is always 0)
+    connections = [
+        [src, [
+            [conn_type, [[[t, conn_type, 0] for t in targets] for targets in branches]]
+            for conn_type, branches in wf._slots(src)
+        ]]
+        for src in wf._out
+    ]
+    return [wf.name, nodes, connections]
+
+
+def _unpack_workflow(data: list) -> SimpleWorkflow:
+    name, nodes, connections = data
+    # built in one go — SimpleWorkflow encodes and indexes them once in __init__
+    return SimpleWorkflow(
+        name=name,
+        nodes=[
+            WorkflowNode(
+                id=node_id, name=node_name, type=node_type, type_version=version,
+                position=(x, y), parameters=params, role=role,
+            )
+            for node_id, node_name, node_type, version, x, y, params, role in nodes
+        ],
+        connections={
+            src: {
+                conn_type: [[WorkflowConnection(node=t, type=ct, index=i) for t, ct, i in arr]
+                            for arr in arrays]
+                for conn_type, arrays in conn_types
+            }
+            for src, conn_types in connections
+        },
+    )
+
+
+# ── PromptCategorization ──
+# [[technique, ...], confidence, reasoning]
+
+def _pack_categorization(cat: PromptCategorization) -> list:
+    return [
+        [t.value if isinstance(t, WorkflowTechnique) else str(t) for t in cat.techniques],
+        cat.confidence,
+        cat.reasoning,
+    ]
+
+
+def _technique(value: str):
+    try:
+        return WorkflowTechnique(value)
+    except ValueError:
+        return value
+
+
+def _unpack_categorization(data: list) -> PromptCategorization:
+    techniques, confidence, reasoning = data
+    return PromptCategorization(
+        techniques=[_technique(t) for t in techniques],
+        confidence=confidence,
+        reasoning=reasoning,
+    )
+
+
+# ── Coordination log ──
+# [[phase, status, timestamp, summary, output, metadata], ...]
+
+def _pack_log(entries: List[CoordinationLogEntry]) -> list:
+    return [[e.phase, e.status, e.timestamp, e.summary, e.output, e.metadata] for e in entries]
+
+
+def _unpack_log(data: list) -> List[CoordinationLogEntry]:
+    return [
+        CoordinationLogEntry(phase=p, status=s, timestamp=ts, summary=sm, output=o, metadata=m)
+        for p, s, ts, sm, o, m in data
+    ]
+
+
+def _is_log(obj: Any) -> bool:
+    return isinstance(obj, list) and bool(obj) and all(
+        isinstance(e, CoordinationLogEntry) for e in obj
+    )
+
+
+# ── Nested values ──
+# JsonPlus's own ext codes are 0-7; SimpleWorkflow isn't a dataclass (slots
+# + edge table), so its msgpack default hook can't encode it
+
+EXT_WORKFLOW = 64
+
+
+def _msgpack_default_yz(obj: Any) -> Any:
+    if isinstance(obj, SimpleWorkflow):
+        return ormsgpack.Ext(EXT_WORKFLOW, _msgpack_enc(_pack_workflow(obj)))
+    return _msgpack_default(obj)
+
+
+def _msgpack_enc(data: Any) -> bytes:
+    return ormsgpack.packb(data, default=_msgpack_default_yz, option=_option)
+
+
+class WorkflowStateSerializer(JsonPlusSerializer):
+    """JsonPlusSerializer plus compact encodings for the repo's state dataclasses."""
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        try:
+            if isinstance(obj, SimpleWorkflow):
+                return "yz.wf1", ormsgpack.packb(_pack_workflow(obj), option=_OPTS)
+            if isinstance(obj, PromptCategorization):
+                return "yz.cat1", ormsgpack.packb(_pack_categorization(obj), option=_OPTS)
+            if _is_log(obj):
+                return "yz.log1", ormsgpack.packb(_pack_log(obj), option=_OPTS)
+        except (ormsgpack.MsgpackEncodeError, TypeError):
+            # e.g. a non-msgpack value inside node parameters — generic path handles it
+            pass
+        if obj is None or isinstance(obj, (bytes, bytearray)):
+            return super().dumps_typed(obj)
+        # JsonPlusSerializer's msgpack path with EXT_WORKFLOW added
+        try:
+            return "msgpack", _msgpack_enc(obj)
+        except ormsgpack.MsgpackEncodeError:
+            if self.pickle_fallback:
+                return "pickle", pickle.dumps(obj)
+            raise
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_ == "yz.wf1":
+            return _unpack_workflow(ormsgpack.unpackb(payload, option=_OPTS))
+        if type_ == "yz.cat1":
+            return _unpack_categorization(ormsgpack.unpackb(payload, option=_OPTS))
+        if type_ == "yz.log1":
+            return _unpack_log(ormsgpack.unpackb(payload, option=_OPTS))
+        if type_ == "msgpack":
+            return ormsgpack.unpackb(payload, ext_hook=self._ext_hook, option=_OPTS)
+        return super().loads_typed(data)
+
+    def _ext_hook(self, code: int, payload: bytes) -> Any:
+        if code == EXT_WORKFLOW:
+            return _unpack_workflow(ormsgpack.unpackb(payload, ext_hook=self._ext_hook, option=_OPTS))
+        return self._unpack_ext_hook(code, payload)
@@ -0,0 +1,181 @@
+# state/session_store.py
+"""
+In-process store of WorkflowState per conversation (WorkflowRequest.session_id).
+
+A follow-up turn picks up the stored workflow, categorization, best practices
+and message history, so "add a Slack node after X" edits the existing graph
+instead of rerunning discovery and rebuilding from nothing.
+
+Bounds (Config.SESSION_*):
+  SESSION_MAX_COUNT      least-recently-used sessions are evicted beyond this
+  SESSION_IDLE_TTL       sessions untouched for this long are dropped
+  SESSION_MAX_MEMORY_MB  estimated size of all states; LRU evicted above it
+
+Sizes are estimates (object graph walk with sys.getsizeof), computed once
+per put() — good enough for a cap, not an exact accounting.
+"""
+
+import asyncio
+import copy
+import sys
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .workflow_state import WorkflowState
+from ..utils.config import Config
+from ..utils.metrics import SESSION_BYTES, SESSION_EVICTIONS, SESSIONS, record_cache
+
+# Per-turn fields — never carried over to the next turn
+_TRANSIENT_KEYS = ("stage_timings", "session_id", "next_agent")
+
+
+def estimate_size(obj: Any) -> int:
+    """Approximate deep size in bytes (shared objects counted once)."""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or o is None or isinstance(o, (bool, int, float, type)):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o, 64)
+        if isinstance(o, (str, bytes)):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        else:
+            d = getattr(o, "__dict__", None)
+            if d is not None:
+                stack.append(d)
+            for slot in getattr(type(o), "__slots__", ()):
+                stack.append(getattr(o, slot, None))
+    return total
+
+
+@dataclass
+class _Session:
+    state: WorkflowState
+    size: int
+    last_access: float
+
+
+class SessionStore:
+    """LRU + idle-TTL + memory-capped map of session_id → WorkflowState."""
+
+    def __init__(
+        self,
+        max_sessions: int = Config.SESSION_MAX_COUNT,
+        idle_ttl: float = Config.SESSION_IDLE_TTL,
+        max_memory_mb: float = Config.SESSION_MAX_MEMORY_MB,
+    ):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_bytes = int(max_memory_mb * 1024 * 1024)
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._bytes = 0
+        # One lock per session while a turn holds it — turns of the same
+        # conversation run one after the other, different sessions in parallel
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._bytes
+
+    def lock(self, session_id: str) -> asyncio.Lock:
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[session_id] = lock
+        return lock
+
+    def get(self, session_id: str) -> Optional[WorkflowState]:
+        """
+        Working copy of the stored state (None if unknown or expired).
+        The workflow and message list are copied so a turn that fails half
+        way leaves the stored session as it was.
+        """
+        entry = self._sessions.get(session_id)
+        if entry is not None and time.monotonic() - entry.last_access > self.idle_ttl:
+            self._remove(session_id, "ttl")
+            entry = None
+        record_cache("session", entry is not None)
+        if entry is None:
+            return None
+
+        entry.last_access = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        state = dict(entry.state)
+        state["workflow_json"] = copy.deepcopy(state["workflow_json"])
+        state["messages"] = list(state.get("messages") or [])
+        state["coordination_log"] = list(state.get("coordination_log") or [])
+        return state
+
+    def put(self, session_id: str, state: WorkflowState) -> None:
+        """Store the state a turn ended with; evicts to stay within the bounds."""
+        state = {k: v for k, v in state.items() if k not in _TRANSIENT_KEYS}
+        size = estimate_size(state)
+
+        old = self._sessions.pop(session_id, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._sessions[session_id] = _Session(state, size, time.monotonic())
+        self._bytes += size
+
+        self.collect_expired()
+        while len(self._sessions) > self.max_sessions:
+            self._remove(next(iter(self._sessions)), "lru")
+        # Never evict the session just written, even if it alone exceeds the cap
+        while self._bytes > self.max_bytes and len(self._sessions) > 1:
+            self._remove(next(iter(self._sessions)), "memory")
+
+    def drop(self, session_id: str) -> bool:
+        if session_id not in self._sessions:
+            return False
+        self._remove(session_id, None)
+        return True
+
+    def collect_expired(self) -> int:
+        """Remove sessions idle longer than idle_ttl (oldest first, stops at the first live one)."""
+        cutoff = time.monotonic() - self.idle_ttl
+        removed = 0
+        while self._sessions:
+            session_id, entry = next(iter(self._sessions.items()))
+            if entry.last_access >= cutoff:
+                break
+            self._remove(session_id, "ttl")
+            removed += 1
+        return removed
+
+    def _remove(self, session_id: str, reason: Optional[str]) -> None:
+        entry = self._sessions.pop(session_id)
+        self._bytes -= entry.size
+        if reason:
+            SESSION_EVICTIONS.labels(reason).inc()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "memory_bytes": self._bytes,
+            "max_sessions": self.max_sessions,
+            "max_memory_bytes": self.max_bytes,
+            "idle_ttl": self.idle_ttl,
+        }
+
+
+SESSION_STORE = SessionStore()
+
+SESSIONS.set_function(lambda: len(SESSION_STORE))
+SESSION_BYTES.set_function(lambda: SESSION_STORE.memory_bytes)
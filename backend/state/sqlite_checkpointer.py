@@ -0,0 +1,537 @@
+# state/sqlite_checkpointer.py
+"""
+SQLite-backed LangGraph checkpointer (BaseCheckpointSaver).
+
+Sessions survive a worker restart: the graph is compiled with this saver and
+every remembered turn runs with thread_id = session_id (submain.process_message).
+
+Write path — off the request path:
+  aput / aput_writes serialize (WorkflowStateSerializer, so the stored bytes
+  are a snapshot even though the builder mutates the workflow in place) and
+  queue the rows. A background task flushes the queue every
+  CHECKPOINT_FLUSH_MS, or as soon as CHECKPOINT_BATCH_SIZE rows are waiting,
+  in ONE transaction on a worker thread.
+
+Read path: reading a thread with queued rows flushes first, so a reader
+always sees its own writes. WAL mode lets those reads run while other
+workers write; synchronous=NORMAL means a power cut may lose the last
+flushed batch, never corrupt the file.
+
+Layout mirrors InMemorySaver: checkpoints (without channel values), one
+blob per (channel, version), and pending writes per checkpoint; `threads`
+records when each thread was last written.
+
+Retention (Config.CHECKPOINT_*):
+  CHECKPOINT_KEEP   each flush prunes the threads it wrote to their newest
+                    N checkpoints, those checkpoints' writes, and the blobs
+                    older than every version the kept checkpoints use
+  CHECKPOINT_TTL    threads neither written nor read for this long (default
+                    SESSION_IDLE_TTL — the session store forgets them then
+                    too) are deleted; the flusher sweeps every
+                    CHECKPOINT_SWEEP_INTERVAL
+"""
+
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from .serde import WorkflowStateSerializer
+from ..utils.config import Config
+from ..utils.metrics import CHECKPOINT_FLUSH_SECONDS, CHECKPOINT_PENDING_ROWS, CHECKPOINT_ROWS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id            TEXT NOT NULL,
+    checkpoint_ns        TEXT NOT NULL DEFAULT '',
+    checkpoint_id        TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type                 TEXT,
+    checkpoint           BLOB,
+    metadata_type        TEXT,
+    metadata             BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id     TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel       TEXT NOT NULL,
+    version       TEXT NOT NULL,
+    type          TEXT NOT NULL,
+    blob          BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id     TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id       TEXT NOT NULL,
+    idx           INTEGER NOT NULL,
+    channel       TEXT NOT NULL,
+    type          TEXT,
+    blob          BLOB,
+    task_path     TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id  TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL
+);
+"""
+_TABLES = ("checkpoints", "blobs", "writes", "threads")
+
+_INSERT_CHECKPOINT = "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+_INSERT_BLOB = "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)"
+_INSERT_WRITE = "INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_UPSERT_WRITE = "INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_TOUCH_THREAD = "INSERT OR REPLACE INTO threads VALUES (?, ?)"
+
+# (sql, params, thread_id)
+_Row = Tuple[str, tuple, str]
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver[str]):
+    """LangGraph checkpointer on one SQLite file (WAL) with batched async writes."""
+
+    def __init__(
+        self,
+        path: str = Config.CHECKPOINT_DB,
+        batch_size: int = Config.CHECKPOINT_BATCH_SIZE,
+        flush_ms: float = Config.CHECKPOINT_FLUSH_MS,
+        keep: int = Config.CHECKPOINT_KEEP,
+        ttl: float = Config.CHECKPOINT_TTL,
+        sweep_interval: float = Config.CHECKPOINT_SWEEP_INTERVAL,
+    ):
+        super().__init__(serde=WorkflowStateSerializer())
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.keep = keep
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # Threads from before the `threads` table start their TTL now
+        self._conn.execute(
+            "INSERT OR IGNORE INTO threads SELECT DISTINCT thread_id, ? FROM checkpoints", (time.time(),)
+        )
+        self._db_lock = threading.Lock()   # one connection, used from worker threads
+        # thread_id → last aget_tuple / aput (time.time()): a turn that has read
+        # its thread but not flushed yet must not lose it to the sweep
+        self._seen: Dict[str, float] = {}
+        self._next_sweep = 0.0
+
+        self._pending: List[_Row] = []
+        self._pending_threads: Set[str] = set()
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        CHECKPOINT_PENDING_ROWS.set_function(lambda: len(self._pending))
+
+    # ── Background flusher ──
+
+    def start(self) -> None:
+        """Start the flusher on the running loop (idempotent; aput calls it too)."""
+        if self._task is None or self._task.done():
+            self._flush_lock = asyncio.Lock()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if self.ttl > 0 and time.monotonic() >= self._next_sweep:
+                self._next_sweep = time.monotonic() + self.sweep_interval
+                cutoff = time.time() - self.ttl
+                self._seen = {t: seen for t, seen in self._seen.items() if seen >= cutoff}
+                try:
+                    await asyncio.to_thread(self.delete_expired, cutoff)
+                except Exception as e:
+                    print(f"⚠️  Checkpoint TTL sweep failed ({e})")
+
+    def _queue(self, rows: List[_Row]) -> None:
+        if self._closed:
+            # Late write after close() — store it synchronously rather than lose it
+            self._write_rows(rows)
+            return
+        self.start()
+        self._pending.extend(rows)
+        self._pending_threads.update(r[2] for r in rows)
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Write every queued row in one transaction."""
+        if self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+            self._pending_threads = set()
+            t0 = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._write_rows, rows)
+                CHECKPOINT_ROWS.labels("written").inc(len(rows))
+            except Exception as e:
+                # A lost checkpoint costs a session its history, not the request
+                print(f"⚠️  Checkpoint flush failed ({e}); {len(rows)} rows lost")
+                CHECKPOINT_ROWS.labels("failed").inc(len(rows))
+            finally:
+                CHECKPOINT_FLUSH_SECONDS.observe(time.perf_counter() - t0)
+
+    def _write_rows(self, rows: List[_Row]) -> None:
+        now = time.time()
+        with self._db_lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                for sql, params, _ in rows:
+                    cur.execute(sql, params)
+                pruned = 0
+                for thread_id in {r[2] for r in rows}:
+                    cur.execute(_TOUCH_THREAD, (thread_id, now))
+                    if self.keep > 0:
+                        pruned += self._prune(cur, thread_id)
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+        if pruned:
+            CHECKPOINT_ROWS.labels("pruned").inc(pruned)
+
+    def _prune(self, cur: sqlite3.Cursor, thread_id: str) -> int:
+        """Drop all but the newest `keep` checkpoints of a thread (per namespace); returns rows deleted."""
+        deleted = 0
+        namespaces = cur.execute(
+            "SELECT DISTINCT checkpoint_ns FROM checkpoints WHERE thread_id=?", (thread_id,)
+        ).fetchall()
+        for (checkpoint_ns,) in namespaces:
+            oldest_kept = cur.execute(
+                "SELECT checkpoint_id, type, checkpoint FROM checkpoints WHERE thread_id=? "
+                "AND checkpoint_ns=? ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+                (thread_id, checkpoint_ns, self.keep - 1),
+            ).fetchone()
+            if oldest_kept is None:
+                continue
+            checkpoint_id, type_, blob = oldest_kept
+            key = (thread_id, checkpoint_ns, checkpoint_id)
+            dropped = cur.execute(
+                "DELETE FROM checkpoints WHERE thread_id=? AND checkpoint_ns=? AND checkpoint_id<?", key
+            ).rowcount
+            if not dropped:
+                continue
+            deleted += dropped
+            deleted += cur.execute(
+                "DELETE FROM writes WHERE thread_id=? AND checkpoint_ns=? AND checkpoint_id<?", key
+            ).rowcount
+            # Versions only grow along a thread, so the oldest kept checkpoint
+            # holds the lowest version still in use for each of its channels
+            versions = self.serde.loads_typed((type_, blob))["channel_versions"]
+            for channel, version in versions.items():
+                deleted += cur.execute(
+                    "DELETE FROM blobs WHERE thread_id=? AND checkpoint_ns=? AND channel=? AND version<?",
+                    (thread_id, checkpoint_ns, channel, str(version)),
+                ).rowcount
+        return deleted
+
+    def delete_expired(self, cutoff: Optional[float] = None) -> int:
+        """Delete threads neither written nor read since `cutoff` (default: `ttl` ago); returns how many."""
+        if cutoff is None:
+            cutoff = time.time() - self.ttl
+        with self._db_lock:
+            # Checked under the lock: a read marks its thread in _seen before it
+            # can take the lock, so a thread read before this runs is kept
+            expired = [
+                thread_id for (thread_id,) in self._conn.execute(
+                    "SELECT thread_id FROM threads WHERE updated_at<?", (cutoff,)
+                ).fetchall()
+                if self._seen.get(thread_id, 0.0) < cutoff and thread_id not in self._pending_threads
+            ]
+            if not expired:
+                return 0
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                deleted = 0
+                for thread_id in expired:
+                    for table in _TABLES:
+                        deleted += cur.execute(f"DELETE FROM {table} WHERE thread_id=?", (thread_id,)).rowcount
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+        CHECKPOINT_ROWS.labels("expired").inc(deleted)
+        return len(expired)
+
+    async def close(self) -> None:
+        """Flush what is queued, stop the flusher, close the database."""
+        if self._task is not None:
+            self._closed = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            await self.flush()
+        self._closed = True
+        with self._db_lock:
+            self._conn.close()
+
+    # ── Row builders (serialize now — the live objects keep changing) ──
+
+    def _checkpoint_rows(
+        self, config: RunnableConfig, checkpoint: Checkpoint,
+        metadata: CheckpointMetadata, new_versions: ChannelVersions,
+    ) -> Tuple[List[_Row], RunnableConfig]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        c = checkpoint.copy()
+        values: Dict[str, Any] = c.pop("channel_values")
+
+        rows: List[_Row] = []
+        for channel, version in new_versions.items():
+            if channel in values:
+                type_, blob = self.serde.dumps_typed(values[channel])
+            else:
+                type_, blob = "empty", None
+            rows.append((_INSERT_BLOB, (thread_id, checkpoint_ns, channel, str(version), type_, blob),
+                         thread_id))
+
+        type_, blob = self.serde.dumps_typed(c)
+        meta_type, meta_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        rows.append((_INSERT_CHECKPOINT, (
+            thread_id, checkpoint_ns, checkpoint["id"],
+            config["configurable"].get("checkpoint_id"), type_, blob, meta_type, meta_blob,
+        ), thread_id))
+
+        next_config = {"configurable": {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"],
+        }}
+        return rows, next_config
+
+    def _write_rows_for(
+        self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]],
+        task_id: str, task_path: str,
+    ) -> List[_Row]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows: List[_Row] = []
+        for idx, (channel, value) in enumerate(writes):
+            write_idx = WRITES_IDX_MAP.get(channel, idx)
+            type_, blob = self.serde.dumps_typed(value)
+            sql = _UPSERT_WRITE if write_idx < 0 else _INSERT_WRITE
+            rows.append((sql, (
+                thread_id, checkpoint_ns, checkpoint_id, task_id, write_idx,
+                channel, type_, blob, task_path,
+            ), thread_id))
+        return rows
+
+    # ── Reads ──
+
+    def _select(self, sql: str, params: tuple) -> List[tuple]:
+        with self._db_lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _load_tuple(self, thread_id: str, checkpoint_ns: str, row: tuple) -> CheckpointTuple:
+        checkpoint_id, parent_id, type_, blob, meta_type, meta_blob = row
+        checkpoint: Checkpoint = self.serde.loads_typed((type_, blob))
+
+        values: Dict[str, Any] = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            found = self._select(
+                "SELECT type, blob FROM blobs WHERE thread_id=? AND checkpoint_ns=? "
+                "AND channel=? AND version=?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            )
+            if found and found[0][0] != "empty":
+                values[channel] = self.serde.loads_typed(found[0])
+
+        writes = self._select(
+            "SELECT task_id, channel, type, blob FROM writes WHERE thread_id=? "
+            "AND checkpoint_ns=? AND checkpoint_id=? ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        )
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+            }},
+            checkpoint={**checkpoint, "channel_values": values},
+            metadata=self.serde.loads_typed((meta_type, meta_blob)),
+            parent_config=(
+                {"configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": parent_id,
+                }}
+                if parent_id else None
+            ),
+            pending_writes=[(task, ch, self.serde.loads_typed((t, b))) for task, ch, t, b in writes],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        columns = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+        if checkpoint_id := get_checkpoint_id(config):
+            rows = self._select(
+                f"SELECT {columns} FROM checkpoints WHERE thread_id=? AND checkpoint_ns=? "
+                "AND checkpoint_id=?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+        else:
+            rows = self._select(
+                f"SELECT {columns} FROM checkpoints WHERE thread_id=? AND checkpoint_ns=? "
+                "ORDER BY checkpoint_id DESC LIMIT 1",
+                (thread_id, checkpoint_ns),
+            )
+        return self._load_tuple(thread_id, checkpoint_ns, rows[0]) if rows else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        where, params = [], []
+        if config:
+            where.append("thread_id=?")
+            params.append(config["configurable"]["thread_id"])
+            if (ns := config["configurable"].get("checkpoint_ns")) is not None:
+                where.append("checkpoint_ns=?")
+                params.append(ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                where.append("checkpoint_id=?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            where.append("checkpoint_id<?")
+            params.append(before_id)
+        sql = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, "
+            "checkpoint, metadata_type, metadata FROM checkpoints"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY checkpoint_id DESC"
+        )
+        for thread_id, checkpoint_ns, *row in self._select(sql, tuple(params)):
+            item = self._load_tuple(thread_id, checkpoint_ns, tuple(row))
+            if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            if limit is not None:
+                if limit <= 0:
+                    break
+                limit -= 1
+            yield item
+
+    # ── Sync writes (scripts / tools; the graph uses the async ones) ──
+
+    def put(self, config, checkpoint, metadata, new_versions) -> RunnableConfig:
+        rows, next_config = self._checkpoint_rows(config, checkpoint, metadata, new_versions)
+        self._write_rows(rows)
+        return next_config
+
+    def put_writes(self, config, writes, task_id, task_path: str = "") -> None:
+        self._write_rows(self._write_rows_for(config, writes, task_id, task_path))
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._db_lock:
+            for table in _TABLES:
+                self._conn.execute(f"DELETE FROM {table} WHERE thread_id=?", (thread_id,))
+
+    # ── Async API used by the graph ──
+
+    async def _flush_thread(self, config: Optional[RunnableConfig]) -> None:
+        thread_id = (config or {}).get("configurable", {}).get("thread_id")
+        if thread_id is not None:
+            self._seen[thread_id] = time.time()
+        in_flight = self._flush_lock is not None and self._flush_lock.locked()
+        if in_flight or (self._pending and (thread_id is None or thread_id in self._pending_threads)):
+            await self.flush()
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        await self._flush_thread(config)
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        await self._flush_thread(config)
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions) -> RunnableConfig:
+        self._seen[config["configurable"]["thread_id"]] = time.time()
+        rows, next_config = self._checkpoint_rows(config, checkpoint, metadata, new_versions)
+        self._queue(rows)
+        return next_config
+
+    async def aput_writes(self, config, writes, task_id, task_path: str = "") -> None:
+        self._queue(self._write_rows_for(config, writes, task_id, task_path))
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self.flush()
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # Same scheme as InMemorySaver: zero-padded counter + random suffix
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+
+def create_checkpointer(path: str = Config.CHECKPOINT_DB) -> Optional[SQLiteCheckpointSaver]:
+    """CHECKPOINT_DB path → saver; empty → None (sessions live in memory only)."""
+    if not path:
+        return None
+    try:
+        saver = SQLiteCheckpointSaver(path)
+    except sqlite3.Error as e:
+        print(f"⚠️  Checkpoint DB '{path}' unavailable ({e}) — sessions are not persisted")
+        return None
+    retention = f"keep {saver.keep}" if saver.keep > 0 else "keep all"
+    retention += f", ttl {saver.ttl:.0f}s" if saver.ttl > 0 else ", no ttl"
+    print(f"--> Checkpointer: SQLite {path} (WAL, flush {saver.flush_interval * 1000:.0f}ms, {retention})")
+    return saver
@@ -5,12 +5,19 @@ from langgraph.graph import add_messages
 from ..types.categorization import PromptCategorization
 from ..types.workflow import SimpleWorkflow
 from ..types.coordination import CoordinationLogEntry
+from ..utils.config import Config
 import operator
 
 
 def merge_logs(left: List, right: List) -> List:
-    """Append new log entries to existing ones."""
-    return left + right
+    """
+    Append new log entries to existing ones. Entries already present are
+    skipped — a checkpointed session gets its own log back as turn input.
+    """
+    if not left:
+        return list(right)
+    seen = {(e.phase, e.timestamp) for e in left}
+    return left + [e for e in right if (e.phase, e.timestamp) not in seen]
 
 
 def merge_dicts(left: Dict, right: Dict) -> Dict:
@@ -55,6 +62,19 @@ class WorkflowState(TypedDict):
     # Next agent decision from supervisor
     next_agent: str
 
+    # Builder mode for this request: "tools" | "plan"
+    builder_mode: str
+
+    # Wall time per graph stage for the current turn (ms), e.g. {"builder": 8120.4}
+    stage_timings: Dict[str, float]
+
+    # pipeline_tracker session that receives stage / node events (None → no events)
+    session_id: Optional[str]
+
+    # Start of the current turn (epoch seconds) — coordination_log entries
+    # older than this belong to earlier turns of the same session
+    turn_started_at: float
+
 
 def create_initial_state() -> WorkflowState:
     return {
@@ -72,4 +92,8 @@ def create_initial_state() -> WorkflowState:
         "available_node_types": [],
         "conversation_summary": None,
         "next_agent": "discovery",
+        "builder_mode": Config.BUILDER_MODE,
+        "stage_timings": {},
+        "session_id": None,
+        "turn_started_at": 0.0,
     }
\ No newline at end of file
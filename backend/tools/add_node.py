@@ -128,10 +128,11 @@ from langchain_core.tools import tool
 from typing import Annotated, Dict, Any
 from ..types.workflow import WorkflowNode, SimpleWorkflow
 from ..engines.node_search_engine import NodeSearchEngine
+from .context import current_workflow
 import uuid
 
 
-def create_add_node_tool(workflow: SimpleWorkflow, search_engine: NodeSearchEngine):
+def create_add_node_tool(search_engine: NodeSearchEngine):
 
     @tool
     def add_node(
@@ -159,6 +160,8 @@ def create_add_node_tool(workflow: SimpleWorkflow, search_engine: NodeSearchEngi
         - Use SWITCH also for 2 branches when both branches are explicit separate conditions
           such as approved/rejected, high/low, email/sms, status/value based routing.
         """
+        workflow = current_workflow()
+
         # Auto-resolve if LLM passes something other than exact name
         resolved_type, reason = search_engine.resolve_node_type(node_type)
 
@@ -58,12 +58,12 @@
 # tools/connect_nodes.py
 from langchain_core.tools import tool
 from typing import Annotated
-from ..types.workflow import WorkflowConnection
+from .context import current_workflow
 
 
-def create_connect_nodes_tool(workflow):
+def create_connect_nodes_tool():
     """
-    Create connection tools bound to a specific workflow instance.
+    Create connection tools acting on the request's workflow (see tools/context.py).
     Returns TWO tools: connect by ID and connect by name.
     """
 
@@ -80,6 +80,7 @@ def create_connect_nodes_tool(workflow):
           connect_nodes_by_name("NodeA", "NodeB")
           connect_nodes_by_name("NodeB", "NodeC")
         """
+        workflow = current_workflow()
         source_node = workflow.get_node_by_name(source_node_name)
         target_node = workflow.get_node_by_name(target_node_name)
 
@@ -90,18 +91,7 @@ def create_connect_nodes_tool(workflow):
             available = [n.name for n in workflow.nodes]
             return f"Error: Target node '{target_node_name}' not found. Available nodes: {available}"
 
-        if source_node.name not in workflow.connections:
-            workflow.connections[source_node.name] = {}
-
-        if connection_type not in workflow.connections[source_node.name]:
-            workflow.connections[source_node.name][connection_type] = [[]]
-
-        connection = WorkflowConnection(
-            node=target_node.name,
-            type=connection_type,
-            index=0,
-        )
-        workflow.connections[source_node.name][connection_type][0].append(connection)
+        workflow.connect(source_node.name, target_node.name, connection_type)
 
         return f"✓ Connected '{source_node.name}' → '{target_node.name}' ({connection_type})"
 
@@ -112,6 +102,7 @@ def create_connect_nodes_tool(workflow):
         connection_type: Annotated[str, "Connection type, almost always 'main'"] = "main",
     ) -> str:
         """Connect two nodes by their UUIDs returned from add_node."""
+        workflow = current_workflow()
         source_node = workflow.get_node_by_id(source_node_id)
         target_node = workflow.get_node_by_id(target_node_id)
 
@@ -127,18 +118,7 @@ def create_connect_nodes_tool(workflow):
             available = [n.name for n in workflow.nodes]
             return f"Error: Target node '{target_node_id}' not found. Available nodes: {available}"
 
-        if source_node.name not in workflow.connections:
-            workflow.connections[source_node.name] = {}
-
-        if connection_type not in workflow.connections[source_node.name]:
-            workflow.connections[source_node.name][connection_type] = [[]]
-
-        connection = WorkflowConnection(
-            node=target_node.name,
-            type=connection_type,
-            index=0,
-        )
-        workflow.connections[source_node.name][connection_type][0].append(connection)
+        workflow.connect(source_node.name, target_node.name, connection_type)
 
         return f"✓ Connected '{source_node.name}' → '{target_node.name}' ({connection_type})"
 
@@ -0,0 +1,43 @@
+# tools/context.py
+"""
+Per-request workflow context for the workflow-mutating tools.
+
+Tools are created — and their schemas bound to the LLM — once at
+orchestrator init. The SimpleWorkflow a tool call acts on is looked up at
+call time from a ContextVar that the graph node sets for the request:
+
+    with workflow_context(state["workflow_json"]):
+        await builder.build_workflow(state)
+
+ContextVars are copied into asyncio tasks and into the executor threads
+LangChain uses for sync tools, so concurrent requests never see each
+other's workflow.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from ..types.workflow import SimpleWorkflow
+
+_CURRENT_WORKFLOW: ContextVar[Optional[SimpleWorkflow]] = ContextVar(
+    "current_workflow", default=None
+)
+
+
+@contextmanager
+def workflow_context(workflow: SimpleWorkflow) -> Iterator[SimpleWorkflow]:
+    """Bind `workflow` as the target of tool calls made inside the block."""
+    token = _CURRENT_WORKFLOW.set(workflow)
+    try:
+        yield workflow
+    finally:
+        _CURRENT_WORKFLOW.reset(token)
+
+
+def current_workflow() -> SimpleWorkflow:
+    """Workflow of the request being handled. Raises if no context is bound."""
+    workflow = _CURRENT_WORKFLOW.get()
+    if workflow is None:
+        raise RuntimeError("No workflow bound — call tools inside workflow_context()")
+    return workflow
@@ -0,0 +1,59 @@
+# tools/remove_node.py
+"""
+remove_node tool — existing workflow se node hatata hai (modify path).
+Incoming edges are bridged to the removed node's targets by default, so
+deleting a step in the middle of a chain keeps the chain connected.
+"""
+
+from langchain_core.tools import tool
+from typing import Annotated
+from .context import current_workflow
+
+
+def create_remove_node_tool():
+
+    @tool
+    def remove_node(
+        node_name: Annotated[str, "Exact name of the node to remove"],
+        bridge: Annotated[bool, "Reconnect the node's predecessors to its successors (default true)"] = True,
+    ) -> str:
+        """
+        Remove a node and all its connections from the workflow.
+
+        With bridge=true (default) every node that pointed INTO the removed node
+        is connected to the nodes it pointed TO, e.g. removing B from A → B → C
+        leaves A → C. Use bridge=false to just cut the node out.
+
+        Example:
+          remove_node("Send Email")
+        """
+        workflow = current_workflow()
+        node = workflow.get_node_by_name(node_name)
+        if not node:
+            available = [n.name for n in workflow.nodes]
+            return f"❌ Node '{node_name}' not found.\n   Available nodes: {available}"
+
+        # Targets of the removed node, in order
+        targets = [t for t in workflow.successors(node.name) if t != node.name]
+
+        # Edges INTO the removed node: (source, conn_type, branch index)
+        incoming = workflow.remove_node(node)
+
+        bridged = []
+        if bridge:
+            for src, conn_type, branch in incoming:
+                arr = workflow.connections[src][conn_type][branch]
+                for target in targets:
+                    if target != src and not any(c.node == target for c in arr):
+                        workflow.connect(src, target, conn_type, branch)
+                        bridged.append(f"{src} → {target}")
+
+        for src in {src for src, _, _ in incoming}:
+            workflow.prune_connections(src)
+
+        msg = f"-->> Removed '{node.name}' ({node.type})"
+        if bridged:
+            msg += f"\n   Reconnected: {', '.join(bridged)}"
+        return msg
+
+    return remove_node
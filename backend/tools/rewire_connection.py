@@ -0,0 +1,53 @@
+# tools/rewire_connection.py
+"""
+rewire_connection tool — existing edge ko naye target pe move karta hai, ya
+hata deta hai (modify path). New edges still go through connect_nodes_by_name.
+"""
+
+from langchain_core.tools import tool
+from typing import Annotated
+from .context import current_workflow
+
+
+def create_rewire_connection_tool():
+
+    @tool
+    def rewire_connection(
+        source_node_name: Annotated[str, "Exact name of the node the connection starts from"],
+        old_target_node_name: Annotated[str, "Exact name of the node it currently goes to"],
+        new_target_node_name: Annotated[str, "Node it should go to instead; empty string = just delete the connection"] = "",
+    ) -> str:
+        """
+        Move an existing connection to a different target node, or delete it.
+
+        The connection keeps its output (e.g. the IF true/false branch).
+
+        Examples:
+          rewire_connection("Check Status", "Send Email", "Send Slack")   # IF branch now goes to Slack
+          rewire_connection("Fetch Data", "Log Result")                   # delete Fetch Data → Log Result
+        """
+        workflow = current_workflow()
+        for name in (source_node_name, old_target_node_name, new_target_node_name):
+            if name and not workflow.get_node_by_name(name):
+                available = [n.name for n in workflow.nodes]
+                return f"❌ Node '{name}' not found.\n   Available nodes: {available}"
+
+        removed = workflow.disconnect(source_node_name, old_target_node_name)
+        if removed is None:
+            return (
+                f"❌ No connection '{source_node_name}' → '{old_target_node_name}'. "
+                f"Use connect_nodes_by_name to add a new one."
+            )
+
+        conn_type, branch, position, _ = removed
+        arr = workflow.connections[source_node_name][conn_type][branch]
+        if new_target_node_name and not any(x.node == new_target_node_name for x in arr):
+            # same output / same slot in the branch, new target
+            workflow.connect(source_node_name, new_target_node_name, conn_type, branch, position)
+
+        workflow.prune_connections(source_node_name)
+        if new_target_node_name:
+            return f"✓ Rewired '{source_node_name}' → '{new_target_node_name}' (was → '{old_target_node_name}')"
+        return f"✓ Removed connection '{source_node_name}' → '{old_target_node_name}'"
+
+    return rewire_connection
@@ -57,10 +57,10 @@ LLM is tool ko call karta hai jab kisi node ke parameters change karne hon.
 
 from langchain_core.tools import tool
 from typing import Annotated, Dict, Any
-from ..types.workflow import SimpleWorkflow
+from .context import current_workflow
 
 
-def create_update_parameters_tool(workflow: SimpleWorkflow):
+def create_update_parameters_tool():
 
     @tool
     def update_parameters(
@@ -82,6 +82,8 @@ def create_update_parameters_tool(workflow: SimpleWorkflow):
           update_parameters("Send Telegram Message", {"chatId": "123456", "message": "Hello!"})
           update_parameters("Schedule Trigger", {"rule": {"interval": [{"field": "hours", "hoursInterval": 1}]}})
         """
+        workflow = current_workflow()
+
         # Find node by name
         node = workflow.get_node_by_name(node_name)
 
@@ -64,7 +64,8 @@
 
 # backend/tools/validate_workflow.py
 from langchain_core.tools import tool
-from ..types.workflow import SimpleWorkflow, WorkflowNode, WorkflowConnection, _NODE_REGISTRY
+from ..types.workflow import SimpleWorkflow, WorkflowNode, node_registry
+from .context import current_workflow
 import uuid
 
 
@@ -95,7 +96,7 @@ def _is_trigger(node) -> bool:
     node_type = getattr(node, "type", "")
 
     # 1 & 2 — registry lookup (most reliable)
-    node_data = _NODE_REGISTRY.get(node_type, {})
+    node_data = node_registry().get(node_type, {})
     if node_data.get("nodeType", "").lower() == "trigger":
         return True
     if node_data.get("triggers"):
@@ -115,9 +116,10 @@ def _auto_insert_trigger(workflow: SimpleWorkflow) -> str:
     trigger_name = _DEFAULT_TRIGGER_NAME
 
     # Check if MANUAL exists in registry, else use first available trigger
-    if trigger_type not in _NODE_REGISTRY:
+    registry = node_registry()
+    if trigger_type not in registry:
         available_triggers = [
-            name for name, data in _NODE_REGISTRY.items()
+            name for name, data in registry.items()
             if data.get("nodeType", "").lower() == "trigger" or data.get("triggers")
         ]
         if available_triggers:
@@ -136,15 +138,12 @@ def _auto_insert_trigger(workflow: SimpleWorkflow) -> str:
     )
 
     # Insert at position 0
-    workflow.nodes.insert(0, trigger_node)
+    workflow.insert_node(0, trigger_node)
 
     # Connect trigger → old first node
     if len(workflow.nodes) > 1:
         second_node = workflow.nodes[1]  # old first node
-        workflow.connections.setdefault(trigger_name, {}).setdefault("main", [[]])
-        workflow.connections[trigger_name]["main"][0].append(
-            WorkflowConnection(node=second_node.name, type="main", index=0)
-        )
+        workflow.connect(trigger_name, second_node.name)
         return (
             f"⚡ Auto-fixed: Added '{trigger_name}' ({trigger_type}) as trigger\n"
             f"   Connected: '{trigger_name}' → '{second_node.name}'"
@@ -153,7 +152,7 @@ def _auto_insert_trigger(workflow: SimpleWorkflow) -> str:
     return f"⚡ Auto-fixed: Added '{trigger_name}' ({trigger_type}) as trigger"
 
 
-def create_validate_workflow_tool(workflow: SimpleWorkflow):
+def create_validate_workflow_tool():
 
     @tool
     def validate_workflow() -> str:
@@ -168,6 +167,8 @@ def create_validate_workflow_tool(workflow: SimpleWorkflow):
         Call once after adding and connecting all nodes.
         Auto-fix will insert a trigger if missing — no need to retry.
         """
+        workflow = current_workflow()
+
         # ── Check 1: Empty ────────────────────────────────────────
         if not workflow.nodes:
             return "❌ Workflow is empty — add nodes first"
@@ -185,30 +186,16 @@ def create_validate_workflow_tool(workflow: SimpleWorkflow):
         issues = []
 
         if len(workflow.nodes) > 1:
-            connected_names = set()
-            for source, conns in workflow.connections.items():
-                connected_names.add(source)
-                for _, arrays in conns.items():
-                    for arr in arrays:
-                        for c in arr:
-                            connected_names.add(c.node)
-
             disconnected = [
-                n.name for n in workflow.nodes
-                if n.name not in connected_names
+                (i, n.name) for i, n in enumerate(workflow.nodes)
+                if not workflow.is_connected(n.name)
             ]
 
             # Auto-connect disconnected nodes in sequence
-            for node_name in disconnected:
-                node_idx = next(
-                    (i for i, n in enumerate(workflow.nodes) if n.name == node_name), -1
-                )
+            for node_idx, node_name in disconnected:
                 if node_idx > 0:
                     prev_node = workflow.nodes[node_idx - 1]
-                    workflow.connections.setdefault(prev_node.name, {}).setdefault("main", [[]])
-                    workflow.connections[prev_node.name]["main"][0].append(
-                        WorkflowConnection(node=node_name, type="main", index=0)
-                    )
+                    workflow.connect(prev_node.name, node_name)
                     fixes_applied.append(
                         f"⚡ Auto-connected: '{prev_node.name}' → '{node_name}'"
                     )
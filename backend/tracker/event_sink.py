@@ -0,0 +1,244 @@
+# backend/tracker/event_sink.py
+"""
+Durable sinks for pipeline events — the "Kafka hook" behind emit().
+
+emit() hands each PipelineEvent to a BatchingEventSink with put_nowait and
+returns; a background task drains the buffer and writes BATCHES to the
+actual sink, flushing when EVENT_SINK_BATCH_SIZE events are waiting or
+EVENT_SINK_FLUSH_MS has passed. Serialisation and I/O happen in that task
+(file writes in a worker thread), never in the request path.
+
+Backpressure: when the sink falls behind, the bounded buffer fills up.
+EVENT_SINK_OVERFLOW decides what emit() does then:
+  drop   → discard the event and count it (default; request latency unaffected)
+  block  → wait for room (lossless; a slow sink slows the pipeline down)
+
+Sinks:
+  jsonl   JsonlFileSink   append-only JSON lines, one O_APPEND write per batch
+                          so several uvicorn workers can share one file
+  broker  LocalBrokerSink in-process topic log with consumer-group offsets,
+                          stand-in for a Kafka producer (same batch shape)
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from ..utils.config import Config
+from ..utils.metrics import EVENT_SINK_BATCH_SECONDS, EVENT_SINK_BUFFERED, EVENT_SINK_EVENTS
+
+
+class EventSink:
+    """Destination for batches of event dicts."""
+
+    name = "sink"
+
+    async def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+# ── JSONL file ──
+
+class JsonlFileSink(EventSink):
+    name = "jsonl"
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        data = "".join(
+            json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records
+        ).encode("utf-8")
+        # One write per batch — O_APPEND keeps batches from different workers whole
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+
+    async def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        await asyncio.to_thread(self._write, records)
+
+    async def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+# ── Local broker (Kafka stand-in) ──
+
+class LocalBroker:
+    """
+    Minimal Kafka-shaped log: topics are append-only lists with absolute
+    offsets, a retention limit, and per consumer-group committed offsets.
+    """
+
+    def __init__(self, retention: int = 100_000):
+        self.retention = retention
+        self._topics: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._base_offset: Dict[str, int] = {}
+        self._groups: Dict[tuple, int] = {}
+
+    def produce(self, topic: str, records: List[Dict[str, Any]]) -> int:
+        """Append records; returns the offset after the last one."""
+        log = self._topics.setdefault(topic, deque())
+        base = self._base_offset.setdefault(topic, 0)
+        log.extend(records)
+        overflow = len(log) - self.retention
+        for _ in range(max(0, overflow)):
+            log.popleft()
+        self._base_offset[topic] = base + max(0, overflow)
+        return self._base_offset[topic] + len(log)
+
+    def consume(self, topic: str, group: str, max_records: int = 100) -> List[Dict[str, Any]]:
+        """Records after the group's committed offset (auto-commit)."""
+        log = self._topics.get(topic, deque())
+        base = self._base_offset.get(topic, 0)
+        start = max(self._groups.get((topic, group), 0), base)
+        records = [log[i - base] for i in range(start, min(start + max_records, base + len(log)))]
+        self._groups[(topic, group)] = start + len(records)
+        return records
+
+    def end_offset(self, topic: str) -> int:
+        return self._base_offset.get(topic, 0) + len(self._topics.get(topic, ()))
+
+
+LOCAL_BROKER = LocalBroker()
+
+
+class LocalBrokerSink(EventSink):
+    name = "broker"
+
+    def __init__(self, topic: str = "pipeline-events", broker: LocalBroker = LOCAL_BROKER,
+                 latency_ms: float = 0.0):
+        self.topic = topic
+        self.broker = broker
+        self.latency_ms = latency_ms   # simulated produce round trip
+
+    async def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        self.broker.produce(self.topic, records)
+
+
+# ── Batching front ──
+
+_STOP = object()   # close() sentinel
+
+class BatchingEventSink:
+    """Buffers events from emit() and writes them to `sink` in batches."""
+
+    def __init__(
+        self,
+        sink: EventSink,
+        batch_size: int = Config.EVENT_SINK_BATCH_SIZE,
+        flush_ms: float = Config.EVENT_SINK_FLUSH_MS,
+        max_buffer: int = Config.EVENT_SINK_BUFFER_SIZE,
+        overflow: str = Config.EVENT_SINK_OVERFLOW,
+    ):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.block_on_full = overflow == "block"
+        self._buffer: asyncio.Queue = asyncio.Queue(maxsize=max_buffer)
+        # Batch being collected — kept here so close() can still write it
+        self._pending: List[Any] = []
+        self._task: Optional[asyncio.Task] = None
+        self._pid = os.getpid()
+        EVENT_SINK_BUFFERED.set_function(self._buffer.qsize)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def submit(self, event) -> None:
+        """Called by emit(); never waits unless EVENT_SINK_OVERFLOW=block."""
+        try:
+            self._buffer.put_nowait(event)
+        except asyncio.QueueFull:
+            if self.block_on_full:
+                await self._buffer.put(event)
+            else:
+                EVENT_SINK_EVENTS.labels(self.sink.name, "dropped").inc()
+
+    async def _collect_batch(self) -> bool:
+        """Fill self._pending; True once close() asked the flusher to stop."""
+        item = await self._buffer.get()
+        if item is _STOP:
+            return True
+        self._pending.append(item)
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(self._pending) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._buffer.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP:
+                return True
+            self._pending.append(item)
+        return False
+
+    async def _write(self, events: List[Any]) -> None:
+        records = [dict(e.to_dict(), worker=self._pid) for e in events]
+        t0 = time.perf_counter()
+        try:
+            await self.sink.write_batch(records)
+            EVENT_SINK_EVENTS.labels(self.sink.name, "written").inc(len(records))
+        except Exception as e:
+            # Event logging must never take the service down — count and move on
+            print(f"⚠️  Event sink '{self.sink.name}' write failed ({e}); {len(records)} events lost")
+            EVENT_SINK_EVENTS.labels(self.sink.name, "failed").inc(len(records))
+        finally:
+            EVENT_SINK_BATCH_SECONDS.labels(self.sink.name).observe(time.perf_counter() - t0)
+
+    async def _run(self) -> None:
+        while True:
+            stop = await self._collect_batch()
+            if self._pending:
+                batch, self._pending = self._pending, []
+                await self._write(batch)
+            if stop:
+                return
+
+    async def close(self) -> None:
+        """Write everything still buffered, then stop the flusher and the sink."""
+        if self._task is not None:
+            # Queued behind the buffered events — the flusher drains them first.
+            # No task.cancel(): a cancelled wait_for can swallow the cancellation.
+            await self._buffer.put(_STOP)
+            await self._task
+            self._task = None
+        await self.sink.close()
+
+
+def create_event_sink(kind: str = Config.EVENT_SINK) -> Optional[BatchingEventSink]:
+    """EVENT_SINK=jsonl | broker → started BatchingEventSink; empty / none → None."""
+    kind = (kind or "").strip().lower()
+    if kind in ("", "none", "off"):
+        return None
+    if kind == "jsonl":
+        sink: EventSink = JsonlFileSink(Config.EVENT_SINK_PATH)
+    elif kind == "broker":
+        sink = LocalBrokerSink(latency_ms=Config.EVENT_SINK_BROKER_LATENCY_MS)
+    else:
+        print(f"⚠️  EVENT_SINK='{kind}' unknown — pipeline events are not persisted")
+        return None
+
+    batching = BatchingEventSink(sink)
+    batching.start()
+    print(f"--> Pipeline event sink: {sink.name} "
+          f"(batch {batching.batch_size}, flush {batching.flush_interval * 1000:.0f}ms)")
+    return batching
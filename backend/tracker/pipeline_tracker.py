@@ -1,16 +1,23 @@
 # backend/tracker/pipeline_tracker.py
 """
 Real-time pipeline event tracker.
-Designed to be Kafka-ready: swap _emit() to produce to a Kafka topic later.
-For now: in-memory asyncio.Queue per session.
+Live consumers (SSE): bounded in-memory queue per subscriber (SessionQueue).
+Durable log: optional batched sink (event_sink.py — JSONL file or the local
+broker stand-in for Kafka), fed without blocking the request path.
 """
 
 import asyncio
 import time
-from typing import Dict, Any, Optional
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+from ..utils.config import Config
+from ..utils.metrics import (
+    PIPELINE_EVENTS_DROPPED, PIPELINE_MAX_QUEUE_DEPTH, PIPELINE_QUEUED_EVENTS, PIPELINE_QUEUES,
+)
+
 
 class StepStatus(str, Enum):
     PENDING  = "pending"
@@ -35,27 +42,209 @@ class PipelineEvent:
         return d
 
 
-# ── Global registry: session_id → asyncio.Queue ──────────────────
-_SESSION_QUEUES: Dict[str, asyncio.Queue] = {}
+# ── Global registry: session_id → [SessionQueue, ...] ─────────
+# One bounded queue per subscriber; emit() fans every event out to all
+# queues of the session, so concurrent streams of one session each see the
+# whole event flow. Events for a session nobody listens to are dropped
+# inside emit() before an event object is even built; a queue is removed
+# when its subscriber unsubscribes, and the GC task removes queues whose
+# subscriber stopped reading (not waiting in get()) for QUEUE_IDLE_TTL.
+
+QUEUE_MAXSIZE  = Config.PIPELINE_QUEUE_MAXSIZE
+QUEUE_IDLE_TTL = Config.PIPELINE_QUEUE_IDLE_TTL
+GC_INTERVAL    = Config.PIPELINE_GC_INTERVAL
+
+
+def _is_critical(event: PipelineEvent) -> bool:
+    """Events a consumer must see — never dropped or coalesced."""
+    return (
+        event.step == "__done__"
+        or event.status == StepStatus.ERROR
+        or event.meta.get("kind") in ("result", "error")
+    )
+
+
+class SessionQueue:
+    """
+    asyncio.Queue-like FIFO (get / put_nowait / qsize) with a fixed bound.
+
+    When full, a new event is coalesced into the newest queued event of the
+    same step (a slow consumer only needs the latest progress of a stage);
+    otherwise the oldest non-critical event is dropped. Critical events
+    (result / error / done) always get in.
+    """
+
+    def __init__(self, maxsize: int = QUEUE_MAXSIZE):
+        self.maxsize = maxsize
+        self.waiters = 0
+        self.last_active = time.monotonic()
+        self._events: Deque[PipelineEvent] = deque()
+        self._wakeup = asyncio.Event()
+
+    def qsize(self) -> int:
+        return len(self._events)
+
+    def empty(self) -> bool:
+        return not self._events
 
+    def put_nowait(self, event: PipelineEvent) -> None:
+        if len(self._events) >= self.maxsize and not self._make_room(event):
+            return
+        self._events.append(event)
+        self._wakeup.set()
 
-def get_or_create_queue(session_id: str) -> asyncio.Queue:
-    if session_id not in _SESSION_QUEUES:
-        _SESSION_QUEUES[session_id] = asyncio.Queue()
-    return _SESSION_QUEUES[session_id]
+    def _make_room(self, event: PipelineEvent) -> bool:
+        """Free a slot for `event`; False → `event` itself is the one dropped."""
+        last = self._events[-1]
+        if not _is_critical(event) and not _is_critical(last) and last.step == event.step:
+            self._events.pop()
+            PIPELINE_EVENTS_DROPPED.labels("coalesced").inc()
+            return True
 
+        for i, queued in enumerate(self._events):
+            if not _is_critical(queued):
+                del self._events[i]
+                PIPELINE_EVENTS_DROPPED.labels("overflow").inc()
+                return True
 
-def drop_queue(session_id: str) -> None:
-    _SESSION_QUEUES.pop(session_id, None)
+        # Queue is all critical events — keep them; only non-critical ones bounce
+        if _is_critical(event):
+            return True
+        PIPELINE_EVENTS_DROPPED.labels("overflow").inc()
+        return False
+
+    async def put(self, event: PipelineEvent) -> None:
+        self.put_nowait(event)
+
+    async def get(self) -> PipelineEvent:
+        self.waiters += 1
+        try:
+            while not self._events:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+        finally:
+            self.waiters -= 1
+        self.last_active = time.monotonic()
+        return self._events.popleft()
+
+    def expire(self, session_id: str) -> None:
+        """Replace what is queued with error + done, so a late reader ends cleanly."""
+        self._events.clear()
+        self._events.append(PipelineEvent(session_id, "pipeline", StepStatus.ERROR,
+                                          "Event subscription expired", meta={"kind": "error"}))
+        self._events.append(PipelineEvent(session_id, "__done__", StepStatus.DONE, "Pipeline complete"))
+        self._wakeup.set()
+
+
+_SESSION_QUEUES: Dict[str, List[SessionQueue]] = {}
+
+
+def subscribe(session_id: str) -> SessionQueue:
+    """Register a consumer; from now on emit() delivers this session's events to its own queue."""
+    q = SessionQueue()
+    _SESSION_QUEUES.setdefault(session_id, []).append(q)
+    return q
+
+
+def unsubscribe(session_id: str, queue: SessionQueue) -> None:
+    """Consumer left; its queue goes with it (the session entry with the last one)."""
+    queues = _SESSION_QUEUES.get(session_id)
+    if queues is None:
+        return
+    if queue in queues:
+        queues.remove(queue)
+    if not queues:
+        del _SESSION_QUEUES[session_id]
+
+
+def has_subscribers(session_id: str) -> bool:
+    return bool(_SESSION_QUEUES.get(session_id))
+
+
+# ── Idle GC ──────────────────────────────────────────────────────
+
+def collect_idle_queues(ttl: float = QUEUE_IDLE_TTL) -> int:
+    """
+    Remove queues whose subscriber hasn't read for more than `ttl` seconds
+    and isn't waiting in get() — a consumer that went away without
+    unsubscribing. A waiting consumer is alive, however long the pipeline takes.
+    """
+    cutoff = time.monotonic() - ttl
+    removed = 0
+    for sid, queues in list(_SESSION_QUEUES.items()):
+        for q in [q for q in queues if not q.waiters and q.last_active < cutoff]:
+            q.expire(sid)
+            unsubscribe(sid, q)
+            removed += 1
+    return removed
+
+
+async def _gc_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        removed = collect_idle_queues()
+        if removed:
+            print(f"--> pipeline_tracker GC: removed {removed} idle queue(s)")
+
+
+_GC_TASK: Optional[asyncio.Task] = None
+
+
+def start_gc(interval: float = GC_INTERVAL) -> asyncio.Task:
+    """Start the idle-queue GC on the running loop (main.py lifespan)."""
+    global _GC_TASK
+    if _GC_TASK is None or _GC_TASK.done():
+        _GC_TASK = asyncio.create_task(_gc_loop(interval))
+    return _GC_TASK
+
+
+async def stop_gc() -> None:
+    global _GC_TASK
+    if _GC_TASK is not None:
+        _GC_TASK.cancel()
+        try:
+            await _GC_TASK
+        except asyncio.CancelledError:
+            pass
+        _GC_TASK = None
+
+
+def _all_queues() -> List[SessionQueue]:
+    return [q for queues in list(_SESSION_QUEUES.values()) for q in queues]
+
+
+PIPELINE_QUEUES.set_function(lambda: len(_all_queues()))
+PIPELINE_QUEUED_EVENTS.set_function(lambda: sum(q.qsize() for q in _all_queues()))
+PIPELINE_MAX_QUEUE_DEPTH.set_function(lambda: max((q.qsize() for q in _all_queues()), default=0))
+
+
+# ── Durable sink (set from main.py lifespan) ────────────────────
+_EVENT_SINK = None   # event_sink.BatchingEventSink | None
+
+
+def set_event_sink(sink) -> None:
+    global _EVENT_SINK
+    _EVENT_SINK = sink
+
+
+def wants_events(session_id: str) -> bool:
+    """True when an emit() for this session would reach a subscriber or the sink."""
+    return _EVENT_SINK is not None or has_subscribers(session_id)
 
 
 async def emit(session_id: str, step: str, status: StepStatus,
                message: str, meta: Optional[Dict] = None) -> None:
     """
     Emit a pipeline event.
-    LOCAL DEV  → puts into asyncio.Queue (SSE picks it up)
-    KAFKA FUTURE → replace with: await kafka_producer.send(topic, event.to_dict())
+    SSE      → every subscriber's SessionQueue for the session
+    DURABLE  → the batched event sink, if configured (EVENT_SINK)
+
+    Neither → returns straight away.
     """
+    queues = _SESSION_QUEUES.get(session_id)
+    if not queues and _EVENT_SINK is None:
+        return
+
     event = PipelineEvent(
         session_id=session_id,
         step=step,
@@ -63,13 +252,25 @@ async def emit(session_id: str, step: str, status: StepStatus,
         message=message,
         meta=meta or {},
     )
-    q = get_or_create_queue(session_id)
-    await q.put(event)
-    # ── KAFKA HOOK (future) ──────────────────────────────────────
-    # await kafka_producer.send("pipeline-events", value=event.to_dict())
-    # ────────────────────────────────────────────────────────────
+    if queues:
+        for q in queues:
+            q.put_nowait(event)
+    if _EVENT_SINK is not None:
+        await _EVENT_SINK.submit(event)
+
+
+async def emit_done(session_id: str, run: Optional[str] = None) -> None:
+    """Signal end of stream — `run` tells concurrent streams of one session apart."""
+    await emit(session_id, step="__done__", status=StepStatus.DONE, message="Pipeline complete",
+               meta={"run": run} if run else None)
 
 
-async def emit_done(session_id: str) -> None:
-    """Signal end of stream."""
-    await emit(session_id, step="__done__", status=StepStatus.DONE, message="Pipeline complete")
\ No newline at end of file
+async def emit_nodes(session_id: str, step: str, nodes) -> None:
+    """One "node" event per WorkflowNode the builder just added."""
+    if not wants_events(session_id):
+        return
+    for node in nodes:
+        await emit(session_id, step, StepStatus.RUNNING, f"Added node '{node.name}'", meta={
+            "kind": "node",
+            "node": {"id": node.id, "name": node.name, "type": node.type, "role": node.role},
+        })
@@ -560,10 +560,13 @@
 
 
 # backend/types/workflow.py
-from collections import deque
-from typing import List, Dict, Any, Optional, Tuple
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass, field
 from ..utils.config import Config
+from ..utils.node_positioning import compute_positions
 
 # ── Global node registry .....
 _NODE_REGISTRY: Dict[str, Dict[str, Any]] = {}
@@ -572,12 +575,30 @@ _ICON_BASE_URL = Config._ICON_BASE_URL
 
 
 def register_node_types(node_types: List[Dict[str, Any]]) -> None:
-    """NodeSearchEngine init pe call hota hai — ek baar registry populate karo."""
-    global _NODE_REGISTRY
-    _NODE_REGISTRY = {n.get("name", ""): n for n in node_types if n.get("name")}
+    """
+    NodeSearchEngine init pe call hota hai — ek baar registry populate karo,
+    aur har type ka output template bhi yahin compile karo.
+    """
+    global _NODE_REGISTRY, _NODE_TEMPLATES
+    registry = {n.get("name", ""): n for n in node_types if n.get("name")}
+    # add_or_update_node / delete_node re-register the whole list — types
+    # whose dict is unchanged keep their template
+    _NODE_TEMPLATES = {
+        name: _NODE_TEMPLATES[name] if _NODE_REGISTRY.get(name) is data else _compile_template(data)
+        for name, data in registry.items()
+    }
+    _NODE_REGISTRY = registry
     print(f"--> Node registry: {len(_NODE_REGISTRY)} nodes registered")
 
 
+def node_registry() -> Dict[str, Dict[str, Any]]:
+    """
+    The current registry. register_node_types() rebinds it, so import this
+    function — `from ... import _NODE_REGISTRY` keeps the dict of import time.
+    """
+    return _NODE_REGISTRY
+
+
 # ── Icon URL builder .....
 
 def _build_icon_url(node_data: Dict[str, Any]) -> str:
@@ -594,7 +615,7 @@ def _build_icon_url(node_data: Dict[str, Any]) -> str:
 
 
 # ── Dynamic nodeType inference .....
-def _infer_output_type(node_type: str) -> str:
+def _scan_output_type(node_data: Dict[str, Any]) -> str:
     """
     100% dynamic — registry se nodeType lo, koi hardcoding nahi.
     Priority:
@@ -603,17 +624,19 @@ def _infer_output_type(node_type: str) -> str:
       3. conditional array non-empty → conditional
       4. Fallback → action
     """
-    node_data = _NODE_REGISTRY.get(node_type)
-    if node_data:
-        nt = node_data.get("nodeType", "").lower()
-        if nt in ("trigger", "action", "conditional"):
-            return nt
-        if node_data.get("triggers"):
-            return "trigger"
-        if node_data.get("conditional"):
-            return "conditional"
+    nt = node_data.get("nodeType", "").lower()
+    if nt in ("trigger", "action", "conditional"):
+        return nt
+    if node_data.get("triggers"):
+        return "trigger"
+    if node_data.get("conditional"):
+        return "conditional"
     return "action"
 
+
+def _infer_output_type(node_type: str) -> str:
+    return _node_template(node_type).role
+
 def resolve_node_role(node: "WorkflowNode", is_start_node: bool) -> str:
     """
     Priority 1: node.role explicitly set by builder agent
@@ -629,48 +652,46 @@ def resolve_node_role(node: "WorkflowNode", is_start_node: bool) -> str:
 
     return registry_type
 
+
+def _all_fields(node_data: Dict[str, Any]) -> List[Any]:
+    return (
+        node_data.get("actions", []) +
+        node_data.get("triggers", []) +
+        node_data.get("conditional", []) +
+        node_data.get("properties", [])
+    )
+
+
+def _scan_operation(node_data: Dict[str, Any]) -> Optional[str]:
+    """Default of the node's 'operation' field — actions/triggers/conditional/properties mein se pehla."""
+    for f in _all_fields(node_data):
+        if isinstance(f, dict) and f.get("name") == "operation":
+            default_val = f.get("default", "")
+            if default_val:
+                return str(default_val)
+    return None
+
+
 def _infer_operation(node_type: str, out_type: str) -> str:
     """
     Dynamic operation value — node ki actual actions/triggers/conditional array se lo.
     Fallback: trigger=1, action/conditional=3
     """
-    node_data = _NODE_REGISTRY.get(node_type)
-    if node_data:
-        all_fields = (
-            node_data.get("actions", []) +
-            node_data.get("triggers", []) +
-            node_data.get("conditional", []) +
-            node_data.get("properties", [])
-        )
-        for f in all_fields:
-            if isinstance(f, dict) and f.get("name") == "operation":
-                default_val = f.get("default", "")
-                if default_val:
-                    return str(default_val)
-
+    operation = _node_template(node_type).operation
+    if operation:
+        return operation
     return "1" if out_type == "trigger" else "3"
 
 
-def _extract_defaults(node_type: str) -> Dict[str, Any]:
+def _scan_defaults(node_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Node ki actual data se saare default values extract karo.
     actions + triggers + conditional + properties — sab scan karo.
     authentication/baseSelector type fields skip karo.
     """
-    node_data = _NODE_REGISTRY.get(node_type)
-    if not node_data:
-        return {}
-
-    all_fields = (
-        node_data.get("actions", []) +
-        node_data.get("triggers", []) +
-        node_data.get("conditional", []) +
-        node_data.get("properties", [])
-    )
-
     defaults = {}
 
-    for f in all_fields:
+    for f in _all_fields(node_data):
         if not isinstance(f, dict):
             continue
 
@@ -702,130 +723,165 @@ def _extract_defaults(node_type: str) -> Dict[str, Any]:
     return defaults
 
 
-def _build_node_geometry(
-    node_id: str,
-    node_type: str,
-    out_type: str,
-    source_handles: Optional[List[str]] = None,
-) -> Tuple[Dict[str, int], Dict[str, Any]]:
+def _extract_defaults(node_type: str) -> Dict[str, Any]:
+    return dict(_node_template(node_type).defaults)
+
+
+# ── Per-type output templates .....
+
+@dataclass(frozen=True, slots=True)
+class NodeTemplate:
+    """
+    Everything to_output_dict() needs from the registry for one node type,
+    compiled once in register_node_types — serialization is then a copy of
+    `defaults` plus the LLM parameters.
+    """
+    defaults:    Dict[str, Any]   # shared — copy before overlaying parameters
+    operation:   Optional[str]    # registry default; None → role fallback (trigger=1, else 3)
+    role:        str              # trigger | action | conditional
+    icon_url:    str
+    action_id:   str
+    description: Any
+    has_description: bool         # no description key → the node's own name is used
+
+
+_UNREGISTERED = NodeTemplate(defaults={}, operation=None, role="action", icon_url="",
+                             action_id="", description=None, has_description=False)
+
+_NODE_TEMPLATES: Dict[str, NodeTemplate] = {}
+
+
+def _compile_template(node_data: Dict[str, Any]) -> NodeTemplate:
+    return NodeTemplate(
+        defaults=_scan_defaults(node_data),
+        operation=_scan_operation(node_data),
+        role=_scan_output_type(node_data),
+        icon_url=_build_icon_url(node_data),
+        action_id=str(node_data.get("id", "")),
+        description=node_data.get("description"),
+        has_description="description" in node_data,
+    )
+
+
+def _node_template(node_type: str) -> NodeTemplate:
+    return _NODE_TEMPLATES.get(node_type, _UNREGISTERED)
+
+
+# ── Canvas geometry templates .....
+
+@dataclass(frozen=True, slots=True)
+class GeometryTemplate:
     """
-    Build frontend node dimensions and handle bounds.
+    Dimensions and handle bounds of one node shape — (kind, trigger or not,
+    source handle ids) — built once and shared by every node of that shape.
+    Handle dicts hold a nodeId placeholder and are never handed out:
+    instantiate() copies them per node. `offsets` maps (handle kind, handle
+    id) → (x, width / 2, y, height / 2) for O(1) edge anchors.
+    """
+    dimensions: Dict[str, int]
+    source:     Tuple[Dict[str, Any], ...]
+    target:     Optional[Tuple[Dict[str, Any], ...]]
+    offsets:    Dict[Tuple[str, str], Tuple[float, float, float, float]]
+
+    def instantiate(self, node_id: str) -> Tuple[Dict[str, int], Dict[str, Any]]:
+        return self.dimensions.copy(), {
+            "source": _stamp(self.source, node_id),
+            "target": None if self.target is None else _stamp(self.target, node_id),
+        }
+
+    def handle_center(self, handle_kind: str, handle_id: str, x: Any, y: Any) -> Tuple[Optional[float], Optional[float]]:
+        """Canvas coordinates of a handle's center for a node placed at (x, y)."""
+        offset = self.offsets.get((handle_kind, handle_id))
+        if offset is None:
+            return None, None
+        hx, half_width, hy, half_height = offset
+        return float(x) + hx + half_width, float(y) + hy + half_height
+
+
+_GEOMETRY_TEMPLATES: Dict[Tuple[str, bool, Tuple[str, ...]], GeometryTemplate] = {}
+_GEOMETRY_TEMPLATES_MAX = 512   # handle ids come from connection types — keep it bounded
+
+
+def _stamp(handles: Tuple[Dict[str, Any], ...], node_id: str) -> List[Dict[str, Any]]:
+    # dict.copy() + one store beats both a literal and {**handle, ...}
+    stamped = []
+    for handle in handles:
+        handle = handle.copy()
+        handle["nodeId"] = node_id
+        stamped.append(handle)
+    return stamped
+
 
+def _handle(handle_id: str, kind: str, side: str, x: float, y: float) -> Dict[str, Any]:
+    return {"id": handle_id, "type": kind, "nodeId": None, "position": side,
+            "x": x, "y": y, "width": 6, "height": 6}
+
+
+def _compile_geometry(kind: str, is_trigger: bool, handles: Tuple[str, ...]) -> GeometryTemplate:
+    """
     Action/trigger nodes use the standard single-output geometry.
     Conditional nodes need branch-specific source handles so edges anchor
     to the correct visual ports on the canvas.
     """
-    is_trigger = (out_type == "trigger")
-    normalized_type = (node_type or "").upper()
-
-    if normalized_type == "IF":
+    if kind == "IF":
         dimensions = {"width": 260, "height": 80}
-        handle_bounds = {
-            "source": [
-                {
-                    "id": "true",
-                    "type": "source",
-                    "nodeId": node_id,
-                    "position": "right",
-                    "x": 256.171875,
-                    "y": 17.513015747070312,
-                    "width": 6,
-                    "height": 6,
-                },
-                {
-                    "id": "false",
-                    "type": "source",
-                    "nodeId": node_id,
-                    "position": "right",
-                    "x": 256.1771240234375,
-                    "y": 56.80000305175781,
-                    "width": 6,
-                    "height": 6,
-                },
-            ],
-            "target": None if is_trigger else [
-                {
-                    "id": "in",
-                    "type": "target",
-                    "nodeId": node_id,
-                    "position": "left",
-                    "x": -2.1614990234375,
-                    "y": 37.00520324707031,
-                    "width": 6,
-                    "height": 6,
-                }
-            ],
-        }
-        return dimensions, handle_bounds
-
-    if normalized_type == "SWITCH":
-        handles = source_handles or ["out"]
+        source = [
+            _handle("true", "source", "right", 256.171875, 17.513015747070312),
+            _handle("false", "source", "right", 256.1771240234375, 56.80000305175781),
+        ]
+        target = [_handle("in", "target", "left", -2.1614990234375, 37.00520324707031)]
+    elif kind == "SWITCH":
         spacing = 24
         height = max(80, 32 + (len(handles) * spacing))
         center_y = max(0, (height / 2) - 3)
         start_y = max(8, center_y - ((len(handles) - 1) * spacing / 2))
+        dimensions = {"width": 260, "height": height}
+        source = [
+            _handle(handle_id, "source", "right", 256.171875, start_y + (index * spacing))
+            for index, handle_id in enumerate(handles)
+        ]
+        target = [_handle("in", "target", "left", -2.1614990234375, center_y)]
+    else:
+        dimensions = {"width": 320, "height": 66}
+        source = [_handle("out", "source", "right", 316.20001220703125, 30.050018310546875)]
+        target = [_handle("in", "target", "left", -2.199981689453125, 30.050018310546875)]
+
+    if is_trigger:
+        target = None
+    offsets: Dict[Tuple[str, str], Tuple[float, float, float, float]] = {}
+    for handle in source + (target or []):
+        offsets.setdefault((handle["type"], handle["id"]), (
+            float(handle["x"]), float(handle["width"]) / 2, float(handle["y"]), float(handle["height"]) / 2,
+        ))
+    return GeometryTemplate(
+        dimensions=dimensions,
+        source=tuple(source),
+        target=None if target is None else tuple(target),
+        offsets=offsets,
+    )
 
-        handle_bounds = {
-            "source": [
-                {
-                    "id": handle_id,
-                    "type": "source",
-                    "nodeId": node_id,
-                    "position": "right",
-                    "x": 256.171875,
-                    "y": start_y + (index * spacing),
-                    "width": 6,
-                    "height": 6,
-                }
-                for index, handle_id in enumerate(handles)
-            ],
-            "target": None if is_trigger else [
-                {
-                    "id": "in",
-                    "type": "target",
-                    "nodeId": node_id,
-                    "position": "left",
-                    "x": -2.1614990234375,
-                    "y": center_y,
-                    "width": 6,
-                    "height": 6,
-                }
-            ],
-        }
-        return {"width": 260, "height": height}, handle_bounds
-
-    dimensions = {"width": 320, "height": 66}
-    handle_bounds = {
-        "source": [
-            {
-                "id": "out",
-                "type": "source",
-                "nodeId": node_id,
-                "position": "right",
-                "x": 316.20001220703125,
-                "y": 30.050018310546875,
-                "width": 6,
-                "height": 6,
-            }
-        ],
-        "target": None if is_trigger else [
-            {
-                "id": "in",
-                "type": "target",
-                "nodeId": node_id,
-                "position": "left",
-                "x": -2.199981689453125,
-                "y": 30.050018310546875,
-                "width": 6,
-                "height": 6,
-            }
-        ],
-    }
-    return dimensions, handle_bounds
+
+def _node_geometry(
+    node_type: str,
+    out_type: str,
+    source_handles: Optional[List[str]] = None,
+) -> GeometryTemplate:
+    """Shared geometry template for a node — only SWITCH depends on its handles."""
+    kind = (node_type or "").upper()
+    if kind not in ("IF", "SWITCH"):
+        kind = ""
+    handles = tuple(source_handles or ("out",)) if kind == "SWITCH" else ()
+    key = (kind, out_type == "trigger", handles)
+    template = _GEOMETRY_TEMPLATES.get(key)
+    if template is None:
+        if len(_GEOMETRY_TEMPLATES) >= _GEOMETRY_TEMPLATES_MAX:
+            _GEOMETRY_TEMPLATES.clear()
+        template = _GEOMETRY_TEMPLATES[key] = _compile_geometry(*key)
+    return template
 
 
 # ── WorkflowNode .
-@dataclass
+@dataclass(slots=True)
 class WorkflowNode:
     id:           str
     name:         str   # label e.g. "Send Welcome Email"
@@ -835,6 +891,12 @@ class WorkflowNode:
     parameters:   Dict[str, Any] = field(default_factory=dict)
     role:         Optional[str]  = None  # "trigger" | "action" | "conditional" | None  ← ADD THIS
 
+    def __post_init__(self) -> None:
+        # a handful of distinct types / roles across every live session — share them
+        self.type = sys.intern(self.type)
+        if self.role is not None:
+            self.role = sys.intern(self.role)
+
     def to_dict(self) -> Dict[str, Any]:
         """Internal format — used by builder/configurator agents."""
         return {
@@ -854,27 +916,23 @@ class WorkflowNode:
     ) -> Dict[str, Any]:
         """
         Final backend format — matches frontend canvas JSON spec.
-        Fully dynamic: all values come from _NODE_REGISTRY or LLM parameters.
+        Fully dynamic: all values come from the type's NodeTemplate (compiled
+        from _NODE_REGISTRY) or LLM parameters.
         """
-        out_type = resolve_node_role(self, is_start_node)  
+        template = _node_template(self.type)
+        out_type = resolve_node_role(self, is_start_node)
         params   = self._build_output_parameters(_infer_operation(self.type, out_type))
 
-        node_data     = _NODE_REGISTRY.get(self.type, {})
-        icon_url      = _build_icon_url(node_data)
-        description   = node_data.get("description", self.name)
-        action_id     = str(node_data.get("id", ""))        # ← node's 'id' field e.g. 132
+        icon_url      = template.icon_url
+        description   = template.description if template.has_description else self.name
+        action_id     = template.action_id                 # ← node's 'id' field e.g. 132
         resource_val  = params.get("resource", None)
         operation_val = params.get("operation", None)
         label         = self.name
 
         x, y = position_override or self.position
 
-        dimensions, handle_bounds = _build_node_geometry(
-            node_id=self.id,
-            node_type=self.type,
-            out_type=out_type,
-            source_handles=source_handles,
-        )
+        dimensions, handle_bounds = _node_geometry(self.type, out_type, source_handles).instantiate(self.id)
 
         if out_type == "trigger":
             node_type_actions = "trigger"
@@ -960,7 +1018,7 @@ class WorkflowEdge:
 
 # ── WorkflowConnection .....───────
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowConnection:
     node:  str
     type:  str
@@ -970,32 +1028,328 @@ class WorkflowConnection:
         return {"node": self.node, "type": self.type, "index": self.index}
 
 
+# ── Connections view ..........
+
+class ConnectionsView(Mapping):
+    """
+    Read-only n8n-style view of a SimpleWorkflow's edge table —
+    {source name: {connection type: [[WorkflowConnection, ...] per branch]}}.
+    Entries are decoded on access; change the graph through SimpleWorkflow.
+    """
+    __slots__ = ("_workflow",)
+
+    def __init__(self, workflow: "SimpleWorkflow") -> None:
+        self._workflow = workflow
+
+    def __getitem__(self, source_name: str) -> Dict[str, List[List[WorkflowConnection]]]:
+        if source_name not in self._workflow._out:
+            raise KeyError(source_name)
+        return {
+            conn_type: [
+                [WorkflowConnection(node=target, type=conn_type, index=0) for target in targets]
+                for targets in branches
+            ]
+            for conn_type, branches in self._workflow._slots(source_name)
+        }
+
+    def __contains__(self, source_name: object) -> bool:
+        return source_name in self._workflow._out
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._workflow._out)
+
+    def __len__(self) -> int:
+        return len(self._workflow._out)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
 # ── SimpleWorkflow .....───────────
 
-@dataclass
 class SimpleWorkflow:
-    name:        str
-    nodes:       List[WorkflowNode] = field(default_factory=list)
-    connections: Dict[str, Dict[str, List[List[WorkflowConnection]]]] = field(default_factory=dict)
+    """
+    nodes + n8n-style connections ({source name: {type: [[conn, ...] per branch]}}).
+
+    Connections live in a compact edge table: node names and connection
+    types are interned once into a per-workflow symbol table and every
+    source's connections are one uint32 array —
+    [type, branch count, len(branch 0), target, ..., len(branch 1), ...] per
+    connection type. `connections` decodes it on access (ConnectionsView);
+    WorkflowConnection.index is always 0, as every writer sets it.
+
+    Lookups and graph passes go through indexes kept in step with every
+    mutation — name → node, id → node, and forward / reverse adjacency
+    ({name: array of neighbour symbols, one per connection}). Change the
+    graph through add_node / insert_node / remove_node / connect /
+    disconnect / clear; after editing `nodes` by hand call reindex().
+    """
+    __slots__ = (
+        "name", "nodes",
+        "_symbols", "_symbol_ids", "_out",
+        "_by_name", "_by_id", "_children", "_parents", "_shadowed",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        nodes: Optional[List[WorkflowNode]] = None,
+        connections: Optional[Mapping] = None,
+    ) -> None:
+        self.name = name
+        self.nodes = [] if nodes is None else nodes
+        self._rebuild({
+            src: [(conn_type, [[c.node for c in arr] for arr in arrays]) for conn_type, arrays in conn_types.items()]
+            for src, conn_types in (connections or {}).items()
+        })
+
+    @property
+    def connections(self) -> ConnectionsView:
+        return ConnectionsView(self)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SimpleWorkflow):
+            return NotImplemented
+        return (self.name, self.nodes, self.connections) == (other.name, other.nodes, other.connections)
+
+    def __repr__(self) -> str:
+        return f"SimpleWorkflow(name={self.name!r}, nodes={self.nodes!r}, connections={self.connections!r})"
+
+    # ── Edge table ───────────────────────────────────────────────
+
+    def _symbol(self, value: str) -> int:
+        sid = self._symbol_ids.get(value)
+        if sid is None:
+            value = sys.intern(value)
+            sid = self._symbol_ids[value] = len(self._symbols)
+            self._symbols.append(value)
+        return sid
+
+    def _slots(self, source_name: str) -> List[Tuple[str, List[List[str]]]]:
+        """Decode `source_name`'s array → [(connection type, [[target, ...] per branch]), ...]."""
+        data = self._out.get(source_name)
+        if data is None:
+            return []
+        symbols = self._symbols
+        slots, i = [], 0
+        while i < len(data):
+            conn_type, width = symbols[data[i]], data[i + 1]
+            i += 2
+            branches = []
+            for _ in range(width):
+                length = data[i]
+                branches.append([symbols[t] for t in data[i + 1:i + 1 + length]])
+                i += 1 + length
+            slots.append((conn_type, branches))
+        return slots
+
+    def _store(self, source_name: str, slots: List[Tuple[str, List[List[str]]]]) -> None:
+        data = array("I")
+        for conn_type, branches in slots:
+            data.append(self._symbol(conn_type))
+            data.append(len(branches))
+            for targets in branches:
+                data.append(len(targets))
+                data.extend(self._symbol(t) for t in targets)
+        self._out[sys.intern(source_name)] = data     # an existing source keeps its place
+
+    # ── Indexes ──────────────────────────────────────────────────
+
+    def reindex(self) -> None:
+        """Rebuild the symbol table and every index from `nodes` and the edge table."""
+        self._rebuild({src: self._slots(src) for src in self._out})
+
+    def _rebuild(self, layout: Dict[str, List[Tuple[str, List[List[str]]]]]) -> None:
+        self._symbols, self._symbol_ids, self._out = [], {}, {}
+        self._by_name, self._by_id = {}, {}
+        self._children, self._parents = {}, {}
+        self._shadowed = set()
+        for node in self.nodes:
+            self._index_node(node)
+        for src, slots in layout.items():
+            self._store(src, slots)
+            for _, branches in slots:
+                for targets in branches:
+                    for target in targets:
+                        self._link(src, target)
+
+    def _index_node(self, node: WorkflowNode) -> None:
+        # first node wins on duplicate names / ids, like the old linear scans;
+        # duplicates are remembered so removing the winner can promote the next
+        for index, attr in ((self._by_name, "name"), (self._by_id, "id")):
+            key = getattr(node, attr)
+            if index.setdefault(key, node) is not node:
+                self._shadowed.add((attr, key))
+
+    def _unindex_node(self, node: WorkflowNode) -> None:
+        for index, attr in ((self._by_name, "name"), (self._by_id, "id")):
+            key = getattr(node, attr)
+            if index.get(key) is node:
+                del index[key]
+                if (attr, key) in self._shadowed:
+                    twin = next((n for n in self.nodes if getattr(n, attr) == key), None)
+                    if twin is not None:
+                        index[key] = twin
+
+    def _link(self, src: str, tgt: str) -> None:
+        self._children.setdefault(sys.intern(src), array("I")).append(self._symbol(tgt))
+        self._parents.setdefault(sys.intern(tgt), array("I")).append(self._symbol(src))
+
+    def _unlink(self, src: str, tgt: str) -> None:
+        # drops the *last* matching entry, so first-linked order of the rest holds
+        for index, a, b in ((self._children, src, tgt), (self._parents, tgt, src)):
+            refs, sid = index.get(a), self._symbol_ids.get(b)
+            if refs is None or sid is None:
+                continue
+            for i in range(len(refs) - 1, -1, -1):
+                if refs[i] == sid:
+                    del refs[i]
+                    break
+            if not refs:
+                del index[a]
+
+    # ── Mutations ────────────────────────────────────────────────
 
     def add_node(self, node: WorkflowNode) -> None:
         self.nodes.append(node)
+        self._index_node(node)
+
+    def insert_node(self, index: int, node: WorkflowNode) -> None:
+        self.nodes.insert(index, node)
+        if node.name in self._by_name or node.id in self._by_id:
+            self.reindex()      # duplicate name / id — recompute which one comes first
+        else:
+            self._index_node(node)
+
+    def remove_node(self, node: WorkflowNode) -> List[Tuple[str, str, int]]:
+        """
+        Remove `node`, its outgoing connections and every connection into it.
+        Returns the (source, connection type, branch) slots that pointed at
+        it, so a caller can bridge them to the node's old targets — those
+        arrays are left in place (possibly empty); prune_connections() after.
+        """
+        incoming: List[Tuple[str, str, int]] = []
+        sources = set(self.predecessors(node.name))
+        for src in [s for s in self._out if s in sources]:   # connection order
+            if src == node.name:
+                continue
+            slots = self._slots(src)
+            for conn_type, branches in slots:
+                for branch, targets in enumerate(branches):
+                    kept = [t for t in targets if t != node.name]
+                    if len(kept) != len(targets):
+                        incoming.append((src, conn_type, branch))
+                        for _ in range(len(targets) - len(kept)):
+                            self._unlink(src, node.name)
+                        targets[:] = kept
+            self._store(src, slots)
+
+        for _, branches in self._slots(node.name):
+            for targets in branches:
+                for target in targets:
+                    self._unlink(node.name, target)
+        self._out.pop(node.name, None)
+
+        self.nodes = [n for n in self.nodes if n is not node]
+        self._unindex_node(node)
+        return incoming
+
+    def connect(
+        self,
+        source_name: str,
+        target_name: str,
+        connection_type: str = "main",
+        branch: int = 0,
+        position: Optional[int] = None,
+    ) -> WorkflowConnection:
+        """Append (or insert at `position`) a source → target connection on `branch`."""
+        data = self._out.get(source_name)
+        if branch == 0 and position is None and (data is None or (
+                len(data) == 3 + data[2] and data[1] == 1 and self._symbols[data[0]] == connection_type)):
+            # fast path — the source's only slot is a single branch of this type
+            if data is None:
+                data = self._out[sys.intern(source_name)] = array("I", (self._symbol(connection_type), 1, 0))
+            data[2] += 1
+            data.append(self._symbol(target_name))
+            self._link(source_name, target_name)
+            return WorkflowConnection(node=target_name, type=connection_type, index=0)
+
+        slots = self._slots(source_name)
+        branches = next((b for ct, b in slots if ct == connection_type), None)
+        if branches is None:
+            branches = [[]]
+            slots.append((connection_type, branches))
+        while len(branches) <= branch:
+            branches.append([])
+        if position is None:
+            branches[branch].append(target_name)
+        else:
+            branches[branch].insert(position, target_name)
+        self._store(source_name, slots)
+        self._link(source_name, target_name)
+        return WorkflowConnection(node=target_name, type=connection_type, index=0)
+
+    def disconnect(self, source_name: str, target_name: str) -> Optional[Tuple[str, int, int, WorkflowConnection]]:
+        """
+        Remove the first source → target connection.
+        Returns (connection type, branch, position, removed connection) or None.
+        """
+        if not self.has_connection(source_name, target_name):
+            return None
+        slots = self._slots(source_name)
+        for conn_type, branches in slots:
+            for branch, targets in enumerate(branches):
+                if target_name in targets:
+                    position = targets.index(target_name)
+                    del targets[position]
+                    self._store(source_name, slots)
+                    self._unlink(source_name, target_name)
+                    return conn_type, branch, position, WorkflowConnection(node=target_name, type=conn_type, index=0)
+        return None
+
+    def clear(self) -> None:
+        self.nodes.clear()
+        self._out.clear()
+        self.reindex()
+
+    def prune_connections(self, source_name: str) -> None:
+        """Remove connection entries of `source_name` that no longer hold any edge."""
+        if source_name not in self._out:
+            return
+        slots = [(ct, branches) for ct, branches in self._slots(source_name) if any(branches)]
+        if slots:
+            self._store(source_name, slots)
+        else:
+            del self._out[source_name]
+
+    # ── Lookups ──────────────────────────────────────────────────
 
     def get_node_by_id(self, node_id: str) -> Optional[WorkflowNode]:
-        return next((n for n in self.nodes if n.id == node_id), None)
+        return self._by_id.get(node_id)
 
     def get_node_by_name(self, name: str) -> Optional[WorkflowNode]:
-        return next((n for n in self.nodes if n.name == name), None)
+        return self._by_name.get(name)
 
-    def _find_start_node_ids(self) -> set:
-        all_targets = set()
-        for conn_types in self.connections.values():
-            for arrays in conn_types.values():
-                for arr in arrays:
-                    for conn in arr:
-                        all_targets.add(conn.node)
+    def successors(self, name: str) -> List[str]:
+        """Target names of `name`'s connections (each once, first-connected first)."""
+        return [self._symbols[sid] for sid in dict.fromkeys(self._children.get(name, ()))]
+
+    def predecessors(self, name: str) -> List[str]:
+        return [self._symbols[sid] for sid in dict.fromkeys(self._parents.get(name, ()))]
+
+    def is_connected(self, name: str) -> bool:
+        return name in self._children or name in self._parents
+
+    def has_connection(self, source_name: str, target_name: str) -> bool:
+        sid = self._symbol_ids.get(target_name)
+        return sid is not None and sid in self._children.get(source_name, ())
 
-        start_ids = {node.id for node in self.nodes if node.name not in all_targets}
+    @property
+    def connection_count(self) -> int:
+        return sum(len(refs) for refs in self._children.values())
+
+    def _find_start_node_ids(self) -> set:
+        start_ids = {node.id for node in self.nodes if node.name not in self._parents}
 
         if not start_ids and self.nodes:
             start_ids.add(self.nodes[0].id)
@@ -1007,19 +1361,23 @@ class SimpleWorkflow:
         start_ids = self._find_start_node_ids() 
         node_source_handles = self._collect_source_handles()
         node_positions = self._compute_canvas_positions()
-        node_outputs = [
-            n.to_output_dict(
-                source_handles=node_source_handles.get(n.name),
+        node_outputs, anchors = [], {}
+        for n in self.nodes:
+            handles, is_start = node_source_handles.get(n.name), n.id in start_ids
+            output = n.to_output_dict(
+                source_handles=handles,
                 position_override=node_positions.get(n.id),
-                is_start_node=(n.id in start_ids),  
+                is_start_node=is_start,
             )
-            for n in self.nodes
-        ]
+            node_outputs.append(output)
+            position = output["position"]
+            anchors[n.id] = (position["x"], position["y"],
+                             _node_geometry(n.type, resolve_node_role(n, is_start), handles))
         return {
             "id":       1,
             "name":     self.name,
             "nodes":    node_outputs,
-            "edges":    self._build_edges({node["id"]: node for node in node_outputs}),
+            "edges":    self._build_edges(anchors),
             "viewport": {"x": 0, "y": 0, "zoom": 1},
             "publish":  0
         }
@@ -1029,109 +1387,39 @@ class SimpleWorkflow:
         Compute stable canvas coordinates from workflow connections.
 
         This keeps straight flows on one horizontal lane and spreads branches
-        vertically so the canvas looks closer to a workflow builder layout.
+        vertically so the canvas looks closer to a workflow builder layout —
+        see utils/node_positioning.py for the layered layout itself.
         """
         if not self.nodes:
             return {}
 
-        start_x = 80
-        start_y = 240
-        horizontal_gap = 430
-        vertical_gap = 170
-
-        node_by_name = {node.name: node for node in self.nodes}
-        node_order = {node.id: index for index, node in enumerate(self.nodes)}
-        children_by_id: Dict[str, List[Tuple[int, str]]] = {node.id: [] for node in self.nodes}
-        indegree: Dict[str, int] = {node.id: 0 for node in self.nodes}
-
-        for src_name, conn_types in self.connections.items():
+        node_by_name = self._by_name
+        edges: List[Tuple[str, int, str]] = []
+        for src_name in self._out:
             src_node = node_by_name.get(src_name)
             if not src_node:
                 continue
 
-            for _, conn_arrays in conn_types.items():
+            for _, conn_arrays in self._slots(src_name):
                 for branch_index, conn_array in enumerate(conn_arrays):
-                    for conn_index, conn in enumerate(conn_array):
-                        target_node = node_by_name.get(conn.node)
+                    for conn_index, target_name in enumerate(conn_array):
+                        target_node = node_by_name.get(target_name)
                         if not target_node:
                             continue
 
                         effective_branch = conn_index if len(conn_arrays) == 1 else branch_index
-                        children_by_id[src_node.id].append((effective_branch, target_node.id))
-                        indegree[target_node.id] += 1
-
-        root_ids = [node.id for node in self.nodes if indegree[node.id] == 0]
-        if not root_ids:
-            root_ids = [self.nodes[0].id]
-
-        roots_sorted = sorted(root_ids, key=lambda node_id: node_order[node_id])
-
-        depth_by_id: Dict[str, int] = {}
-        depth_queue = deque((root_id, 0) for root_id in roots_sorted)
-        while depth_queue:
-            node_id, depth = depth_queue.popleft()
-            if depth <= depth_by_id.get(node_id, -1):
-                continue
+                        edges.append((src_node.id, effective_branch, target_node.id))
 
-            depth_by_id[node_id] = depth
-            for _, child_id in children_by_id.get(node_id, []):
-                depth_queue.append((child_id, depth + 1))
-
-        lane_by_id: Dict[str, float] = {}
-        for root_index, root_id in enumerate(roots_sorted):
-            lane_by_id[root_id] = float(root_index * 2)
-
-        lane_queue = deque(roots_sorted)
-        visited: set[str] = set()
-        while lane_queue:
-            node_id = lane_queue.popleft()
-            if node_id in visited:
-                continue
-            visited.add(node_id)
-
-            base_lane = lane_by_id.get(node_id, 0.0)
-            outgoing = children_by_id.get(node_id, [])
-            if not outgoing:
-                continue
-
-            outgoing_sorted = sorted(
-                outgoing,
-                key=lambda item: (item[0], node_order.get(item[1], 10**9)),
-            )
-            center = (len(outgoing_sorted) - 1) / 2
-
-            for child_index, (_, child_id) in enumerate(outgoing_sorted):
-                proposed_lane = base_lane + ((child_index - center) * 1.5)
-                current_lane = lane_by_id.get(child_id)
-
-                if current_lane is None:
-                    lane_by_id[child_id] = proposed_lane
-                else:
-                    lane_by_id[child_id] = (current_lane + proposed_lane) / 2
-
-                lane_queue.append(child_id)
-
-        positions: Dict[str, Tuple[int, int]] = {}
-        fallback_depth = max(depth_by_id.values(), default=0) + 1
-
-        for fallback_index, node in enumerate(self.nodes):
-            depth = depth_by_id.get(node.id, fallback_depth + fallback_index)
-            lane = lane_by_id.get(node.id, float(fallback_index))
-            positions[node.id] = (
-                int(start_x + (depth * horizontal_gap)),
-                int(start_y + (lane * vertical_gap)),
-            )
-
-        return positions
+        return compute_positions([node.id for node in self.nodes], edges)
 
     def _collect_source_handles(self) -> Dict[str, List[str]]:
         handles_by_node: Dict[str, List[str]] = {}
 
-        for src_name, conn_types in self.connections.items():
+        for src_name in self._out:
             src_node = self.get_node_by_name(src_name)
             src_node_type = src_node.type if src_node else ""
             ordered_handles: List[str] = []
-            for connection_type, conn_arrays in conn_types.items():
+            for connection_type, conn_arrays in self._slots(src_name):
                 for branch_index, _ in enumerate(conn_arrays):
                     handle_id = self._connection_to_source_handle(
                         node_type=src_node_type,
@@ -1169,34 +1457,21 @@ class SimpleWorkflow:
 
         return normalized
 
-    @staticmethod
-    def _resolve_handle_center(
-        node_output: Dict[str, Any],
-        handle_kind: str,
-        handle_id: str,
-    ) -> Tuple[Optional[float], Optional[float]]:
-        handle_bounds = node_output.get("handleBounds", {}) or {}
-        handles = handle_bounds.get(handle_kind) or []
-        handle = next((h for h in handles if h.get("id") == handle_id), None)
-        if not handle:
-            return None, None
-
-        position = node_output.get("position", {}) or {}
-        x = float(position.get("x", 0)) + float(handle.get("x", 0)) + (float(handle.get("width", 0)) / 2)
-        y = float(position.get("y", 0)) + float(handle.get("y", 0)) + (float(handle.get("height", 0)) / 2)
-        return x, y
-
-    def _build_edges(self, node_outputs_by_id: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
-        name_to_id = {n.name: n.id for n in self.nodes}
+    def _build_edges(
+        self,
+        anchors: Optional[Dict[str, Tuple[Any, Any, GeometryTemplate]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Canvas edges; with `anchors` ({node id: (x, y, geometry)}) also their end coordinates."""
+        by_name = self._by_name
         edges, seen = [], set()
 
-        for src_name, conn_types in self.connections.items():
-            src_id = name_to_id.get(src_name)
-            if not src_id:
+        for src_name in self._out:
+            src_node = by_name.get(src_name)
+            if not src_node or not src_node.id:
                 continue
-            src_node = self.get_node_by_name(src_name)
-            src_node_type = src_node.type if src_node else ""
-            for connection_type, conn_arrays in conn_types.items():
+            src_id = src_node.id
+            src_node_type = src_node.type
+            for connection_type, conn_arrays in self._slots(src_name):
                 for branch_index, conn_array in enumerate(conn_arrays):
                     # ── FIX START (added conn_index loop) ──────────────────────────────
                     # OLD CODE (2 lines):
@@ -1216,7 +1491,7 @@ class SimpleWorkflow:
                     # first target → "true", second target → "false", etc.
                     # If the LLM already spreads targets across separate arrays
                     # (len(conn_arrays)>1), keep using branch_index as before — no change.
-                    for conn_index, conn in enumerate(conn_array):
+                    for conn_index, target_name in enumerate(conn_array):
                         effective_branch = (
                             conn_index if len(conn_arrays) == 1 else branch_index
                         )
@@ -1226,7 +1501,8 @@ class SimpleWorkflow:
                             branch_index=effective_branch,
                         )
                     # ── FIX END ────────────────────────────────────────────────────────
-                        tgt_id = name_to_id.get(conn.node)
+                        tgt_node = by_name.get(target_name)
+                        tgt_id = tgt_node.id if tgt_node else None
                         if not tgt_id:
                             continue
                         key = (src_id, tgt_id, source_handle)
@@ -1234,21 +1510,15 @@ class SimpleWorkflow:
                             continue
                         seen.add(key)
                         source_x = source_y = target_x = target_y = None
-                        if node_outputs_by_id:
-                            src_node_output = node_outputs_by_id.get(src_id)
-                            tgt_node_output = node_outputs_by_id.get(tgt_id)
-                            if src_node_output:
-                                source_x, source_y = self._resolve_handle_center(
-                                    src_node_output,
-                                    "source",
-                                    source_handle,
-                                )
-                            if tgt_node_output:
-                                target_x, target_y = self._resolve_handle_center(
-                                    tgt_node_output,
-                                    "target",
-                                    "in",
-                                )
+                        if anchors:
+                            src_anchor = anchors.get(src_id)
+                            tgt_anchor = anchors.get(tgt_id)
+                            if src_anchor:
+                                x, y, geometry = src_anchor
+                                source_x, source_y = geometry.handle_center("source", source_handle, x, y)
+                            if tgt_anchor:
+                                x, y, geometry = tgt_anchor
+                                target_x, target_y = geometry.handle_center("target", "in", x, y)
                         edges.append(
                             WorkflowEdge(
                                 src_id,
@@ -36,11 +36,105 @@ class Config:
     LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.2"))
 
     LLM_MODEL_FAST = os.getenv("LLM_MODEL_FAST", "").strip()
+
+    # LLM record/replay (backend/utils/llm_cassette.py)
+    #   live   → real Groq calls (default)
+    #   record → real Groq calls, responses saved to LLM_CASSETTE_DIR
+    #   replay → responses served from LLM_CASSETTE_DIR, no network / API key
+    LLM_MODE = os.getenv("LLM_MODE", "live").strip().lower()
+    LLM_CASSETTE_DIR = os.getenv("LLM_CASSETTE_DIR", "cassettes").strip()
+    # Replay delay per call in ms, or "recorded" to replay the measured latency
+    LLM_REPLAY_LATENCY_MS = os.getenv("LLM_REPLAY_LATENCY_MS", "0").strip().lower()
     
+    # Pipeline event queues (backend/tracker/pipeline_tracker.py)
+    PIPELINE_QUEUE_MAXSIZE = int(os.getenv("PIPELINE_QUEUE_MAXSIZE", "256"))
+    # Seconds a subscriber queue may go unread (no reader waiting) before the GC removes it
+    PIPELINE_QUEUE_IDLE_TTL = float(os.getenv("PIPELINE_QUEUE_IDLE_TTL", "300"))
+    PIPELINE_GC_INTERVAL = float(os.getenv("PIPELINE_GC_INTERVAL", "60"))
+
+    # Durable pipeline event log (backend/tracker/event_sink.py)
+    #   "" → off | "jsonl" → EVENT_SINK_PATH | "broker" → local Kafka stand-in
+    EVENT_SINK = os.getenv("EVENT_SINK", "").strip().lower()
+    EVENT_SINK_PATH = os.getenv("EVENT_SINK_PATH", "logs/pipeline_events.jsonl").strip()
+    EVENT_SINK_BATCH_SIZE = int(os.getenv("EVENT_SINK_BATCH_SIZE", "200"))
+    EVENT_SINK_FLUSH_MS = float(os.getenv("EVENT_SINK_FLUSH_MS", "500"))
+    EVENT_SINK_BUFFER_SIZE = int(os.getenv("EVENT_SINK_BUFFER_SIZE", "10000"))
+    # Buffer full: "drop" (never slows requests) | "block" (lossless backpressure)
+    EVENT_SINK_OVERFLOW = os.getenv("EVENT_SINK_OVERFLOW", "drop").strip().lower()
+    EVENT_SINK_BROKER_LATENCY_MS = float(os.getenv("EVENT_SINK_BROKER_LATENCY_MS", "0"))
+
+    # Warm up (pipeline imports, catalogue, orchestrator, search index) in the
+    # background after the server starts listening; GET /ready flips when done.
+    # false → old behaviour: the server only starts once everything is ready
+    STARTUP_BACKGROUND = os.getenv("STARTUP_BACKGROUND", "true").strip().lower() == "true"
+
+    # /workflow responses are encoded with orjson and NOT re-validated against
+    # WorkflowResponse (backend/utils/fast_json.py); true → validate (debug)
+    VALIDATE_RESPONSES = os.getenv("VALIDATE_RESPONSES", "false").strip().lower() == "true"
+
+    # Multi-turn session store (backend/state/session_store.py)
+    SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", "1000"))
+    # Seconds since the last turn before a session is forgotten
+    SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "1800"))
+    # Approximate memory cap for all stored sessions; LRU sessions go first
+    SESSION_MAX_MEMORY_MB = float(os.getenv("SESSION_MAX_MEMORY_MB", "256"))
+
+    # Durable sessions (backend/state/sqlite_checkpointer.py) — "" keeps them in memory only.
+    # Retention: after every flush a thread keeps its newest CHECKPOINT_KEEP
+    # checkpoints (+ their writes and the blobs they use); threads not written
+    # or read for CHECKPOINT_TTL seconds (default SESSION_IDLE_TTL) are deleted
+    # by a sweep every CHECKPOINT_SWEEP_INTERVAL. 0 turns either off.
+    CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", "data/checkpoints.sqlite").strip()
+    CHECKPOINT_KEEP = int(os.getenv("CHECKPOINT_KEEP", "3"))
+    CHECKPOINT_TTL = float(os.getenv("CHECKPOINT_TTL", str(SESSION_IDLE_TTL)))
+    CHECKPOINT_SWEEP_INTERVAL = float(os.getenv("CHECKPOINT_SWEEP_INTERVAL", "60"))
+    CHECKPOINT_BATCH_SIZE = int(os.getenv("CHECKPOINT_BATCH_SIZE", "256"))
+    CHECKPOINT_FLUSH_MS = float(os.getenv("CHECKPOINT_FLUSH_MS", "200"))
+    # LangGraph durability: "exit" → one checkpoint per turn | "async" → one per step
+    CHECKPOINT_DURABILITY = os.getenv("CHECKPOINT_DURABILITY", "exit").strip().lower()
+
+    # Async job API (backend/engines/job_queue.py) — POST /workflow/jobs
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+    # Submissions beyond this many waiting jobs get 429
+    JOB_MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", "1000"))
+    # Finished jobs stay fetchable this long (and at most JOB_MAX_STORED of them)
+    JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+    JOB_MAX_STORED = int(os.getenv("JOB_MAX_STORED", "10000"))
+
+    # POST /workflow dedup (backend/engines/single_flight.py): identical
+    # concurrent requests share one run; Idempotency-Key results are replayed
+    SINGLE_FLIGHT = os.getenv("SINGLE_FLIGHT", "true").strip().lower() == "true"
+    IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "1000"))
+
+    # POST /workflow/batch — pipelines run at once per batch (request may
+    # ask for more, up to BATCH_MAX_CONCURRENCY)
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+    BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+    BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+
+    # GET /nodes — catalogue pages (cursor pagination) and the cache of
+    # encoded (projected + gzip/br) page bodies, keyed by ETag
+    NODES_PAGE_SIZE = int(os.getenv("NODES_PAGE_SIZE", "100"))
+    NODES_MAX_PAGE_SIZE = int(os.getenv("NODES_MAX_PAGE_SIZE", "1000"))
+    NODES_CACHE_MB = float(os.getenv("NODES_CACHE_MB", "32"))
+
     # Agent Configuration
     MAX_ITERATIONS = 10
     MAX_BUILDER_ITERATIONS = 15
     MAX_CONFIGURATOR_ITERATIONS = 10
+    # WORKFLOW_MODIFY on an existing workflow (agents/modifier.py) — 1 call for
+    # a clean edit, 2 when a node type has to be looked up first
+    MODIFIER_MAX_ITERATIONS = int(os.getenv("MODIFIER_MAX_ITERATIONS", "3"))
+
+    # Builder prompt compaction — older tool rounds are folded into a
+    # running workflow summary; only the last N rounds are sent verbatim
+    BUILDER_COMPACTION = os.getenv("BUILDER_COMPACTION", "true").strip().lower() == "true"
+    BUILDER_KEEP_ROUNDS = int(os.getenv("BUILDER_KEEP_ROUNDS", "1"))
+
+    # Builder mode: "tools" (agentic tool loop) | "plan" (one JSON plan, applied locally)
+    # Can be overridden per request via WorkflowRequest.builder_mode
+    BUILDER_MODE = os.getenv("BUILDER_MODE", "tools").strip().lower()
     
     # Workflow Configuration
     DEFAULT_WORKFLOW_NAME = "New Workflow"
@@ -0,0 +1,55 @@
+# backend/utils/fast_json.py
+"""
+Trusted fast path for JSON responses built from our own data.
+
+A dict returned from an endpoint with response_model=WorkflowResponse is
+validated field by field (WorkflowResponse → NodeOut → HandleBounds /
+NodeData ...), converted by jsonable_encoder and encoded by the stdlib
+json module. SimpleWorkflow.to_output_dict() already produces exactly
+that shape, so for 50+ node workflows most of the response CPU is spent
+re-checking data we just generated.
+
+trusted_response() skips all of that: the payload is encoded once with
+orjson into a pre-serialized Response, which FastAPI passes through
+untouched (response_model stays on the route for the OpenAPI schema).
+With VALIDATE_RESPONSES=true (debug) the payload is still validated
+against the model first and a mismatch fails the request loudly.
+"""
+
+from typing import Any, Mapping, Optional, Type
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+from .config import Config
+
+_OPTS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj: Any) -> bytes:
+    """orjson with str() for anything it cannot encode (same as json.dumps(default=str))."""
+    return orjson.dumps(obj, default=str, option=_OPTS)
+
+
+class TrustedJSONResponse(Response):
+    """JSON response whose content is bytes already, or encoded with orjson."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def trusted_response(
+    payload: Any,
+    model: Optional[Type[BaseModel]] = None,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> TrustedJSONResponse:
+    """Pre-serialized response for a payload we built ourselves (validated only in debug)."""
+    if Config.VALIDATE_RESPONSES and model is not None and not isinstance(payload, bytes):
+        model.model_validate(payload)
+    return TrustedJSONResponse(payload, status_code=status_code, headers=headers)
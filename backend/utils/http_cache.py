@@ -0,0 +1,113 @@
+# backend/utils/http_cache.py
+"""
+Conditional GET + compression helpers for GET /nodes.
+
+  cursors      opaque url-safe tokens wrapping the last node name of a page
+  ETags        strong, derived from NodeSearchEngine.catalog_version plus
+               everything that shapes the body (cursor, limit, fields,
+               content coding) — a client revalidating with If-None-Match
+               gets a 304 until the catalogue itself changes
+  encoding     br (only if the optional `brotli` package is installed) or
+               gzip, picked from Accept-Encoding
+
+Encoded page bodies are kept in a small LRU keyed by ETag, so the same
+page requested by many clients is projected, serialized and compressed
+once per catalogue version.
+"""
+
+import base64
+import gzip
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+from .metrics import record_cache
+
+try:
+    import brotli
+except ImportError:          # optional — gzip only
+    brotli = None
+
+
+def encode_cursor(name: str) -> str:
+    return base64.urlsafe_b64encode(name.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Raises ValueError for anything encode_cursor() did not produce."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+    except (UnicodeError, ValueError) as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+
+
+def strong_etag(*parts: object) -> str:
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode("utf-8"), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison (RFC 9110 §13.1.2): W/ is ignored."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """'br' | 'gzip' | None (identity) from an Accept-Encoding header."""
+    accepted = {}
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    return body
+
+
+class EncodedBodyCache:
+    """ETag → encoded response body, LRU-bounded by total bytes."""
+
+    def __init__(self, max_bytes: int, name: str = "nodes_page"):
+        self.max_bytes = max_bytes
+        self.name = name
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, etag: str) -> Optional[bytes]:
+        body = self._entries.get(etag)
+        record_cache(self.name, body is not None)
+        if body is not None:
+            self._entries.move_to_end(etag)
+        return body
+
+    def put(self, etag: str, body: bytes) -> None:
+        if len(body) > self.max_bytes or etag in self._entries:
+            return
+        self._entries[etag] = body
+        self._bytes += len(body)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
@@ -0,0 +1,220 @@
+# backend/utils/llm_cassette.py
+"""
+Record/replay stand-in for the Groq chat models.
+
+LLM_MODE=record  → every call goes to the real model and the response
+                   (content + tool calls) is written to a cassette
+LLM_MODE=replay  → responses come from the cassettes only — no network,
+                   no API key — with optional synthetic latency
+
+Cassettes are keyed by a hash of the NORMALIZED request: message types and
+content (UUIDs masked, whitespace collapsed), AI tool calls without their
+ids, the names of the bound tools and the model name. Tool call ids and
+node UUIDs differ between runs, so they never take part in the key.
+
+One JSON file per key under LLM_CASSETTE_DIR — safe with several workers
+recording at once, and easy to diff / delete by hand.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from .metrics import record_cache
+
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
+_WS_RE   = re.compile(r"\s+")
+
+
+class CassetteMissError(LookupError):
+    """Replay mode got a request that was never recorded."""
+
+
+def _normalize_text(text: Any) -> str:
+    if not isinstance(text, str):
+        text = json.dumps(text, sort_keys=True, default=str)
+    return _WS_RE.sub(" ", _UUID_RE.sub("<uuid>", text)).strip()
+
+
+def normalize_messages(messages: Sequence[BaseMessage]) -> List[Dict[str, Any]]:
+    """Run-independent view of a prompt — what the cassette key is built from."""
+    normalized = []
+    for m in messages:
+        entry: Dict[str, Any] = {"type": m.type, "content": _normalize_text(m.content)}
+        tool_calls = getattr(m, "tool_calls", None)
+        if tool_calls:
+            entry["tool_calls"] = [
+                {"name": tc["name"], "args": _normalize_text(tc.get("args", {}))}
+                for tc in tool_calls
+            ]
+        normalized.append(entry)
+    return normalized
+
+
+class CassetteStore:
+    """Directory of recorded responses, one `<key>.json` file per request."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._cache: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def make_key(model: str, messages: Sequence[BaseMessage], tools: Optional[List[Dict]]) -> str:
+        tool_names = sorted(
+            (t.get("function") or {}).get("name", "") for t in (tools or [])
+        )
+        payload = json.dumps(
+            {"model": model, "tools": tool_names, "messages": normalize_messages(messages)},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Recorded entry {"message": BaseMessage, "elapsed_ms": float} or None."""
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+
+        file_path = os.path.join(self.path, f"{key}.json")
+        entry = None
+        if os.path.exists(file_path):
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            entry = {
+                "message":    messages_from_dict([data["response"]])[0],
+                "elapsed_ms": float(data.get("elapsed_ms", 0.0)),
+            }
+
+        with self._lock:
+            self._cache[key] = entry
+        return entry
+
+    def put(
+        self,
+        key: str,
+        model: str,
+        messages: Sequence[BaseMessage],
+        response: BaseMessage,
+        elapsed_ms: float,
+    ) -> None:
+        data = {
+            "key":        key,
+            "model":      model,
+            "recorded_at": time.time(),
+            "elapsed_ms": round(elapsed_ms, 1),
+            "request":    normalize_messages(messages),   # for humans — not read back
+            "response":   message_to_dict(response),
+        }
+        file_path = os.path.join(self.path, f"{key}.json")
+        tmp_path  = f"{file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, file_path)   # atomic — concurrent recorders never see half a file
+
+        with self._lock:
+            self._cache[key] = {"message": response, "elapsed_ms": elapsed_ms}
+
+
+class CassetteChatModel(BaseChatModel):
+    """
+    BaseChatModel that records or replays responses of a real chat model.
+
+    Works anywhere a ChatGroq does: plain `ainvoke`, prompt | llm chains and
+    `bind_tools` (bound tool schemas arrive as the `tools` kwarg).
+    """
+
+    mode: str = "replay"                 # "record" | "replay"
+    model_name: str = ""
+    store: Any = None                    # CassetteStore
+    inner: Any = None                    # real model — record mode only
+    # Replay delay: None → the latency measured while recording, else fixed ms
+    latency_ms: Optional[float] = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "mode": self.mode}
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Optional[Any] = None, **kwargs: Any):
+        formatted = [convert_to_openai_tool(t) for t in tools]
+        if tool_choice is not None:
+            kwargs["tool_choice"] = tool_choice
+        return self.bind(tools=formatted, **kwargs)
+
+    def _key(self, messages: List[BaseMessage], kwargs: Dict[str, Any]) -> str:
+        return self.store.make_key(self.model_name, messages, kwargs.get("tools"))
+
+    def _replay_entry(self, key: str, messages: List[BaseMessage]) -> Dict[str, Any]:
+        entry = self.store.get(key)
+        record_cache("llm_cassette", entry is not None)
+        if entry is None:
+            preview = _normalize_text(messages[-1].content)[:80] if messages else ""
+            raise CassetteMissError(
+                f"No cassette for request {key[:12]} (last message: '{preview}'). "
+                f"Record it first with LLM_MODE=record."
+            )
+        return entry
+
+    def _delay_seconds(self, entry: Dict[str, Any]) -> float:
+        ms = entry["elapsed_ms"] if self.latency_ms is None else self.latency_ms
+        return max(0.0, ms) / 1000.0
+
+    @staticmethod
+    def _replay_result(entry: Dict[str, Any]) -> ChatResult:
+        # Callers mutate responses (e.g. sanitize_tool_calls) — hand out a copy
+        message = entry["message"].model_copy(deep=True)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        key = self._key(messages, kwargs)
+        if self.mode == "replay":
+            entry = self._replay_entry(key, messages)
+            time.sleep(self._delay_seconds(entry))
+            return self._replay_result(entry)
+
+        t0 = time.perf_counter()
+        result = self.inner._generate(messages, stop=stop, **kwargs)
+        self.store.put(key, self.model_name, messages, result.generations[0].message,
+                       (time.perf_counter() - t0) * 1000)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        key = self._key(messages, kwargs)
+        if self.mode == "replay":
+            entry = self._replay_entry(key, messages)
+            delay = self._delay_seconds(entry)
+            if delay:
+                await asyncio.sleep(delay)
+            return self._replay_result(entry)
+
+        t0 = time.perf_counter()
+        result = await self.inner._agenerate(messages, stop=stop, **kwargs)
+        self.store.put(key, self.model_name, messages, result.generations[0].message,
+                       (time.perf_counter() - t0) * 1000)
+        return result
+
+
+# ── Shared stores (one per directory, reused by tool + fast LLM) ──
+_STORES: Dict[str, CassetteStore] = {}
+
+
+def get_cassette_store(path: str) -> CassetteStore:
+    if path not in _STORES:
+        _STORES[path] = CassetteStore(path)
+    return _STORES[path]
@@ -0,0 +1,87 @@
+# backend/utils/llm_metrics.py
+"""
+LangChain callbacks feeding the llm_* and tool_* metrics of utils/metrics.py.
+
+Kept apart from metrics.py because they subclass langchain_core's
+BaseCallbackHandler — main.py imports metrics at startup, and langchain
+should only load with the pipeline (submain / llm_provider, in warm_up).
+"""
+
+import time
+from typing import Dict, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from .metrics import LLM_CALLS, LLM_SECONDS, LLM_TOKENS, TOOL_CALLS, TOOL_SECONDS, current_stage
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Attach to a chat model: latency, outcome and token counts per call."""
+
+    # Runs in the caller's context — no executor hop, stage ContextVar visible
+    run_inline = True
+
+    def __init__(self, model: str):
+        self.model = model
+        self._started: Dict[UUID, Tuple[float, str]] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs) -> None:
+        self._started[run_id] = (time.perf_counter(), current_stage())
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs) -> None:
+        self._started[run_id] = (time.perf_counter(), current_stage())
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs) -> None:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        t0, stage = started
+        LLM_SECONDS.labels(self.model, stage).observe(time.perf_counter() - t0)
+        LLM_CALLS.labels(self.model, stage, "ok").inc()
+
+        try:
+            usage = response.generations[0][0].message.usage_metadata or {}
+        except (AttributeError, IndexError):
+            usage = {}
+        if usage:
+            LLM_TOKENS.labels(self.model, stage, "input").inc(usage.get("input_tokens", 0))
+            LLM_TOKENS.labels(self.model, stage, "output").inc(usage.get("output_tokens", 0))
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs) -> None:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        t0, stage = started
+        LLM_SECONDS.labels(self.model, stage).observe(time.perf_counter() - t0)
+        LLM_CALLS.labels(self.model, stage, "error").inc()
+
+
+class ToolMetricsCallback(BaseCallbackHandler):
+    """Attach to tools (tool.callbacks): latency and outcome per invocation."""
+
+    run_inline = True
+
+    def __init__(self):
+        self._started: Dict[UUID, Tuple[float, str, str]] = {}
+
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, **kwargs) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "unknown")
+        self._started[run_id] = (time.perf_counter(), name, current_stage())
+
+    def _finish(self, run_id: UUID, outcome: str) -> None:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        t0, name, stage = started
+        TOOL_SECONDS.labels(name, stage).observe(time.perf_counter() - t0)
+        TOOL_CALLS.labels(name, stage, outcome).inc()
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs) -> None:
+        self._finish(run_id, "ok")
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs) -> None:
+        self._finish(run_id, "error")
+
+
+TOOL_CALLBACK = ToolMetricsCallback()
@@ -0,0 +1,433 @@
+# backend/utils/metrics.py
+"""
+In-process metrics with a Prometheus text exposition (GET /metrics).
+
+Deliberately small instead of pulling in prometheus_client: counters,
+gauges and histograms with labels, one lock per metric, and a render()
+that produces text format 0.0.4. Hot path cost is a dict lookup for the
+label child plus a locked add — no allocation per observation.
+
+What is measured (all names prefixed "yzero_"):
+  stage_*        every LangGraph node          submain._timed
+  llm_*          every chat model call         LLMMetricsCallback (llm_metrics.py)
+  tool_*         every builder/config tool     ToolMetricsCallback (llm_metrics.py)
+  search_*       every node search query       NodeSearchEngine
+  builder_*      LLM iterations per build      submain._builder_node
+  cache_*        hit / miss per named cache    record_cache()
+  stream_*       time-to-first-event, total    /workflow/stream (main.py)
+  pipeline_*     session queue count / depth  pipeline_tracker
+  event_sink_*   batched durable event log    tracker/event_sink.py
+  session*       stored sessions / memory     state/session_store.py
+  checkpoint_*   SQLite checkpoint flushes    state/sqlite_checkpointer.py
+  job*           async job queue / wait / run  engines/job_queue.py
+  batch_*        /workflow/batch item outcomes main.py
+  ready, startup_*  readiness, startup phases   utils/startup.py
+  http_*         requests, latency, in-flight  MetricsMiddleware (main.py)
+
+The graph stage a call belongs to travels in a ContextVar, so LLM and
+tool metrics are labelled by stage without threading it through agents.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds — LLM calls dominate, so the buckets reach well past a minute
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List["_Metric"] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: "_Metric") -> None:
+        with self._lock:
+            if any(m.name == metric.name for m in self._metrics):
+                raise ValueError(f"Metric '{metric.name}' already registered")
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[Registry] = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def labels(self, *values: str):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _label_str(self, key: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+# ── Counter ──
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{self._label_str(k)} {_format_value(c.value)}"
+                for k, c in list(self._children.items())]
+
+
+# ── Gauge ──
+
+class _GaugeChild:
+    __slots__ = ("value", "_fn", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._fn: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Read the value from `fn` at scrape time (queue sizes, store counts)."""
+        self._fn = fn
+
+    def get(self) -> float:
+        if self._fn is not None:
+            try:
+                return float(self._fn())
+            except Exception:
+                return float("nan")
+        return self.value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._default.set_function(fn)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{self._label_str(k)} {_format_value(c.get())}"
+                for k, c in list(self._children.items())]
+
+
+# ── Histogram ──
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # last slot = +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional[Registry] = REGISTRY):
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{self._label_str(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_str(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._label_str(key)} {cumulative}")
+        return lines
+
+
+# ──────────────────────────────────────────────────────────────
+# Metrics exported by the service
+# ──────────────────────────────────────────────────────────────
+
+STAGE_SECONDS = Histogram(
+    "yzero_stage_duration_seconds", "Wall time of one LangGraph node run", ["stage"])
+STAGE_ERRORS = Counter(
+    "yzero_stage_errors_total", "LangGraph node runs that raised", ["stage"])
+
+LLM_SECONDS = Histogram(
+    "yzero_llm_call_duration_seconds", "Chat model call latency", ["model", "stage"])
+LLM_CALLS = Counter(
+    "yzero_llm_calls_total", "Chat model calls by outcome", ["model", "stage", "outcome"])
+LLM_TOKENS = Counter(
+    "yzero_llm_tokens_total", "Tokens reported by the provider", ["model", "stage", "direction"])
+
+TOOL_SECONDS = Histogram(
+    "yzero_tool_duration_seconds", "Agent tool invocation latency", ["tool", "stage"])
+TOOL_CALLS = Counter(
+    "yzero_tool_calls_total", "Agent tool invocations by outcome", ["tool", "stage", "outcome"])
+
+SEARCH_SECONDS = Histogram(
+    "yzero_search_query_duration_seconds", "Node search query latency",
+    ["operation", "backend"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+SEARCH_ERRORS = Counter(
+    "yzero_search_query_errors_total", "Elasticsearch queries that failed (served from memory)",
+    ["operation"])
+
+BUILDER_ITERATIONS = Histogram(
+    "yzero_builder_llm_iterations", "LLM calls needed per builder run", ["mode"],
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 12, 16, 20))
+BUILDER_NODES = Histogram(
+    "yzero_builder_nodes", "Nodes in the workflow after the builder stage", ["mode"],
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50))
+
+CACHE_REQUESTS = Counter(
+    "yzero_cache_requests_total", "Cache lookups by result (hit | miss)", ["cache", "result"])
+
+HTTP_SECONDS = Histogram(
+    "yzero_http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"])
+PIPELINE_QUEUES = Gauge(
+    "yzero_pipeline_queues", "Live pipeline_tracker subscriber queues")
+PIPELINE_QUEUED_EVENTS = Gauge(
+    "yzero_pipeline_queued_events", "Events waiting in all subscriber queues")
+PIPELINE_MAX_QUEUE_DEPTH = Gauge(
+    "yzero_pipeline_max_queue_depth", "Depth of the fullest subscriber queue")
+PIPELINE_EVENTS_DROPPED = Counter(
+    "yzero_pipeline_events_dropped_total", "Events dropped by full subscriber queues",
+    ["reason"])
+
+EVENT_SINK_EVENTS = Counter(
+    "yzero_event_sink_events_total", "Pipeline events by sink outcome (written | dropped | failed)",
+    ["sink", "result"])
+EVENT_SINK_BATCH_SECONDS = Histogram(
+    "yzero_event_sink_batch_duration_seconds", "Time to write one batch to the event sink", ["sink"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+EVENT_SINK_BUFFERED = Gauge(
+    "yzero_event_sink_buffered_events", "Events waiting for the next sink flush")
+
+STREAM_FIRST_EVENT_SECONDS = Histogram(
+    "yzero_stream_first_event_seconds", "/workflow/stream: time to the first pipeline event",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+STREAM_SECONDS = Histogram(
+    "yzero_stream_duration_seconds", "/workflow/stream: time until the done event")
+
+HTTP_IN_FLIGHT = Gauge(
+    "yzero_http_requests_in_flight", "HTTP requests currently being served")
+
+SESSIONS = Gauge(
+    "yzero_sessions", "Conversations held in the session store")
+SESSION_BYTES = Gauge(
+    "yzero_session_store_bytes", "Estimated memory held by stored session states")
+SESSION_EVICTIONS = Counter(
+    "yzero_session_evictions_total", "Sessions removed from the store (lru | ttl | memory)",
+    ["reason"])
+
+CHECKPOINT_ROWS = Counter(
+    "yzero_checkpoint_rows_total", "Checkpoint rows by outcome (written | failed | pruned | expired)", ["result"])
+CHECKPOINT_FLUSH_SECONDS = Histogram(
+    "yzero_checkpoint_flush_duration_seconds", "Time to write one batch of checkpoint rows",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+CHECKPOINT_PENDING_ROWS = Gauge(
+    "yzero_checkpoint_pending_rows", "Checkpoint rows waiting for the next flush")
+
+READY = Gauge(
+    "yzero_ready", "1 once catalogue, search index and LLM clients are warm (GET /ready)")
+STARTUP_PHASE_SECONDS = Gauge(
+    "yzero_startup_phase_seconds", "Duration of each startup phase (import, catalogue, init ...)",
+    ["phase"])
+
+BATCH_ITEMS = Counter(
+    "yzero_batch_items_total", "POST /workflow/batch items by outcome (ok | error)", ["status"])
+
+JOBS = Counter(
+    "yzero_jobs_total", "Async workflow jobs (submitted | done | error | cancelled)", ["status"])
+JOB_QUEUE_DEPTH = Gauge(
+    "yzero_job_queue_depth", "Jobs waiting for a worker")
+JOBS_RUNNING = Gauge(
+    "yzero_jobs_running", "Jobs currently being run by a worker")
+JOB_WAIT_SECONDS = Histogram(
+    "yzero_job_wait_seconds", "Time a job spent queued before a worker picked it up", ["priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0))
+JOB_RUN_SECONDS = Histogram(
+    "yzero_job_run_seconds", "Time from a worker starting a job to its end", ["status"])
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+# ──────────────────────────────────────────────────────────────
+# Stage context
+# ──────────────────────────────────────────────────────────────
+
+_CURRENT_STAGE: ContextVar[str] = ContextVar("yzero_metrics_stage", default="none")
+
+
+@contextmanager
+def stage_context(stage: str) -> Iterator[None]:
+    token = _CURRENT_STAGE.set(stage)
+    try:
+        yield
+    finally:
+        _CURRENT_STAGE.reset(token)
+
+
+def current_stage() -> str:
+    return _CURRENT_STAGE.get()
+
+
+# ──────────────────────────────────────────────────────────────
+# ASGI middleware
+# ──────────────────────────────────────────────────────────────
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task hop): in-flight gauge
+    and latency per route template. Unmatched paths share one label so
+    random URLs cannot blow up the series count.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_SECONDS.labels(
+                scope.get("method", ""),
+                getattr(route, "path", "unmatched"),
+                status["code"],
+            ).observe(time.perf_counter() - t0)
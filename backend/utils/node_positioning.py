@@ -0,0 +1,218 @@
+# backend/utils/node_positioning.py
+"""
+Layered canvas layout for SimpleWorkflow.to_output_dict().
+
+  1. cycles     iterative DFS from the start nodes (then any node left, in
+                workflow order); an edge back into the DFS stack closes a
+                cycle — it is a feedback edge and steps 2-4 ignore it
+  2. layers     longest-path layering over a topological order (Kahn):
+                x = START_X + layer * H_GAP
+  3. order      barycentric sweeps (down, up, ..., down) sort each layer by
+                the mean position of its neighbours to cut edge crossings;
+                ties keep branch order (IF true above false), then
+                workflow order
+  4. lanes      a node wants its parents' mean lane, shifted by its branch
+                slot among each parent's children (BRANCH_GAP lanes apart);
+                per layer the lanes are the closest ones (least squares)
+                that keep the order and BRANCH_GAP of spacing — a plain
+                chain stays on one lane:
+                y = START_Y + lane * V_GAP
+
+Each step is O(V + E), except sorting the layers in step 3, so 10k-node
+graphs lay out in a fraction of a second (benchmarks/bench_layout.py).
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+START_X = 80
+START_Y = 240
+H_GAP = 430
+V_GAP = 170
+BRANCH_GAP = 1.5  # lanes between sibling branches / nodes sharing a layer
+SWEEPS = 5       # alternating down / up passes — odd, so the last one is down
+
+
+def compute_positions(
+    node_ids: Sequence[str],
+    edges: Iterable[Tuple[str, int, str]],
+    sweeps: int = SWEEPS,
+) -> Dict[str, Tuple[int, int]]:
+    """
+    node_ids  in workflow order (duplicates collapse onto the first)
+    edges     (source id, branch, target id); unknown ids and self-loops
+              are skipped, parallel edges count once (lowest branch)
+    Returns {node id: (x, y)}.
+    """
+    index: Dict[str, int] = {}
+    for node_id in node_ids:
+        index.setdefault(node_id, len(index))
+    if not index:
+        return {}
+    n = len(index)
+
+    branch_of: List[Dict[int, int]] = [{} for _ in range(n)]
+    for src, branch, tgt in edges:
+        s, t = index.get(src), index.get(tgt)
+        if s is None or t is None or s == t:
+            continue
+        known = branch_of[s].get(t)
+        if known is None or branch < known:
+            branch_of[s][t] = branch
+    out = [list(b) if len(b) < 2 else sorted(b, key=lambda t, b=b: (b[t], t)) for b in branch_of]
+
+    dag = _break_cycles(out)
+    layer, parents = _layer(dag)
+    layers = _order(dag, layer, parents, sweeps)
+    lane = _assign_lanes(layers, parents)
+
+    return {
+        node_id: (int(START_X + layer[v] * H_GAP), int(START_Y + lane[v] * V_GAP))
+        for node_id, v in index.items()
+    }
+
+
+def _break_cycles(out: List[List[int]]) -> List[List[int]]:
+    """Children lists without feedback edges (DFS from in-degree-0 nodes first)."""
+    n = len(out)
+    indegree = [0] * n
+    for targets in out:
+        for t in targets:
+            indegree[t] += 1
+
+    NEW, OPEN, DONE = 0, 1, 2
+    state = [NEW] * n
+    dag: List[List[int]] = [[] for _ in range(n)]
+    for root in [v for v in range(n) if not indegree[v]] + list(range(n)):
+        if state[root] != NEW:
+            continue
+        state[root] = OPEN
+        stack = [(root, iter(out[root]))]
+        while stack:
+            v, targets = stack[-1]
+            for t in targets:
+                if state[t] == OPEN:
+                    continue                    # closes a cycle
+                dag[v].append(t)
+                if state[t] == NEW:
+                    state[t] = OPEN
+                    stack.append((t, iter(out[t])))
+                    break
+            else:
+                state[v] = DONE
+                stack.pop()
+    return dag
+
+
+def _layer(dag: List[List[int]]) -> Tuple[List[int], List[List[Tuple[int, float]]]]:
+    """
+    Longest-path layer of every node, and its parents as (parent, slot)
+    where slot centres the parent's children around it, BRANCH_GAP apart
+    (-0.75, +0.75 for two).
+    """
+    n = len(dag)
+    indegree = [0] * n
+    parents: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+    for v, targets in enumerate(dag):
+        centre = (len(targets) - 1) / 2
+        for rank, t in enumerate(targets):
+            indegree[t] += 1
+            parents[t].append((v, (rank - centre) * BRANCH_GAP))
+
+    layer = [0] * n
+    queue = deque(v for v in range(n) if not indegree[v])
+    while queue:
+        v = queue.popleft()
+        for t in dag[v]:
+            if layer[v] + 1 > layer[t]:
+                layer[t] = layer[v] + 1
+            indegree[t] -= 1
+            if not indegree[t]:
+                queue.append(t)
+    return layer, parents
+
+
+def _order(
+    dag: List[List[int]],
+    layer: List[int],
+    parents: List[List[Tuple[int, float]]],
+    sweeps: int,
+) -> List[List[int]]:
+    """Node order within every layer after barycentric crossing reduction."""
+    layers: List[List[int]] = [[] for _ in range(max(layer) + 1)]
+    for v in range(len(layer)):
+        layers[layer[v]].append(v)              # workflow order to start with
+
+    # single-node layers have nothing to sort (and sit at 0.5); parent lists
+    # and branch slots don't change between sweeps
+    wide = [nodes for nodes in layers if len(nodes) > 1]
+    if not wide or sweeps <= 0:
+        return layers
+    pos = [0.5] * len(layer)
+    for nodes in wide:
+        _place(nodes, pos)
+    wide_below = [nodes for nodes in wide if layer[nodes[0]]]
+    parent_ids = {v: [u for u, _ in parents[v]] for nodes in wide_below for v in nodes}
+    slot = {v: sum(s for _, s in parents[v]) / len(parents[v]) for nodes in wide_below for v in nodes}
+
+    def down() -> None:
+        for nodes in wide_below:
+            nodes.sort(key=lambda v: (sum(pos[u] for u in parent_ids[v]) / len(parent_ids[v]), slot[v], v))
+            _place(nodes, pos)
+
+    def up() -> None:
+        for nodes in reversed(wide):
+            nodes.sort(key=lambda v: (sum(pos[t] for t in dag[v]) / len(dag[v]) if dag[v] else pos[v], pos[v]))
+            _place(nodes, pos)
+
+    for sweep in range(sweeps):
+        down() if sweep % 2 == 0 else up()
+    return layers
+
+
+def _place(nodes: List[int], pos: List[float]) -> None:
+    # relative position in the layer, so layers of different widths compare
+    width = len(nodes)
+    for i, v in enumerate(nodes):
+        pos[v] = (i + 0.5) / width
+
+
+def _assign_lanes(layers: List[List[int]], parents: List[List[Tuple[int, float]]]) -> List[float]:
+    lane = [0.0] * sum(len(nodes) for nodes in layers)
+    for nodes in layers:
+        if len(nodes) == 1:                       # most layers of a workflow
+            v = nodes[0]
+            if parents[v]:
+                lane[v] = sum(lane[u] + slot for u, slot in parents[v]) / len(parents[v])
+            continue
+        wanted = [
+            sum(lane[u] + slot for u, slot in parents[v]) / len(parents[v]) if parents[v]
+            else 2.0 * i                          # start nodes: two lanes apart
+            for i, v in enumerate(nodes)
+        ]
+        for v, value in zip(nodes, _spread(wanted)):
+            lane[v] = value
+    return lane
+
+
+def _spread(wanted: List[float], gap: float = BRANCH_GAP) -> List[float]:
+    """
+    Closest lanes (least squares) to `wanted` that keep their order at least
+    `gap` apart — isotonic regression of wanted[i] - i * gap, pooling
+    adjacent violators, O(len).
+    """
+    blocks: List[List[float]] = []              # [sum, count]
+    for i, value in enumerate(wanted):
+        blocks.append([value - i * gap, 1])
+        while len(blocks) > 1 and blocks[-2][0] * blocks[-1][1] > blocks[-1][0] * blocks[-2][1]:
+            total, count = blocks.pop()
+            blocks[-1][0] += total
+            blocks[-1][1] += count
+
+    lanes, i = [], 0
+    for total, count in blocks:
+        mean = total / count
+        for _ in range(int(count)):
+            lanes.append(mean + i * gap)
+            i += 1
+    return lanes
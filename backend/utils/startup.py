@@ -0,0 +1,90 @@
+# backend/utils/startup.py
+"""
+Startup profile and readiness state (GET /ready).
+
+main.py only imports what the HTTP layer needs; the pipeline (langchain,
+langgraph, langchain_groq, elasticsearch, agents) is imported and built in
+a background warm-up task after the server is already accepting
+connections. Each step is timed here, and /ready flips once every
+component is warm:
+
+  catalog       node catalogue loaded (ES or local file)
+  llm_clients   orchestrator built — chat models, agents, compiled graph
+  search_index  ES (re)indexed and a first search query answered
+
+/health stays a pure liveness check.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .metrics import READY, STARTUP_PHASE_SECONDS
+
+COMPONENTS = ("catalog", "llm_clients", "search_index")
+
+
+class StartupProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []     # (name, ms) in order
+        self.components: Dict[str, bool] = {c: False for c in COMPONENTS}
+        self.error: Optional[str] = None
+        self.ready_after_ms: Optional[float] = None
+        self._ready = asyncio.Event()
+        READY.set_function(lambda: 1.0 if self.ready else 0.0)
+
+    @property
+    def ready(self) -> bool:
+        return self.error is None and all(self.components.values())
+
+    def record(self, name: str, ms: float) -> None:
+        self.phases.append((name, ms))
+        STARTUP_PHASE_SECONDS.labels(name).set(ms / 1000)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - t0) * 1000)
+
+    def mark(self, component: str) -> None:
+        self.components[component] = True
+        if self.ready and self.ready_after_ms is None:
+            self.ready_after_ms = (time.perf_counter() - self.started) * 1000
+            self._ready.set()
+
+    def fail(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.ready
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ready":          self.ready,
+            "components":     dict(self.components),
+            "error":          self.error,
+            "ready_after_ms": round(self.ready_after_ms, 1) if self.ready_after_ms else None,
+            "phases_ms":      {name: round(ms, 1) for name, ms in self.phases},
+        }
+
+    def report(self) -> None:
+        print("\n-->> Startup profile")
+        for name, ms in self.phases:
+            print(f"   {name:<24} {ms:8.1f} ms")
+        if self.ready:
+            print(f"   {'ready after':<24} {self.ready_after_ms:8.1f} ms (since import)\n")
+        else:
+            pending = [c for c, ok in self.components.items() if not ok]
+            print(f"   X NOT ready — {self.error or 'pending: ' + ', '.join(pending)}\n")
+
+
+STARTUP = StartupProfile()
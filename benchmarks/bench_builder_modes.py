@@ -0,0 +1,107 @@
+# benchmarks/bench_builder_modes.py
+"""
+Builder mode benchmark — agentic tool loop vs plan-then-apply.
+
+Runs only the builder stage (no greeter / discovery / configurator) for each
+prompt in both modes and reports wall time, LLM calls and the resulting graph.
+
+Usage:
+    python benchmarks/bench_builder_modes.py
+    python benchmarks/bench_builder_modes.py --repeat 3 --prompts prompts.txt
+
+Node catalogue comes from NODES_JSONL_PATH / NODES_JSON_PATH when set,
+otherwise from Elasticsearch (same as main.py).
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.state.workflow_state import create_initial_state  # noqa: E402
+from backend.utils.config import Config  # noqa: E402
+
+DEFAULT_PROMPTS = [
+    "Send a Telegram message to my team every morning at 9am",
+    "When a webhook is received, call an HTTP API and post the result to Slack",
+    "Every hour fetch data from an API, if the status is error send an email otherwise log to Slack",
+    "Manually fetch a web page, summarise it with OpenAI and send the summary on Telegram",
+]
+
+
+async def _load_catalogue():
+    if os.getenv("NODES_JSONL_PATH") or os.getenv("NODES_JSON_PATH"):
+        from backend.utils.node_normalizer import load_and_normalize_nodes
+        return load_and_normalize_nodes()
+    from backend.utils.es_loader import load_nodes_from_es
+    return await load_nodes_from_es()
+
+
+async def _run_once(orchestrator, prompt: str, mode: str) -> dict:
+    state = create_initial_state()
+    state["messages"].append({"role": "user", "content": prompt})
+    state["builder_mode"] = mode
+
+    t0 = time.perf_counter()
+    result = await orchestrator._builder_node(state)
+    elapsed = time.perf_counter() - t0
+
+    meta = result["coordination_log"][0].metadata
+    workflow = state["workflow_json"]
+    edges = sum(len(arr) for c in workflow.connections.values() for a in c.values() for arr in a)
+    return {
+        "seconds": elapsed,
+        "llm_calls": meta.get("llm_calls", 0),
+        "nodes": len(workflow.nodes),
+        "edges": edges,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--prompts", help="file with one prompt per line")
+    args = parser.parse_args()
+
+    prompts = DEFAULT_PROMPTS
+    if args.prompts:
+        with open(args.prompts, encoding="utf-8") as f:
+            prompts = [line.strip() for line in f if line.strip()]
+
+    from submain import WorkflowBuilderOrchestrator
+    node_types = await _load_catalogue()
+    if not node_types:
+        raise SystemExit("No node catalogue available (set NODES_JSONL_PATH or start Elasticsearch)")
+    orchestrator = WorkflowBuilderOrchestrator(api_key=Config.GROQ_API_KEY, node_types=node_types)
+
+    rows = []
+    for prompt in prompts:
+        for mode in ("tools", "plan"):
+            runs = [await _run_once(orchestrator, prompt, mode) for _ in range(args.repeat)]
+            rows.append((prompt, mode, runs))
+
+    print(f"\n{'mode':<6} {'sec(med)':>9} {'llm calls':>10} {'nodes':>6} {'edges':>6}  prompt")
+    print("-" * 100)
+    totals = {"tools": [], "plan": []}
+    for prompt, mode, runs in rows:
+        med = statistics.median(r["seconds"] for r in runs)
+        calls = statistics.mean(r["llm_calls"] for r in runs)
+        totals[mode].append((med, calls))
+        last = runs[-1]
+        print(f"{mode:<6} {med:>9.2f} {calls:>10.1f} {last['nodes']:>6} {last['edges']:>6}  {prompt[:60]}")
+
+    print("-" * 100)
+    for mode, vals in totals.items():
+        if vals:
+            print(
+                f"{mode:<6} total {sum(v[0] for v in vals):.2f}s | "
+                f"avg {statistics.mean(v[1] for v in vals):.1f} LLM calls per workflow"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
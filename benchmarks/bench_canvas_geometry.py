@@ -0,0 +1,97 @@
+# benchmarks/bench_canvas_geometry.py
+"""
+Canvas geometry cost of SimpleWorkflow.to_output_dict() on branchy graphs.
+
+  nodes        WorkflowNode.to_output_dict() for every node (dimensions +
+               handleBounds instantiated from the shared geometry templates)
+  edges        SimpleWorkflow._build_edges() with anchors — source / target
+               handle centers for every edge
+  output       the full to_output_dict()
+
+Graph: a chain where every 4th node is an IF (true → next, false → a leaf)
+and every 10th a SWITCH fanning out to --fanout leaves.
+
+Usage:
+    python benchmarks/bench_canvas_geometry.py [--nodes 500 2000] [--fanout 6] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.types.workflow import (  # noqa: E402
+    SimpleWorkflow, WorkflowNode, _node_geometry, register_node_types, resolve_node_role,
+)
+
+
+def build(n: int, fanout: int) -> SimpleWorkflow:
+    wf = SimpleWorkflow(name=f"{n}-node workflow")
+    prev = None
+    for i in range(n):
+        node_type = "SWITCH" if i % 10 == 9 else "IF" if i % 4 == 3 else "HTTP REQUEST"
+        wf.add_node(WorkflowNode(id=f"id-{i}", name=f"Step {i}", type=node_type, type_version=1,
+                                 position=(0, 0), role="trigger" if i == 0 else None))
+        if prev:
+            wf.connect(prev, f"Step {i}")
+        prev = f"Step {i}"
+        leaves = fanout if node_type == "SWITCH" else 1 if node_type == "IF" else 0
+        for b in range(leaves):
+            leaf = f"Step {i} leaf {b}"
+            wf.add_node(WorkflowNode(id=f"id-{i}-{b}", name=leaf, type="SLACK", type_version=1, position=(0, 0)))
+            wf.connect(prev, leaf, branch=b + 1)
+    return wf
+
+
+def median_ms(fn, runs: int) -> float:
+    fn()
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--fanout", type=int, default=6)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    register_node_types([
+        {"name": "HTTP REQUEST", "nodeType": "action"},
+        {"name": "SLACK", "nodeType": "action"},
+        {"name": "IF", "nodeType": "conditional"},
+        {"name": "SWITCH", "nodeType": "conditional"},
+    ])
+    print(f"{'nodes':>6}{'edges':>7}{'nodes ms':>10}{'edges ms':>10}{'output ms':>11}")
+    for n in args.nodes:
+        wf = build(n, args.fanout)
+        start_ids = wf._find_start_node_ids()
+        handles = wf._collect_source_handles()
+        positions = wf._compute_canvas_positions()
+
+        def node_outputs() -> list:
+            return [node.to_output_dict(source_handles=handles.get(node.name),
+                                        position_override=positions.get(node.id),
+                                        is_start_node=node.id in start_ids) for node in wf.nodes]
+
+        anchors = {}
+        for node, output in zip(wf.nodes, node_outputs()):
+            role = resolve_node_role(node, node.id in start_ids)
+            anchors[node.id] = (output["position"]["x"], output["position"]["y"],
+                                _node_geometry(node.type, role, handles.get(node.name)))
+
+        nodes_ms = median_ms(node_outputs, args.runs)
+        edges_ms = median_ms(lambda: wf._build_edges(anchors), args.runs)
+        output_ms = median_ms(wf.to_output_dict, args.runs)
+        print(f"{len(wf.nodes):>6}{wf.connection_count:>7}{nodes_ms:>10.2f}{edges_ms:>10.2f}{output_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# benchmarks/bench_checkpoint.py
+"""
+Per-turn overhead of the SQLite checkpointer and size/speed of the compact serde.
+
+A stub graph over WorkflowState writes the same channels a real turn does
+(greeter → discovery → builder → configurator → responder, no LLM), so the
+numbers are pure checkpointing cost:
+
+  none          graph compiled without a checkpointer (old behaviour)
+  sqlite/exit   one checkpoint per turn (CHECKPOINT_DURABILITY=exit, default)
+  sqlite/async  one checkpoint per graph step
+
+Turns time the request path only (aput queues rows; the flusher writes
+them). Flush time is reported separately from yzero_checkpoint_flush_*.
+
+Usage:
+    python benchmarks/bench_checkpoint.py [--sessions 50] [--turns 5] [--nodes 12]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer  # noqa: E402
+from langgraph.graph import END, StateGraph  # noqa: E402
+
+from backend.state.serde import WorkflowStateSerializer  # noqa: E402
+from backend.state.sqlite_checkpointer import SQLiteCheckpointSaver  # noqa: E402
+from backend.state.workflow_state import WorkflowState, create_initial_state  # noqa: E402
+from backend.types.categorization import PromptCategorization, WorkflowTechnique  # noqa: E402
+from backend.types.coordination import CoordinationLogEntry  # noqa: E402
+from backend.types.workflow import SimpleWorkflow, WorkflowNode  # noqa: E402
+from backend.utils import metrics  # noqa: E402
+
+
+def _log(phase: str) -> CoordinationLogEntry:
+    return CoordinationLogEntry(phase=phase, status="completed", timestamp=time.time(),
+                                summary=f"{phase} done", metadata={"llm_calls": 2})
+
+
+def _grow(workflow: SimpleWorkflow, count: int) -> None:
+    """What the builder tools do: add nodes and chain them, in place."""
+    start = len(workflow.nodes)
+    for i in range(start, start + count):
+        workflow.add_node(WorkflowNode(
+            id=f"n{i}", name=f"Node {i}", type="HTTP REQUEST", type_version=1,
+            position=(80 + 430 * i, 240), parameters={"url": f"https://api.example.com/{i}", "method": "GET"},
+            role="trigger" if i == 0 else "action",
+        ))
+        if i:
+            workflow.connect(f"Node {i - 1}", f"Node {i}")
+
+
+def build_graph(nodes_per_turn: int, checkpointer=None):
+    async def greeter(state):
+        return {"greeter_proceed": True, "greeter_intent": "WORKFLOW_REQUEST"}
+
+    async def discovery(state):
+        return {
+            "categorization": PromptCategorization(
+                techniques=[WorkflowTechnique.SCHEDULING, WorkflowTechnique.NOTIFICATION],
+                confidence=0.9, reasoning="stub"),
+            "best_practices": "Use a schedule trigger. " * 40,
+            "coordination_log": [_log("discovery")],
+        }
+
+    async def builder(state):
+        _grow(state["workflow_json"], nodes_per_turn)
+        return {"coordination_log": [_log("builder")]}
+
+    async def configurator(state):
+        for node in state["workflow_json"].nodes:
+            node.parameters["timeout"] = 30
+        return {"coordination_log": [_log("configurator")]}
+
+    async def responder(state):
+        return {"messages": [{"role": "assistant", "content": "Workflow built. " * 20}]}
+
+    graph = StateGraph(WorkflowState)
+    for name, fn in [("greeter", greeter), ("discovery", discovery), ("builder", builder),
+                     ("configurator", configurator), ("responder", responder)]:
+        graph.add_node(name, fn)
+    graph.set_entry_point("greeter")
+    graph.add_edge("greeter", "discovery")
+    graph.add_edge("discovery", "builder")
+    graph.add_edge("builder", "configurator")
+    graph.add_edge("configurator", "responder")
+    graph.add_edge("responder", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+async def run_turns(graph, sessions: int, turns: int, durability):
+    states = {f"s{i}": create_initial_state() for i in range(sessions)}
+    samples = []
+    for _ in range(turns):
+        for sid, state in states.items():
+            state["messages"].append({"role": "user", "content": "add more nodes"})
+            t0 = time.perf_counter()
+            if durability:
+                result = await graph.ainvoke(state, config={"configurable": {"thread_id": sid}},
+                                             durability=durability)
+            else:
+                result = await graph.ainvoke(state)
+            samples.append((time.perf_counter() - t0) * 1000)
+            states[sid] = dict(result)
+    return samples
+
+
+def _flush_stats():
+    child = metrics.CHECKPOINT_FLUSH_SECONDS.labels()
+    return sum(child.counts), child.sum
+
+
+def report(label, samples, base_mean=None):
+    samples = sorted(samples)
+    mean = statistics.mean(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    extra = f"  (+{mean - base_mean:.2f} ms/turn)" if base_mean is not None else ""
+    print(f"{label:<14} mean {mean:7.2f} ms   p50 {samples[len(samples) // 2]:7.2f}   p99 {p99:7.2f}{extra}")
+    return mean
+
+
+def bench_serde(nodes: int, iterations: int = 2000) -> None:
+    workflow = SimpleWorkflow(name="bench")
+    _grow(workflow, nodes)
+    log = [_log(p) for p in ("discovery", "builder", "configurator")] * 3
+    cat = PromptCategorization(techniques=[WorkflowTechnique.SCHEDULING], confidence=0.9, reasoning="x")
+
+    logging.getLogger("langgraph").setLevel(logging.ERROR)   # jsonplus "unregistered type" warnings
+    print(f"\nSerializer ({nodes}-node workflow, {len(log)} log entries)")
+    # SimpleWorkflow isn't a dataclass any more — plain jsonplus gets the fields
+    # its dataclass encoding used to carry (nodes / connections are still dataclasses)
+    fields = {"name": workflow.name, "nodes": workflow.nodes,
+              "connections": {src: dict(conn_types) for src, conn_types in workflow.connections.items()}}
+    for label, serde, wf_value in [("jsonplus", JsonPlusSerializer(), fields),
+                                   ("compact", WorkflowStateSerializer(), workflow)]:
+        sizes, t_dump, t_load = [], 0.0, 0.0
+        for value in (wf_value, cat, log):
+            blob = serde.dumps_typed(value)
+            sizes.append(len(blob[1]))
+            t0 = time.perf_counter()
+            for _ in range(iterations):
+                serde.dumps_typed(value)
+            t_dump += time.perf_counter() - t0
+            t0 = time.perf_counter()
+            for _ in range(iterations):
+                serde.loads_typed(blob)
+            t_load += time.perf_counter() - t0
+        print(f"  {label:<9} workflow {sizes[0]:>6} B  categorization {sizes[1]:>4} B  log {sizes[2]:>5} B"
+              f"   dumps {t_dump / iterations * 1e6:6.1f} µs  loads {t_load / iterations * 1e6:6.1f} µs")
+
+
+async def main_async(args) -> None:
+    print(f"{args.sessions} sessions × {args.turns} turns, {args.nodes} nodes added per turn\n")
+    base = report("none", await run_turns(build_graph(args.nodes), args.sessions, args.turns, None))
+
+    for durability in ("exit", "async"):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "checkpoints.sqlite")
+            saver = SQLiteCheckpointSaver(path)
+            count0, sum0 = _flush_stats()
+            samples = await run_turns(build_graph(args.nodes, saver), args.sessions, args.turns, durability)
+            await saver.close()
+            count, total = _flush_stats()
+            report(f"sqlite/{durability}", samples, base)
+            flushes = count - count0
+            size_kb = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)) / 1024
+            print(f"{'':<14} {flushes} flushes, {(total - sum0) * 1000 / max(flushes, 1):.2f} ms each "
+                  f"(off the request path), db {size_kb:.0f} KB")
+
+    bench_serde(args.nodes * args.turns)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--nodes", type=int, default=12, help="nodes added per turn")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
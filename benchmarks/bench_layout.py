@@ -0,0 +1,138 @@
+# benchmarks/bench_layout.py
+"""
+Canvas layout (backend/utils/node_positioning.py) on large graphs.
+
+  layout       compute_positions() on node ids + (source, branch, target)
+               edges
+  workflow     SimpleWorkflow._compute_canvas_positions() end to end
+               (edge collection from the connection table + layout)
+  crossings    edge crossings between adjacent layers with the initial
+               workflow order (--sweeps 0) and after barycentric sweeps
+
+Graphs (N nodes each):
+  chain        the builder's usual shape — a chain with an IF every 10th
+               node whose false branch is a leaf
+  switch       a SWITCH every 5th node fanning out to 4 branches that
+               merge back into the next chain node
+  dag          random DAG, 3 edges per node to one of the next 50 nodes
+               (many merge points — exponential for the old BFS layout)
+  cyclic       the dag plus a back edge from every 10th node
+
+Usage:
+    python benchmarks/bench_layout.py [--nodes 1000 10000] [--runs 3]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from bisect import bisect_right
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.types.workflow import SimpleWorkflow, WorkflowNode  # noqa: E402
+from backend.utils.node_positioning import H_GAP, compute_positions  # noqa: E402
+
+
+def chain(n: int) -> list:
+    edges, prev, i = [], 0, 1
+    while i < n:
+        edges.append((prev, 0, i))
+        if i % 10 == 5 and i + 2 < n:
+            edges.append((i, 1, i + 1))         # false → leaf
+            edges.append((i, 0, i + 2))         # true → the chain goes on
+            prev, i = i + 2, i + 3
+        else:
+            prev, i = i, i + 1
+    return edges
+
+
+def switch(n: int) -> list:
+    edges, i = [], 0
+    while i + 5 < n:
+        for b in range(4):
+            edges.append((i, b, i + 1 + b))
+            edges.append((i + 1 + b, 0, i + 5))
+        i += 5
+    return edges
+
+
+def dag(n: int, seed: int = 7) -> list:
+    rnd = random.Random(seed)
+    return [(i, 0, j) for i in range(n - 1)
+            for j in rnd.sample(range(i + 1, min(n, i + 51)), min(3, n - 1 - i))]
+
+
+def cyclic(n: int) -> list:
+    return dag(n) + [(i, 0, max(0, i - 7)) for i in range(10, n, 10)]
+
+
+GRAPHS = {"chain": chain, "switch": switch, "dag": dag, "cyclic": cyclic}
+
+
+def crossings(positions: dict, edges: list) -> int:
+    """Crossings among edges spanning exactly one layer (same x gap)."""
+    by_layer = {}
+    for s, _, t in edges:
+        (sx, sy), (tx, ty) = positions[s], positions[t]
+        if tx - sx == H_GAP:
+            by_layer.setdefault(sx, []).append((sy, ty))
+    total = 0
+    for pairs in by_layer.values():
+        pairs.sort()
+        seen = []                       # sorted target ys so far
+        for sy, ty in pairs:
+            # earlier edges (smaller / equal source y) ending strictly below this one
+            total += len(seen) - bisect_right(seen, ty)
+            seen.insert(bisect_right(seen, ty), ty)
+    return total
+
+
+def workflow(n: int, edges: list) -> SimpleWorkflow:
+    wf = SimpleWorkflow(name=f"{n}-node workflow")
+    for i in range(n):
+        wf.add_node(WorkflowNode(id=f"id-{i}", name=f"Step {i}", type="HTTP REQUEST",
+                                 type_version=1, position=(0, 0)))
+    for s, b, t in edges:
+        wf.connect(f"Step {s}", f"Step {t}", branch=b)
+    return wf
+
+
+def median_ms(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'graph':>7}{'nodes':>7}{'edges':>7}{'layers':>8}{'layout ms':>11}{'workflow ms':>13}"
+          f"{'crossings':>11}{'unswept':>9}")
+    for n in args.nodes:
+        for name, make in GRAPHS.items():
+            edges = make(n)
+            ids = [str(i) for i in range(n)]
+            str_edges = [(str(s), b, str(t)) for s, b, t in edges]
+            layout_ms = median_ms(lambda: compute_positions(ids, str_edges), args.runs)
+
+            wf = workflow(n, edges)
+            workflow_ms = median_ms(wf._compute_canvas_positions, args.runs)
+
+            swept = compute_positions(ids, str_edges)
+            unswept = compute_positions(ids, str_edges, sweeps=0)
+            layers = len({x for x, _ in swept.values()})
+            print(f"{name:>7}{n:>7}{len(edges):>7}{layers:>8}{layout_ms:>11.1f}{workflow_ms:>13.1f}"
+                  f"{crossings(swept, str_edges):>11}{crossings(unswept, str_edges):>9}")
+
+
+if __name__ == "__main__":
+    main()
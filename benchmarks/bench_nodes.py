@@ -0,0 +1,86 @@
+# benchmarks/bench_nodes.py
+"""
+GET /nodes: bytes and time to download the whole catalogue, full nodes vs
+the default projection (no properties), identity vs gzip, and a cache
+revalidation round (every page answered with 304).
+
+Runs main.app in-process over ASGI on a synthetic local node file (ES
+pointed at a closed port, LLM_MODE=replay — nothing external is called).
+
+Usage:
+    python benchmarks/bench_nodes.py [--nodes 3000] [--params 12] [--limit 500]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from bench_prefork import write_catalog  # noqa: E402
+
+
+async def crawl(client: httpx.AsyncClient, limit: int, fields, encoding: str, known=None):
+    """
+    Walk every page. Returns (wire bytes, ms, {cursor: (etag, next cursor)},
+    304 count); pass `known` from an earlier crawl to revalidate.
+    """
+    cursor, wire, not_modified, pages = None, 0, 0, {}
+    t0 = time.perf_counter()
+    while True:
+        params = {"limit": limit, **({"fields": fields} if fields else {}), **({"cursor": cursor} if cursor else {})}
+        headers = {"Accept-Encoding": encoding}
+        if known and cursor in known:
+            headers["If-None-Match"] = known[cursor][0]
+        r = await client.get("/nodes", params=params, headers=headers)
+        wire += r.num_bytes_downloaded
+        if r.status_code == 304:
+            not_modified += 1
+            nxt = known[cursor][1]
+        else:
+            nxt = r.json()["next_cursor"]
+        pages[cursor] = (r.headers["etag"], nxt)
+        if not nxt:
+            break
+        cursor = nxt
+    return wire, (time.perf_counter() - t0) * 1000, pages, not_modified
+
+
+async def run(args) -> None:
+    import main
+
+    async with main.app.router.lifespan_context(main.app):
+        await main.STARTUP.wait(120)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench") as client:
+            print(f"{'variant':<34}{'pages':>6}{'KB on wire':>12}{'cold ms':>9}{'warm ms':>9}")
+            for fields, label in (("*", "full nodes"), (None, "default projection")):
+                for encoding in ("identity", "gzip"):
+                    wire, cold, pages, _ = await crawl(client, args.limit, fields, encoding)
+                    _, warm, _, _ = await crawl(client, args.limit, fields, encoding)
+                    print(f"{label + ', ' + encoding:<34}{len(pages):>6}{wire / 1024:>12.1f}{cold:>9.1f}{warm:>9.1f}")
+            wire, ms, _, n304 = await crawl(client, args.limit, None, "gzip", pages)
+            print(f"{'revalidate (If-None-Match)':<34}{n304:>6}{wire / 1024:>12.1f}{ms:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=3000)
+    parser.add_argument("--params", type=int, default=12)
+    parser.add_argument("--limit", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = os.path.join(tmp, "nodes.jsonl")
+        write_catalog(catalog, args.nodes, args.params)
+        os.environ.update(NODES_JSONL_PATH=catalog, ELASTICSEARCH_URL="http://127.0.0.1:1",
+                          LLM_MODE="replay", CHECKPOINT_DB="", EVENT_SINK="", STARTUP_BACKGROUND="false")
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_output_templates.py
+"""
+Per-node cost of SimpleWorkflow.to_output_dict() against a realistic
+catalogue — default parameters, operation, role, icon and description
+looked up per node type.
+
+  register     register_node_types() for the whole catalogue (where the
+               per-type output templates are compiled)
+  nodes        WorkflowNode.to_output_dict() for every node
+  workflow     the full SimpleWorkflow.to_output_dict()
+
+Catalogue: --types node types, each with --fields fields spread over
+actions / triggers / properties (an 'operation' field last, like most
+integrations list it).
+
+Usage:
+    python benchmarks/bench_output_templates.py [--types 2000] [--fields 40] [--nodes 100 500] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.types.workflow import SimpleWorkflow, WorkflowNode, register_node_types  # noqa: E402
+
+
+def catalogue(types: int, fields: int) -> list:
+    def field_list(prefix: str, count: int) -> list:
+        return [{"name": f"{prefix}_{j}", "type": "authentication" if j == 0 else "string",
+                 "default": "" if j % 3 == 0 else f"value {j}"} for j in range(count)]
+    return [
+        {"id": i, "name": f"SERVICE_{i}", "icon": f"service_{i}.svg", "description": f"Service {i}",
+         "nodeType": "trigger" if i % 10 == 0 else "action",
+         "triggers": field_list("trigger", fields // 4) if i % 10 == 0 else [],
+         "actions": field_list("param", fields // 2),
+         "properties": field_list("prop", fields // 4) + [{"name": "operation", "default": "create"}]}
+        for i in range(types)
+    ]
+
+
+def workflow(nodes: int, types: int) -> SimpleWorkflow:
+    wf = SimpleWorkflow(name=f"{nodes}-node workflow")
+    for i in range(nodes):
+        wf.add_node(WorkflowNode(id=str(i), name=f"Step {i}", type=f"SERVICE_{(i * 7) % types}",
+                                 type_version=1, position=(0, 0), parameters={"param_1": f"step {i}"}))
+        if i:
+            wf.connect(f"Step {i - 1}", f"Step {i}")
+    return wf
+
+
+def median_ms(fn, runs: int) -> float:
+    fn()
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--types", type=int, default=2000)
+    parser.add_argument("--fields", type=int, default=40)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    node_types = catalogue(args.types, args.fields)
+    t0 = time.perf_counter()
+    register_node_types(node_types)
+    print(f"register {args.types} types × {args.fields} fields: {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    print(f"{'nodes':>6}{'nodes ms':>11}{'µs/node':>9}{'workflow ms':>13}")
+    for n in args.nodes:
+        wf = workflow(n, args.types)
+        nodes_ms = median_ms(lambda: [node.to_output_dict() for node in wf.nodes], args.runs)
+        workflow_ms = median_ms(wf.to_output_dict, args.runs)
+        print(f"{n:>6}{nodes_ms:>11.2f}{nodes_ms * 1000 / n:>9.1f}{workflow_ms:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_prefork.py
+"""
+Memory of N workers with a shared catalogue (prefork.py) vs one catalogue per
+worker (prefork.py --no-share, same as `uvicorn --workers N`).
+
+A synthetic JSONL catalogue of --nodes integrations (each with --params
+action parameters) is written to a temp file and served from the local
+node file (ES pointed at a closed port, LLM_MODE=replay — nothing is
+called). Both launches print per-process RSS / PSS / USS from
+/proc/<pid>/smaps_rollup; the sum of PSS is the real footprint.
+
+Usage:
+    python benchmarks/bench_prefork.py [--workers 4] [--nodes 3000] [--params 12]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_catalog(path: str, nodes: int, params: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(nodes):
+            f.write(json.dumps({
+                "id": i,
+                "type": f"SERVICE {i}",
+                "name": f"Service {i}",
+                "description": f"Integration with service {i}: create, update, delete and list records. " * 3,
+                "category_id": i % 40,
+                "category_name": f"Category {i % 40}",
+                "actions": [
+                    {
+                        "name": f"param_{j}",
+                        "displayName": f"Parameter {j}",
+                        "type": "options" if j % 3 == 0 else "string",
+                        "default": "",
+                        "description": f"Value for parameter {j} of service {i}. " * 2,
+                        "options": [{"name": f"Option {k}", "value": f"opt_{k}"} for k in range(5)] if j % 3 == 0 else [],
+                    }
+                    for j in range(params)
+                ],
+            }) + "\n")
+
+
+def launch(args, catalog: str, port: int, share: bool) -> float:
+    env = dict(os.environ,
+               NODES_JSONL_PATH=catalog, ELASTICSEARCH_URL="http://127.0.0.1:1",
+               LLM_MODE="replay", CHECKPOINT_DB="", EVENT_SINK="", PYTHONUNBUFFERED="1")
+    cmd = [sys.executable, os.path.join(ROOT, "prefork.py"), "--workers", str(args.workers),
+           "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+           "--report", str(args.settle)]
+    if not share:
+        cmd.append("--no-share")
+
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, text=True)
+    table, total_pss = [], None
+    deadline = time.monotonic() + args.settle + 120
+    try:
+        for line in proc.stdout:
+            if re.match(r"^(process|parent|worker|TOTAL)", line):
+                table.append(line.rstrip())
+            m = re.search(r"sum of PSS\): ([\d.]+) MB", line)
+            if m:
+                total_pss = float(m.group(1))
+                break
+            if time.monotonic() > deadline:
+                break
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    print(f"\n{'shared catalogue (prefork)' if share else 'catalogue per worker (--no-share)'}")
+    print("\n".join(table))
+    if total_pss is None:
+        raise SystemExit("prefork.py did not print a memory report")
+    return total_pss
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--nodes", type=int, default=3000)
+    parser.add_argument("--params", type=int, default=12, help="action parameters per node")
+    parser.add_argument("--settle", type=float, default=15, help="seconds before measuring")
+    parser.add_argument("--port", type=int, default=8791)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = os.path.join(tmp, "nodes.jsonl")
+        write_catalog(catalog, args.nodes, args.params)
+        size_mb = os.path.getsize(catalog) / 1024 / 1024
+        print(f"{args.nodes} nodes × {args.params} params ({size_mb:.1f} MB JSONL), {args.workers} workers")
+
+        per_worker = launch(args, catalog, args.port, share=False)
+        shared = launch(args, catalog, args.port + 1, share=True)
+
+    saved = per_worker - shared
+    print(f"\nTotal PSS: {per_worker:.1f} MB per-worker catalogue → {shared:.1f} MB shared "
+          f"({-saved:+.1f} MB, {-saved / per_worker * 100:+.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_request_setup.py
+"""
+Per-request builder/configurator setup cost — before vs after binding tools once.
+
+before: every request called the tool factories (LangChain @tool → Pydantic
+        args schema) and constructed BuilderAgent / ConfiguratorAgent, which
+        runs llm.bind_tools (schema → OpenAI tool JSON).
+after:  tools and agents are built once at orchestrator init; a request only
+        enters workflow_context(workflow).
+
+Runs offline — ChatGroq is constructed with a dummy key and never called.
+
+Usage:
+    python benchmarks/bench_request_setup.py [--iterations 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ELASTICSEARCH_URL", "http://127.0.0.1:1")   # in-memory search
+
+from langchain_groq import ChatGroq  # noqa: E402
+
+from backend.agents.builder import BuilderAgent  # noqa: E402
+from backend.agents.configurator import ConfiguratorAgent  # noqa: E402
+from backend.engines.node_search_engine import NodeSearchEngine  # noqa: E402
+from backend.tools.add_node import create_add_node_tool  # noqa: E402
+from backend.tools.connect_nodes import create_connect_nodes_tool  # noqa: E402
+from backend.tools.context import workflow_context  # noqa: E402
+from backend.tools.search_nodes import create_search_nodes_tool  # noqa: E402
+from backend.tools.update_parameters import create_update_parameters_tool  # noqa: E402
+from backend.tools.validate_workflow import create_validate_workflow_tool  # noqa: E402
+from backend.types.workflow import SimpleWorkflow  # noqa: E402
+
+CATALOGUE = [
+    {"name": "MANUAL", "displayName": "Manual", "nodeType": "trigger", "description": "Manual trigger"},
+    {"name": "HTTP REQUEST", "displayName": "HTTP Request", "nodeType": "action", "description": "Call an API"},
+    {"name": "IF", "displayName": "If", "nodeType": "conditional", "description": "Branch"},
+]
+
+
+def per_request_setup(llm, search_engine):
+    """What _builder_node + _configurator_node did on every request before."""
+    connect_by_name, connect_by_id = create_connect_nodes_tool()
+    validate_tool = create_validate_workflow_tool()
+    builder_tools = [
+        create_search_nodes_tool(search_engine),
+        create_add_node_tool(search_engine),
+        connect_by_name,
+        connect_by_id,
+        validate_tool,
+    ]
+    configurator_tools = [create_update_parameters_tool(), validate_tool]
+    BuilderAgent(llm, builder_tools, search_engine)
+    ConfiguratorAgent(llm, configurator_tools)
+
+
+def bench(label, fn, iterations):
+    fn()  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    per_call_us = (time.perf_counter() - t0) / iterations * 1e6
+    print(f"{label:<8} {per_call_us:>10.1f} µs / request")
+    return per_call_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    llm = ChatGroq(model="llama-3.3-70b-versatile", groq_api_key="bench-not-used")
+    search_engine = NodeSearchEngine(CATALOGUE)
+
+    def after():
+        with workflow_context(SimpleWorkflow(name="bench")):
+            pass
+
+    print()
+    before_us = bench("before", lambda: per_request_setup(llm, search_engine), max(1, args.iterations // 10))
+    after_us = bench("after", after, args.iterations)
+    print(f"speed-up  {before_us / after_us:>10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# benchmarks/bench_response.py
+"""
+Response serialization cost for /workflow: FastAPI's default path
+(response_model validation → jsonable dump → json.dumps) vs the trusted
+orjson path in backend/utils/fast_json.py.
+
+  encode       the WorkflowResponse dict → bytes, in-process
+  endpoint     two throwaway routes on a FastAPI app returning the same
+               payload, driven through the ASGI interface (no network)
+
+The payload is a real SimpleWorkflow.to_output_dict() of N chained nodes
+over a small synthetic catalogue.
+
+Usage:
+    python benchmarks/bench_response.py [--nodes 50 100 200] [--iterations 300]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from backend.types.workflow import (  # noqa: E402
+    SimpleWorkflow, WorkflowNode, register_node_types,
+)
+from backend.utils.fast_json import dumps, trusted_response  # noqa: E402
+from main import WorkflowResponse  # noqa: E402
+
+TYPES = 20
+
+
+def build_payload(nodes: int) -> dict:
+    register_node_types([
+        {"id": i, "name": f"SERVICE_{i}", "icon": f"service_{i}.svg", "description": f"Service {i}",
+         "actions": [{"name": f"param_{j}", "type": "string", "default": f"value {j}"} for j in range(8)]}
+        for i in range(TYPES)
+    ])
+    wf = SimpleWorkflow(name=f"{nodes}-node workflow")
+    for i in range(nodes):
+        wf.add_node(WorkflowNode(id=str(i), name=f"Step {i}", type=f"SERVICE_{i % TYPES}",
+                                 type_version=1, position=(0, 0),
+                                 parameters={"resource": "record", "note": f"step {i} ✓"}))
+        if i:
+            wf.connect(f"Step {i - 1}", f"Step {i}")
+    out = wf.to_output_dict()
+    return {**out, "response": "-->> Workflow built successfully", "session_id": "bench"}
+
+
+def default_encode(payload: dict) -> bytes:
+    """What FastAPI does for a dict returned from a response_model route."""
+    content = WorkflowResponse.model_validate(payload).model_dump(mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def trusted_encode(payload: dict) -> bytes:
+    return trusted_response(payload, WorkflowResponse).body
+
+
+def time_per_call(fn, payload, iterations: int) -> float:
+    fn(payload)
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn(payload)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+async def time_endpoint(payload: dict, iterations: int) -> dict:
+    app = FastAPI()
+
+    @app.get("/default", response_model=WorkflowResponse)
+    async def default_route():
+        return payload
+
+    @app.get("/trusted", response_model=WorkflowResponse)
+    async def trusted_route():
+        return trusted_response(payload, WorkflowResponse)
+
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for path in ("/default", "/trusted"):
+            r = await client.get(path)
+            assert r.status_code == 200 and r.json()["nodes"] == payload["nodes"], path
+            samples = []
+            for _ in range(iterations):
+                t0 = time.perf_counter()
+                await client.get(path)
+                samples.append((time.perf_counter() - t0) * 1000)
+            results[path] = statistics.median(samples)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>6}{'KB':>8}{'default ms':>12}{'orjson ms':>11}{'speedup':>9}"
+          f"{'GET default':>13}{'GET trusted':>13}{'speedup':>9}")
+    for n in args.nodes:
+        payload = build_payload(n)
+        size_kb = len(dumps(payload)) / 1024
+        assert json.loads(default_encode(payload)) == json.loads(trusted_encode(payload))
+
+        default_ms = time_per_call(default_encode, payload, args.iterations)
+        trusted_ms = time_per_call(trusted_encode, payload, args.iterations)
+        ep = asyncio.run(time_endpoint(payload, args.iterations))
+        print(f"{n:>6}{size_kb:>8.0f}{default_ms:>12.2f}{trusted_ms:>11.2f}{default_ms / trusted_ms:>8.1f}x"
+              f"{ep['/default']:>13.2f}{ep['/trusted']:>13.2f}{ep['/default'] / ep['/trusted']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
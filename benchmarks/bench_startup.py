@@ -0,0 +1,114 @@
+# benchmarks/bench_startup.py
+"""
+Startup profile: import time of main.py, and time until the server answers
+/health and /ready, with background warm-up (default) vs the old blocking
+startup (STARTUP_BACKGROUND=false).
+
+  imports      `python -X importtime -c "import main"` — slowest modules by
+               cumulative time, and which heavy packages main pulls in
+  startup      spawns `uvicorn main:app`, polls /health and /ready, then
+               prints the per-phase timings from the /ready body
+
+Runs on a synthetic local node file (ES pointed at a closed port) with
+LLM_MODE=replay, so nothing external is called.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 3] [--top 12] [--nodes 1000]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from bench_prefork import write_catalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG = ""
+HEAVY = ("langchain_core", "langgraph", "langchain_groq", "elasticsearch", "submain")
+
+
+def _env(**extra) -> dict:
+    env = dict(os.environ, NODES_JSONL_PATH=CATALOG, ELASTICSEARCH_URL="http://127.0.0.1:1",
+               LLM_MODE="replay", CHECKPOINT_DB="", EVENT_SINK="")
+    env.update(extra)
+    return env
+
+
+def import_profile(top: int) -> None:
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                         cwd=ROOT, env=_env(), capture_output=True, text=True).stderr
+    rows = []
+    for line in out.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if m:
+            rows.append((int(m.group(2)), len(m.group(3)) // 2, m.group(4)))
+    total = next((us for us, _, name in rows if name == "main"), 0)
+    print(f"import main: {total / 1000:.0f} ms")
+    for us, depth, name in sorted(rows, reverse=True)[1:top + 1]:
+        print(f"   {us / 1000:8.1f} ms  {'  ' * min(depth, 4)}{name}")
+    loaded = {name for _, _, name in rows}
+    print(f"   heavy packages imported by main: {[h for h in HEAVY if h in loaded] or 'none'}")
+
+
+def time_startup(port: int, background: bool) -> dict:
+    cmd = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"]
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=_env(STARTUP_BACKGROUND=str(background).lower()),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    result = {"health_ms": None, "ready_ms": None, "phases_ms": {}}
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=2.0) as client:
+            while time.perf_counter() - t0 < 120:
+                try:
+                    if result["health_ms"] is None and client.get("/health").status_code == 200:
+                        result["health_ms"] = (time.perf_counter() - t0) * 1000
+                    r = client.get("/ready")
+                    if r.status_code == 200:
+                        result["ready_ms"] = (time.perf_counter() - t0) * 1000
+                        result["phases_ms"] = r.json()["phases_ms"]
+                        break
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.1)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--port", type=int, default=8793)
+    parser.add_argument("--nodes", type=int, default=1000)
+    args = parser.parse_args()
+
+    global CATALOG
+    tmp = tempfile.TemporaryDirectory()
+    CATALOG = os.path.join(tmp.name, "nodes.jsonl")
+    write_catalog(CATALOG, args.nodes, 12)
+
+    import_profile(args.top)
+
+    for background in (False, True):
+        runs = [time_startup(args.port, background) for _ in range(args.runs)]
+        health = statistics.median(r["health_ms"] for r in runs)
+        ready = statistics.median(r["ready_ms"] for r in runs)
+        label = "background warm-up" if background else "blocking startup"
+        print(f"\n{label} (median of {args.runs}, from process spawn)")
+        print(f"   /health 200 after {health:7.0f} ms")
+        print(f"   /ready  200 after {ready:7.0f} ms")
+        for name, ms in runs[-1]["phases_ms"].items():
+            print(f"      {name:<22} {ms:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
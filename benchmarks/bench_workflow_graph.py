@@ -0,0 +1,103 @@
+# benchmarks/bench_workflow_graph.py
+"""
+SimpleWorkflow graph operations on large workflows — what the builder /
+modifier tools and the response path do, timed per phase:
+
+  build        add_node + connect_nodes_by_name for every node (each connect
+               looks both nodes up by name)
+  lookups      get_node_by_name + get_node_by_id for every node
+  validate     validate_workflow tool (trigger + connectivity check)
+  output       to_output_dict() — start nodes, source handles, edges, layout
+  remove       remove_node tool on 5% of the nodes (bridging their edges)
+
+Graph: a chain with an IF every 10th node whose false branch is a leaf
+action. Tools run exactly as in a request (inside workflow_context).
+
+Usage:
+    python benchmarks/bench_workflow_graph.py [--nodes 250 500 1000 2000] [--runs 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.tools.connect_nodes import create_connect_nodes_tool  # noqa: E402
+from backend.tools.context import workflow_context  # noqa: E402
+from backend.tools.remove_node import create_remove_node_tool  # noqa: E402
+from backend.tools.validate_workflow import create_validate_workflow_tool  # noqa: E402
+from backend.types.workflow import SimpleWorkflow, WorkflowNode, register_node_types  # noqa: E402
+
+PHASES = ("build", "lookups", "validate", "output", "remove")
+
+
+def run_once(n: int) -> dict:
+    connect, _ = create_connect_nodes_tool()
+    validate = create_validate_workflow_tool()
+    remove = create_remove_node_tool()
+    # tool bodies, without langchain's per-call tracing overhead
+    connect, validate, remove = connect.func, validate.func, remove.func
+
+    timings = {}
+    wf = SimpleWorkflow(name=f"{n}-node workflow")
+    with workflow_context(wf):
+        t0 = time.perf_counter()
+        prev = None
+        for i in range(n):
+            is_if = i % 10 == 5
+            node = WorkflowNode(id=f"id-{i}", name=f"Step {i}", type="IF" if is_if else "HTTP REQUEST",
+                                type_version=1, position=(0, 0), role="trigger" if i == 0 else None)
+            wf.add_node(node)
+            if prev:
+                connect(prev, node.name)
+            prev = node.name
+            if is_if:
+                wf.add_node(WorkflowNode(id=f"id-{i}-else", name=f"Step {i} else", type="SLACK",
+                                         type_version=1, position=(0, 0)))
+                connect(node.name, f"Step {i} else")
+        timings["build"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for node in list(wf.nodes):
+            assert wf.get_node_by_name(node.name) is node and wf.get_node_by_id(node.id) is node
+        timings["lookups"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        assert "passed" in validate()
+        timings["validate"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        out = wf.to_output_dict()
+        timings["output"] = time.perf_counter() - t0
+        assert len(out["nodes"]) == len(wf.nodes)
+
+        t0 = time.perf_counter()
+        for i in range(3, n, 20):
+            remove(f"Step {i}")
+        timings["remove"] = time.perf_counter() - t0
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    register_node_types([
+        {"name": "HTTP REQUEST", "nodeType": "action"},
+        {"name": "SLACK", "nodeType": "action"},
+        {"name": "IF", "nodeType": "conditional"},
+    ])
+    print(f"{'nodes':>6}" + "".join(f"{p + ' ms':>13}" for p in PHASES) + f"{'total ms':>12}")
+    for n in args.nodes:
+        runs = [run_once(n) for _ in range(args.runs)]
+        medians = {p: statistics.median(r[p] for r in runs) * 1000 for p in PHASES}
+        print(f"{n:>6}" + "".join(f"{medians[p]:>13.1f}" for p in PHASES) + f"{sum(medians.values()):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
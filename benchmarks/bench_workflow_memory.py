@@ -0,0 +1,86 @@
+# benchmarks/bench_workflow_memory.py
+"""
+Resident memory of live SimpleWorkflows — what SessionStore keeps per session.
+
+  estimate     session_store.estimate_size (the store's own accounting),
+               split into nodes (objects + parameters) and graph (edge
+               storage + indexes)
+  traced       tracemalloc growth while building --workflows of them,
+               per workflow
+
+Workflows: N nodes, a chain with an IF every 10th node whose false branch
+is a leaf action. Every string comes out of json.loads, like the LLM tool
+calls that build real sessions, so nothing is shared by accident.
+
+Usage:
+    python benchmarks/bench_workflow_memory.py [--nodes 100] [--workflows 200]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.state.session_store import estimate_size  # noqa: E402
+from backend.types.workflow import SimpleWorkflow, WorkflowNode  # noqa: E402
+
+TYPES = ["HTTP REQUEST", "SLACK", "GMAIL", "GOOGLE SHEETS", "NOTION", "OPENAI", "WEBHOOK", "CODE"]
+
+
+def tool_calls(n: int) -> list:
+    """add_node / connect payloads, as decoded from model output."""
+    calls = []
+    for i in range(n):
+        is_if = i % 10 == 5
+        calls.append(["add", str(uuid.uuid4()), f"Step {i}", "IF" if is_if else TYPES[i % len(TYPES)],
+                      "trigger" if i == 0 else ("conditional" if is_if else "action"),
+                      {"resource": "record", "operation": "create", "note": f"step {i}"}])
+        if i:
+            calls.append(["connect", f"Step {i - 1}", f"Step {i}"])
+        if is_if:
+            calls.append(["add", str(uuid.uuid4()), f"Step {i} else", "SLACK", "action", {"text": "skipped"}])
+            calls.append(["connect", f"Step {i}", f"Step {i} else"])
+    return calls
+
+
+def build(payload: str) -> SimpleWorkflow:
+    wf = SimpleWorkflow(name="Memory benchmark")
+    for call in json.loads(payload):
+        if call[0] == "add":
+            _, node_id, name, node_type, role, params = call
+            wf.add_node(WorkflowNode(id=node_id, name=name, type=node_type, type_version=1,
+                                     position=(0, 0), parameters=params, role=role))
+        else:
+            wf.connect(call[1], call[2])
+    return wf
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=100)
+    parser.add_argument("--workflows", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = [json.dumps(tool_calls(args.nodes)) for _ in range(args.workflows)]
+    sample = build(payloads[0])
+    total = estimate_size(sample)
+    nodes = estimate_size(sample.nodes)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    live = [build(p) for p in payloads]
+    traced = (tracemalloc.get_traced_memory()[0] - before) / len(live)
+    tracemalloc.stop()
+
+    print(f"{len(sample.nodes)} nodes, {sample.connection_count} connections per workflow")
+    print(f"{'estimate KB':>12}{'nodes KB':>10}{'graph KB':>10}{'traced KB':>11}{'sessions/GB':>13}")
+    print(f"{total / 1024:>12.1f}{nodes / 1024:>10.1f}{(total - nodes) / 1024:>10.1f}"
+          f"{traced / 1024:>11.1f}{2**30 / traced:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+# benchmarks/load_test.py
+"""
+End-to-end load test for the FastAPI service (POST /workflow).
+
+Targets (pick one):
+  default        in-process — main.app driven through httpx.ASGITransport,
+                 lifespan run in this process (no sockets, no uvicorn)
+  --uvicorn      spawns `uvicorn main:app` on --port and drives it over HTTP
+  --url URL      an already running server
+
+LLM calls are served by the record/replay stand-in (LLM_MODE defaults to
+"replay" here), so runs are repeatable and cost nothing. Record the
+cassettes once against Groq:
+
+    LLM_MODE=record python benchmarks/load_test.py --users 1 --duration 60
+
+Elasticsearch is optional — without it the service falls back to the local
+node file (NODES_JSONL_PATH / NODES_JSON_PATH) and in-memory search.
+
+Load shapes:
+  closed loop    --users N       N virtual users, each sends its next request
+                                 as soon as the previous one returns
+  open loop      --rate R        Poisson arrivals at R req/s, independent of
+                                 how fast the server answers
+
+Traffic mix: --mix greeting=1,build=3,modify=1 (relative weights)
+
+Report: throughput, latency p50/p90/p99 per request kind, error rate and a
+per-stage breakdown parsed from the Server-Timing response header.
+
+--stream sends the same traffic to POST /workflow/stream (SSE) instead and
+additionally reports time-to-first-event; stage times come from the
+"stage" done events. httpx.ASGITransport buffers whole responses, so
+client-side TTFE is only meaningful with --uvicorn / --url (the server-side
+yzero_stream_first_event_seconds histogram is exact either way).
+
+Usage:
+    python benchmarks/load_test.py --users 8 --duration 30
+    python benchmarks/load_test.py --rate 5 --duration 60 --mix build=1
+    python benchmarks/load_test.py --uvicorn --users 16 --latency recorded
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+PROMPTS: Dict[str, List[str]] = {
+    "greeting": [
+        "hi",
+        "hello there",
+        "what can you do?",
+        "thanks!",
+    ],
+    "build": [
+        "Send a Telegram message to my team every morning at 9am",
+        "When a webhook is received, call an HTTP API and post the result to Slack",
+        "Every hour fetch data from an API, if the status is error send an email otherwise log to Slack",
+        "Manually fetch a web page, summarise it with OpenAI and send the summary on Telegram",
+    ],
+    "modify": [
+        "Add a Slack notification after the HTTP request",
+        "Change the schedule to run every 30 minutes",
+        "Remove the Telegram node and send an email instead",
+        "Add an IF node that checks the status before sending",
+    ],
+}
+
+
+# Set from --stream
+STREAM = False
+
+
+# ── Results ──
+
+class Sample:
+    __slots__ = ("kind", "status", "latency_ms", "stages", "error", "ttfe_ms")
+
+    def __init__(self, kind: str, status: int, latency_ms: float,
+                 stages: Dict[str, float], error: Optional[str] = None,
+                 ttfe_ms: Optional[float] = None):
+        self.kind = kind
+        self.status = status
+        self.latency_ms = latency_ms
+        self.stages = stages
+        self.error = error
+        self.ttfe_ms = ttfe_ms
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 300
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """'builder;dur=812.3, total;dur=900.1' → {"builder": 812.3, "total": 900.1}"""
+    stages: Dict[str, float] = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and name:
+                try:
+                    stages[name] = float(value)
+                except ValueError:
+                    pass
+    return stages
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+# ── Traffic ──
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for item in spec.split(","):
+        kind, _, weight = item.partition("=")
+        kind = kind.strip()
+        if kind not in PROMPTS:
+            raise SystemExit(f"Unknown request kind '{kind}' (known: {', '.join(PROMPTS)})")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+class Traffic:
+    def __init__(self, mix: Dict[str, float], builder_mode: Optional[str], seed: int):
+        self.kinds = list(mix)
+        self.weights = [mix[k] for k in self.kinds]
+        self.builder_mode = builder_mode
+        self.rng = random.Random(seed)
+        self.counter = 0
+
+    def next_request(self) -> tuple:
+        kind = self.rng.choices(self.kinds, weights=self.weights)[0]
+        self.counter += 1
+        body = {
+            "message": self.rng.choice(PROMPTS[kind]),
+            "session_id": f"load-{self.counter}",
+        }
+        if self.builder_mode and kind != "greeting":
+            body["builder_mode"] = self.builder_mode
+        return kind, body
+
+
+async def send_stream(client: httpx.AsyncClient, kind: str, body: dict) -> Sample:
+    """POST /workflow/stream and read the SSE stream to the done event."""
+    t0 = time.perf_counter()
+    ttfe_ms = None
+    stages: Dict[str, float] = defaultdict(float)
+    error = None
+    try:
+        async with client.stream("POST", "/workflow/stream", json=body) as response:
+            if response.status_code >= 300:
+                text = (await response.aread()).decode("utf-8", "replace")
+                return Sample(kind, response.status_code, (time.perf_counter() - t0) * 1000,
+                              {}, text[:200])
+            event = ""
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    event = line[7:]
+                    # The session event is sent before the pipeline starts
+                    if ttfe_ms is None and event != "session":
+                        ttfe_ms = (time.perf_counter() - t0) * 1000
+                elif line.startswith("data: "):
+                    data = json.loads(line[6:])
+                    if event == "stage" and data.get("status") == "done":
+                        stages[data["step"]] += data.get("meta", {}).get("elapsed_ms", 0.0)
+                    elif event == "error":
+                        error = data.get("detail", "error")
+                    elif event == "done":
+                        stages["total"] = data.get("total_ms", 0.0)
+                        break
+            status = response.status_code
+    except Exception as e:
+        return Sample(kind, 0, (time.perf_counter() - t0) * 1000, {}, f"{type(e).__name__}: {e}")
+    return Sample(kind, status, (time.perf_counter() - t0) * 1000, dict(stages), error, ttfe_ms)
+
+
+async def send(client: httpx.AsyncClient, kind: str, body: dict) -> Sample:
+    if STREAM:
+        return await send_stream(client, kind, body)
+    t0 = time.perf_counter()
+    try:
+        response = await client.post("/workflow", json=body)
+        latency_ms = (time.perf_counter() - t0) * 1000
+        error = None if response.status_code < 300 else response.text[:200]
+        return Sample(kind, response.status_code, latency_ms,
+                      parse_server_timing(response.headers.get("server-timing", "")), error)
+    except Exception as e:
+        return Sample(kind, 0, (time.perf_counter() - t0) * 1000, {}, f"{type(e).__name__}: {e}")
+
+
+async def closed_loop(client, traffic: Traffic, users: int, duration: float) -> List[Sample]:
+    samples: List[Sample] = []
+    deadline = time.perf_counter() + duration
+
+    async def user():
+        while time.perf_counter() < deadline:
+            kind, body = traffic.next_request()
+            samples.append(await send(client, kind, body))
+
+    await asyncio.gather(*(user() for _ in range(users)))
+    return samples
+
+
+async def open_loop(client, traffic: Traffic, rate: float, duration: float) -> List[Sample]:
+    samples: List[Sample] = []
+    tasks: List[asyncio.Task] = []
+    deadline = time.perf_counter() + duration
+
+    async def one(kind, body):
+        samples.append(await send(client, kind, body))
+
+    next_at = time.perf_counter()
+    while next_at < deadline:
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        kind, body = traffic.next_request()
+        tasks.append(asyncio.create_task(one(kind, body)))
+        next_at += traffic.rng.expovariate(rate)
+
+    # Arrivals stop at the deadline; in-flight requests still count
+    await asyncio.gather(*tasks)
+    return samples
+
+
+# ── Report ──
+
+def report(samples: List[Sample], elapsed: float, label: str) -> None:
+    print(f"\n=== {label} ===")
+    if not samples:
+        print("No requests completed.")
+        return
+
+    ok = [s for s in samples if s.ok]
+    print(f"requests    {len(samples)}  ({len(ok)} ok, {len(samples) - len(ok)} failed, "
+          f"{100.0 * (len(samples) - len(ok)) / len(samples):.1f}% errors)")
+    print(f"elapsed     {elapsed:.1f}s")
+    print(f"throughput  {len(samples) / elapsed:.2f} req/s  ({len(ok) / elapsed:.2f} ok/s)")
+
+    print(f"\n{'kind':<10} {'n':>6} {'err%':>6} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    by_kind: Dict[str, List[Sample]] = defaultdict(list)
+    for s in samples:
+        by_kind[s.kind].append(s)
+    for kind in sorted(by_kind) + ["all"]:
+        group = samples if kind == "all" else by_kind[kind]
+        latencies = [s.latency_ms for s in group if s.ok]
+        errors = 100.0 * sum(1 for s in group if not s.ok) / len(group)
+        print(f"{kind:<10} {len(group):>6} {errors:>6.1f} {percentile(latencies, 50):>10.1f} "
+              f"{percentile(latencies, 90):>10.1f} {percentile(latencies, 99):>10.1f} "
+              f"{max(latencies, default=0.0):>10.1f}")
+
+    ttfe = [s.ttfe_ms for s in ok if s.ttfe_ms is not None]
+    if ttfe:
+        print(f"\ntime to first event  p50 {percentile(ttfe, 50):.1f} ms  "
+              f"p90 {percentile(ttfe, 90):.1f} ms  p99 {percentile(ttfe, 99):.1f} ms")
+
+    stage_values: Dict[str, List[float]] = defaultdict(list)
+    for s in ok:
+        for stage, ms in s.stages.items():
+            stage_values[stage].append(ms)
+    if stage_values:
+        print(f"\n{'stage':<14} {'n':>6} {'mean ms':>10} {'p50 ms':>10} {'p99 ms':>10}")
+        for stage in sorted(stage_values, key=lambda k: (k == "total", k)):
+            values = stage_values[stage]
+            print(f"{stage:<14} {len(values):>6} {sum(values) / len(values):>10.1f} "
+                  f"{percentile(values, 50):>10.1f} {percentile(values, 99):>10.1f}")
+
+    errors: Dict[str, int] = defaultdict(int)
+    for s in samples:
+        if not s.ok:
+            errors[f"[{s.status}] {s.error}"] += 1
+    if errors:
+        print("\nerrors:")
+        for message, count in sorted(errors.items(), key=lambda kv: -kv[1])[:5]:
+            print(f"  {count:>5} × {message[:140]}")
+
+
+# ── Targets ──
+
+async def _run(client: httpx.AsyncClient, args, traffic: Traffic) -> None:
+    if args.warmup:
+        print(f"Warmup: {args.warmup} request(s)...")
+        for _ in range(args.warmup):
+            kind, body = traffic.next_request()
+            await send(client, kind, body)
+
+    t0 = time.perf_counter()
+    if args.rate:
+        samples = await open_loop(client, traffic, args.rate, args.duration)
+        label = f"open loop, {args.rate} req/s, {args.duration:.0f}s"
+    else:
+        samples = await closed_loop(client, traffic, args.users, args.duration)
+        label = f"closed loop, {args.users} user(s), {args.duration:.0f}s"
+    report(samples, time.perf_counter() - t0, label)
+
+
+async def run_in_process(args, traffic: Traffic) -> None:
+    import main
+
+    async with main.app.router.lifespan_context(main.app):
+        # The orchestrator warms up in the background (STARTUP_BACKGROUND)
+        if not await main.STARTUP.wait(timeout=120.0):
+            raise SystemExit(f"Service did not become ready: {main.STARTUP.to_dict()}")
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest",
+                                     timeout=args.timeout) as client:
+            await _run(client, args, traffic)
+
+
+async def run_http(args, traffic: Traffic, base_url: str) -> None:
+    limits = httpx.Limits(max_connections=max(args.users, 100))
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        await _run(client, args, traffic)
+
+
+async def _wait_ready(base_url: str, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=2.0) as client:
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get("/ready")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.25)
+    raise SystemExit(f"Server at {base_url} did not become ready within {timeout:.0f}s")
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--uvicorn", action="store_true", help="spawn uvicorn main:app and test over HTTP")
+    target.add_argument("--url", help="test an already running server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--users", type=int, default=4, help="closed-loop virtual users")
+    parser.add_argument("--rate", type=float, default=0.0, help="open-loop arrival rate (req/s)")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of load")
+    parser.add_argument("--mix", default="greeting=1,build=3,modify=1")
+    parser.add_argument("--builder-mode", choices=["tools", "plan"], default=None)
+    parser.add_argument("--stream", action="store_true", help="use POST /workflow/stream (SSE)")
+    parser.add_argument("--latency", default=None,
+                        help="replay latency: ms or 'recorded' (sets LLM_REPLAY_LATENCY_MS)")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Before main / llm_provider are imported (in-process) or spawned (uvicorn)
+    os.environ.setdefault("LLM_MODE", "replay")
+    if args.latency is not None:
+        os.environ["LLM_REPLAY_LATENCY_MS"] = args.latency
+
+    global STREAM
+    STREAM = args.stream
+    traffic = Traffic(parse_mix(args.mix), args.builder_mode, args.seed)
+    print(f"LLM_MODE={os.environ['LLM_MODE']}  mix={args.mix}")
+
+    if args.url:
+        asyncio.run(run_http(args, traffic, args.url.rstrip("/")))
+        return
+
+    if not args.uvicorn:
+        asyncio.run(run_in_process(args, traffic))
+        return
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=os.environ.copy(),
+    )
+    try:
+        async def go():
+            await _wait_ready(base_url, timeout=120.0)
+            await run_http(args, traffic, base_url)
+        asyncio.run(go())
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,7 +1,9 @@
 # llm_provider.py — COMPLETE FILE REPLACE KARO
 
+from langchain_core.language_models import BaseChatModel
 from langchain_groq import ChatGroq
 from backend.utils.config import Config 
+from backend.utils.llm_metrics import LLMMetricsCallback
 import os
 
 
@@ -55,26 +57,57 @@ def _safe_model(requested: str, valid_set: set, fallback: str, label: str) -> st
     return requested
 
 
-def get_llm(temperature: float = None) -> ChatGroq:
+def _build_chat_model(model: str, temperature: float) -> BaseChatModel:
+    """
+    Real ChatGroq, or the record/replay stand-in depending on LLM_MODE.
+    Replay never touches Groq, so no API key is needed there.
+    The returned model carries the metrics callback (latency / tokens per call);
+    the inner recording model does not, so nothing is counted twice.
+    """
+    mode = Config.LLM_MODE
+    if mode not in ("live", "record", "replay"):
+        print(f"⚠️  LLM_MODE='{mode}' unknown. Using 'live'.")
+        mode = "live"
+
+    inner = None
+    if mode != "replay":
+        inner = ChatGroq(
+            model=model,
+            groq_api_key=_get_api_key(),
+            temperature=temperature,
+            max_retries=2,
+        )
+        if mode == "live":
+            inner.callbacks = [LLMMetricsCallback(model)]
+            return inner
+
+    from backend.utils.llm_cassette import CassetteChatModel, get_cassette_store
+
+    latency = Config.LLM_REPLAY_LATENCY_MS
+    print(f"-->LLM {mode} mode | cassettes: {Config.LLM_CASSETTE_DIR} | latency: {latency}")
+    return CassetteChatModel(
+        mode=mode,
+        model_name=model,
+        store=get_cassette_store(Config.LLM_CASSETTE_DIR),
+        inner=inner,
+        latency_ms=None if latency == "recorded" else float(latency or 0),
+        callbacks=[LLMMetricsCallback(model)],
+    )
+
+
+def get_llm(temperature: float = None) -> BaseChatModel:
     """Tool-calling capable LLM — for Builder and Configurator agents."""
-    api_key = _get_api_key()
     temp = temperature if temperature is not None else float(Config.LLM_TEMPERATURE)
 
     requested = Config.LLM_MODEL or DEFAULT_TOOL_MODEL
     model = _safe_model(requested, TOOL_CAPABLE_MODELS, DEFAULT_TOOL_MODEL, "LLM_MODEL")
 
     print(f"-->Tool LLM: {model}")
-    return ChatGroq(
-        model=model,
-        groq_api_key=api_key,
-        temperature=temp,
-        max_retries=2,
-    )
+    return _build_chat_model(model, temp)
 
 
-def get_llm_no_tools(temperature: float = None) -> ChatGroq:
+def get_llm_no_tools(temperature: float = None) -> BaseChatModel:
     """Plain chat LLM — for Greeter, Discovery, Supervisor agents (no tool calling needed)."""
-    api_key = _get_api_key()
     temp = temperature if temperature is not None else float(Config.LLM_TEMPERATURE)
 
     # LLM_MODEL_FAST → LLM_MODEL → DEFAULT_FAST_MODEL
@@ -83,9 +116,4 @@ def get_llm_no_tools(temperature: float = None) -> ChatGroq:
     model = _safe_model(requested, set(), DEFAULT_FAST_MODEL, "LLM_MODEL_FAST")
 
     print(f"-->Fast LLM: {model}")
-    return ChatGroq(
-        model=model,
-        groq_api_key=api_key,
-        temperature=temp,
-        max_retries=2,
-    )
\ No newline at end of file
+    return _build_chat_model(model, temp)
\ No newline at end of file
@@ -168,23 +168,45 @@
 
 
 # main.py - FastAPI Backend
-from fastapi import FastAPI, HTTPException
+import time
+_IMPORT_STARTED = time.perf_counter()   # startup profile: "import main"
+
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Literal, Tuple
 import json
 import os
 # from dotenv import load_dotenv
 from contextlib import asynccontextmanager
-import httpx
+import asyncio
+import importlib
+import uuid
 # from backend.utils.node_loader import fetch_nodes_from_api
 # from backend.utils.node_normalizer import load_and_normalize_nodes
 from backend.utils.es_indexer import reindex_all
 from backend.utils.config import Config
+from backend.utils import metrics
+from backend.tracker.pipeline_tracker import (
+    StepStatus, emit, emit_done, set_event_sink, start_gc, stop_gc, subscribe, unsubscribe,
+)
+from backend.tracker.event_sink import create_event_sink
+from backend.engines.job_queue import Job, JobQueue, QueueFull
+from backend.engines.single_flight import IDEMPOTENCY_CACHE, SINGLE_FLIGHT, request_key
+from backend.utils.startup import STARTUP
+from backend.utils.fast_json import dumps, trusted_response
+from backend.utils.http_cache import (
+    EncodedBodyCache, compress, decode_cursor, encode_cursor, etag_matches,
+    negotiate_encoding, strong_etag,
+)
 
 # load_dotenv()
 
-from submain import WorkflowBuilderOrchestrator
+# submain (langchain, langgraph, langchain_groq, elasticsearch, agents) is
+# imported by warm_up() after the server is up — see backend/utils/startup.py
+if TYPE_CHECKING:
+    from submain import WorkflowBuilderOrchestrator
 
 # # Load node types locally
 # try:
@@ -202,12 +224,45 @@ from submain import WorkflowBuilderOrchestrator
 # print(f"-->> Loaded {len(NODE_TYPES)} node types")
 
 
-orchestrator: Optional[WorkflowBuilderOrchestrator] = None
+orchestrator: Optional["WorkflowBuilderOrchestrator"] = None
+job_queue: Optional[JobQueue] = None
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
+# Set by prefork.py in the parent before it forks the workers: the catalogue
+# already normalized, deduped and indexed, shared copy-on-write (gc.freeze)
+SHARED_NODE_TYPES: Optional[List[Dict[str, Any]]] = None
+
+
+async def load_node_types() -> List[Dict[str, Any]]:
+    """Node catalogue from Elasticsearch, local node file as fallback."""
+    from backend.utils.es_loader import load_nodes_from_es
+    node_types = await load_nodes_from_es()
+
+    if not node_types:
+        # ES down / empty (local runs, load tests) → local node file
+        from backend.utils.node_normalizer import load_and_normalize_nodes
+        print("⚠️  No nodes from Elasticsearch — falling back to local node file")
+        node_types = load_and_normalize_nodes()
+
+    if not node_types:
+        raise RuntimeError(
+            "No nodes loaded from Elasticsearch or NODES_JSONL_PATH / NODES_JSON_PATH! "
+            "Make sure ES is running and index is populated."
+        )
+    return node_types
+
+
+async def warm_up() -> None:
+    """
+    Everything expensive, timed into the startup profile. Runs in the
+    background (STARTUP_BACKGROUND) so /health answers at once; endpoints
+    return 503 and /ready stays false until `orchestrator` is set here.
+    """
     global orchestrator
 
+    with STARTUP.phase("import pipeline"):
+        # Thread: the event loop keeps serving /health and /ready meanwhile
+        submain = await asyncio.to_thread(importlib.import_module, "submain")
+
     # # Nodes load karo — API first, local file fallback
     # nodes_api_url = os.getenv("NODES_API_URL", "").strip()
 
@@ -224,23 +279,29 @@ async def lifespan(app: FastAPI):
 
         # Naya — ES se nodes load karo
         
-    from backend.utils.es_loader import load_nodes_from_es
-    NODE_TYPES = await load_nodes_from_es()
-
-    if not NODE_TYPES:
-        raise RuntimeError(
-            "No nodes loaded from Elasticsearch! "
-            "Make sure ES is running and index is populated."
-        )
+    shared = SHARED_NODE_TYPES is not None
+    with STARTUP.phase("load catalogue"):
+        if shared:
+            NODE_TYPES = SHARED_NODE_TYPES
+            print(f"--> {len(NODE_TYPES)} nodes pre-loaded by the prefork parent (pid {os.getppid()})")
+        else:
+            NODE_TYPES = await load_node_types()
+    STARTUP.mark("catalog")
 
     # print(f"--> {len(NODE_TYPES)} nodes loaded from Elasticsearch")
 
     try:
         # api_key = os.getenv("GROQ_API_KEY")
         api_key = Config.GROQ_API_KEY
-        if not api_key:
+        if not api_key and Config.LLM_MODE != "replay":
             raise ValueError("GROQ_API_KEY not set in environment variables")
-        orchestrator = WorkflowBuilderOrchestrator(api_key=api_key, node_types=NODE_TYPES)
+        with STARTUP.phase("init orchestrator"):
+            # LLM clients, ES client + ping, agents, graph compile — all sync
+            orch = await asyncio.to_thread(
+                submain.WorkflowBuilderOrchestrator,
+                api_key=api_key, node_types=NODE_TYPES, catalog_prepared=shared,
+            )
+        STARTUP.mark("llm_clients")
         print("-->> Orchestrator initialized successfully")
     except Exception as e:
         print(f"X Failed to initialize orchestrator: {e}")
@@ -248,14 +309,72 @@ async def lifespan(app: FastAPI):
 
     #3. ES reindex (runs after orchestrator so search_engine exists) ──
     # This is async + idempotent — safe to run every startup
+    # (prefork workers skip it: the parent indexed once for all of them)
+    with STARTUP.phase("search index"):
+        try:
+            if not shared:
+                await reindex_all(orch.search_engine, NODE_TYPES)
+        except Exception as e:
+            # ES failure must NOT crash the server
+            print(f"X ES reindex skipped: {e}")
+        # First query pays for ES caches / lazy in-memory structures, not a user
+        await asyncio.to_thread(orch.search_engine.search_by_name, "http request", 1)
+    with STARTUP.phase("catalog version"):
+        # GET /nodes ETag base — hashed once here instead of on the event loop
+        await asyncio.to_thread(lambda: orch.search_engine.catalog_version)
+    STARTUP.mark("search_index")
+
+    orchestrator = orch
+
+
+async def _warm_up_in_background() -> None:
     try:
-        await reindex_all(orchestrator.search_engine, NODE_TYPES)
+        await warm_up()
+    except asyncio.CancelledError:
+        raise
     except Exception as e:
-        # ES failure must NOT crash the server
-        print(f"X ES reindex skipped: {e}")
- 
+        import traceback
+        traceback.print_exc()
+        STARTUP.fail(e)
+    STARTUP.report()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global orchestrator, job_queue
+
+    STARTUP.record("import main", (_APP_IMPORTED - _IMPORT_STARTED) * 1000)
+    if Config.STARTUP_BACKGROUND:
+        warmup = asyncio.create_task(_warm_up_in_background())
+    else:
+        warmup = None
+        try:
+            await warm_up()
+        except Exception as e:
+            STARTUP.fail(e)
+            STARTUP.report()
+            raise
+        STARTUP.report()
+
+    start_gc()   # idle pipeline_tracker queues
+    event_sink = create_event_sink()
+    set_event_sink(event_sink)
+    job_queue = JobQueue(run_job)
+    job_queue.start()
+
     yield  # ← server runs here
-    
+
+    if warmup is not None and not warmup.done():
+        warmup.cancel()            # shut down while still warming up
+        await asyncio.gather(warmup, return_exceptions=True)
+    await job_queue.stop()         # running jobs are cancelled
+    job_queue = None
+    await stop_gc()
+    if event_sink is not None:
+        set_event_sink(None)
+        await event_sink.close()   # flush what is still buffered
+    if orchestrator is not None:
+        await orchestrator.close() # flush queued session checkpoints
     orchestrator = None
     print("-->> Orchestrator shutdown complete")
 
@@ -274,6 +393,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(metrics.MetricsMiddleware)
 
 
 # ------------------------------------------------------------------
@@ -283,6 +403,17 @@ app.add_middleware(
 class WorkflowRequest(BaseModel):
     message: str
     session_id: Optional[str] = None
+    # "tools" (agentic tool loop) | "plan" (single JSON plan) — default: BUILDER_MODE env
+    builder_mode: Optional[Literal["tools", "plan"]] = None
+
+class BatchRequest(BaseModel):
+    items: List[WorkflowRequest] = Field(..., min_length=1)
+    # Pipelines run at once for this batch — default BATCH_CONCURRENCY, capped at BATCH_MAX_CONCURRENCY
+    concurrency: Optional[int] = Field(None, ge=1)
+
+class JobRequest(WorkflowRequest):
+    # "high" jobs are picked up before "normal" before "low"
+    priority: Literal["high", "normal", "low"] = "normal"
 
 class HandleBoundItem(BaseModel):
     id: str
@@ -393,6 +524,17 @@ def extract_assistant_message(result: dict, fallback: str = "Done") -> str:
     return fallback
 
 
+def server_timing_header(stage_timings: Dict[str, float], total_ms: float) -> str:
+    """
+    Per-stage wall time as a Server-Timing header, e.g.
+    'greeter;dur=2.1, builder;dur=8120.4, total;dur=8301.0'.
+    Read by benchmarks/load_test.py and visible in browser devtools.
+    """
+    parts = [f"{stage};dur={ms:.1f}" for stage, ms in stage_timings.items()]
+    parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+
 # ------------------------------------------------------------------
 # Routes
 # ------------------------------------------------------------------
@@ -402,84 +544,415 @@ async def health_check():
     return {"status": "healthy", "message": "Workflow Builder API is running"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """200 once catalogue, search index and LLM clients are warm; 503 (with what is pending) before."""
+    body = STARTUP.to_dict()
+    if not body["ready"] or orchestrator is None:
+        return JSONResponse(status_code=503, content=body)
+    return body
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus scrape endpoint — see backend/utils/metrics.py for the series."""
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 # @app.get("/node-types")
 # async def get_node_types():
 #     return {"node_types": NODE_TYPES[:20], "count": len(NODE_TYPES)}
 
+NODES_PAGE_CACHE = EncodedBodyCache(int(Config.NODES_CACHE_MB * 1024 * 1024))
+
+
+def _nodes_page(engine, after: Optional[str], limit: int, fields, encoding: Optional[str]) -> bytes:
+    """Project + serialize + compress one catalogue page (runs in a thread)."""
+    nodes, last = engine.list_nodes(after, limit, fields)
+    body = dumps({
+        "nodes":       nodes,
+        "count":       len(nodes),
+        "total":       len(engine.node_types),
+        "next_cursor": encode_cursor(last) if last else None,
+        "version":     engine.catalog_version,
+    })
+    return compress(body, encoding)
+
+
+@app.get("/nodes")
+async def list_nodes(
+    cursor: Optional[str] = None,
+    limit: int = Query(Config.NODES_PAGE_SIZE, ge=1, le=Config.NODES_MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="comma list, e.g. name,displayName,properties — * for all"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    """
+    Node catalogue ordered by name, `limit` per page — pass `next_cursor`
+    back as `cursor`. Without `fields` the heavy parts (properties, codex,
+    class_*) are left out. Strong ETag per catalogue version + query +
+    encoding; If-None-Match with it → 304.
+    """
+    if not orchestrator:
+        raise HTTPException(status_code=503, detail="Orchestrator not ready")
+    engine = orchestrator.search_engine
+
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    projection = None
+    if fields:
+        requested = {f.strip() for f in fields.split(",")}
+        projection = sorted({f for f in requested if f and not f.startswith("_")} | {"name"})
+
+    encoding = negotiate_encoding(accept_encoding)
+    etag = strong_etag(engine.catalog_version, after or "", limit,
+                       ",".join(projection or ["-"]), encoding or "identity")
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    body = NODES_PAGE_CACHE.get(etag)
+    if body is None:
+        body = await asyncio.to_thread(_nodes_page, engine, after, limit, projection, encoding)
+        NODES_PAGE_CACHE.put(etag, body)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def build_workflow_payload(result: dict, session_id: Optional[str]) -> dict:
+    """Final graph state → WorkflowResponse dict (shared by /workflow and /workflow/stream)."""
+
+    # ── Check if greeter short-circuited the pipeline ──────────
+    greeter_proceed = result.get("greeter_proceed", True)
+
+    if not greeter_proceed:
+        # Greeter handled it — no workflow built, just return the reply
+        reply = extract_assistant_message(result, fallback="Hello! How can I help you?")
+        print(f"--> Greeter response returned to frontend: {reply[:80]}...")
+        return {
+            "id":         1,
+            "name":       "Chat",
+            "nodes":      [],
+            "edges":      [],
+            "viewport":   {"x": 0, "y": 0, "zoom": 1},
+            "publish":    0,
+            "response":   reply,
+            "session_id": session_id or "default",
+        }
+
+    # Get the SimpleWorkflow object from state
+    workflow = result.get("workflow_json")
+    if workflow is None:
+        raise ValueError("No workflow returned from orchestrator")
+
+    # Produce the output-format dict
+    # to_output_dict() returns {name, nodes, edges}
+    # to_dict() is the old internal format - do NOT use it here
+    if hasattr(workflow, 'to_output_dict'):
+        output = workflow.to_output_dict()
+    else:
+        # Fallback: if an old workflow object somehow got in, wrap it safely
+        output = {"name": getattr(workflow, 'name', 'Workflow'), "nodes": [], "edges": []}
+
+    assistant_message = extract_assistant_message(
+        result, fallback="-->> Workflow built successfully"
+    )
+
+    return {
+        "id":         output.get("id", 1),
+        "name":       output["name"],
+        "nodes":      output["nodes"],
+        "edges":      output["edges"],
+        "viewport":   output.get("viewport", {"x": 0, "y": 0, "zoom": 1}),
+        "publish":    output.get("publish", 0),
+        "response":   assistant_message,
+        "session_id": session_id or "default",
+    }
+
+
+async def run_workflow(
+    message: str, session_id: Optional[str], builder_mode: Optional[str]
+) -> Tuple[dict, Dict[str, float]]:
+    """
+    One pipeline run → (WorkflowResponse dict, stage timings).
+    Identical concurrent calls share a single run (SINGLE_FLIGHT).
+    """
+    async def run():
+        result = await orchestrator.process_message(
+            message,
+            builder_mode=builder_mode,
+            # Events only go anywhere when an event sink is configured
+            session_id=session_id or f"req-{uuid.uuid4().hex}",
+            # A client-supplied session_id continues that conversation
+            remember=session_id is not None,
+        )
+        return build_workflow_payload(result, session_id), result.get("stage_timings") or {}
+
+    if not Config.SINGLE_FLIGHT:
+        return await run()
+    out, _ = await SINGLE_FLIGHT.do(request_key(message, session_id, builder_mode), run)
+    return out
+
 
 @app.post("/workflow", response_model=WorkflowResponse)
-async def build_workflow(request: WorkflowRequest):
+async def build_workflow(
+    request: WorkflowRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+):
     if not orchestrator:
         raise HTTPException(status_code=503, detail="Orchestrator not initialized")
     if not request.message.strip():
         raise HTTPException(status_code=400, detail="Message cannot be empty")
 
-    try:
-        result = await orchestrator.process_message(request.message)
-
-
-        # ── Check if greeter short-circuited the pipeline ──────────
-        greeter_proceed = result.get("greeter_proceed", True)
-
-        if not greeter_proceed:
-            # Greeter handled it — no workflow built, just return the reply
-            reply = extract_assistant_message(result, fallback="Hello! How can I help you?")
-            print(f"--> Greeter response returned to frontend: {reply[:80]}...")
-            return {
-                "id":         1,
-                "name":       "Chat",
-                "nodes":      [],
-                "edges":      [],
-                "viewport":   {"x": 0, "y": 0, "zoom": 1},
-                "publish":    0,
-                "response":   reply,
-                "session_id": request.session_id or "default",
-            }
-
-        # Get the SimpleWorkflow object from state
-        workflow = result.get("workflow_json")
-        if workflow is None:
-            raise ValueError("No workflow returned from orchestrator")
-
-        # Produce the output-format dict
-        # to_output_dict() returns {name, nodes, edges}
-        # to_dict() is the old internal format - do NOT use it here
-        if hasattr(workflow, 'to_output_dict'):
-            output = workflow.to_output_dict()
-        else:
-            # Fallback: if an old workflow object somehow got in, wrap it safely
-            output = {"name": getattr(workflow, 'name', 'Workflow'), "nodes": [], "edges": []}
-
-        # Get last assistant message
-        # assistant_message = "Workflow built successfully"
-        # for msg in reversed(result.get("messages", [])):
-        #     if isinstance(msg, dict) and msg.get("role") == "assistant":
-        #         assistant_message = msg.get("content", assistant_message)
-        #         break
-        #     elif hasattr(msg, "content") and getattr(msg, "type", "") == "ai":
-        #         assistant_message = msg.content
-        #         break
-
-        assistant_message = extract_assistant_message(
-            result, fallback="-->> Workflow built successfully"
-        )
+    # A retry whose first attempt already finished → same response, no new turn
+    fingerprint = request_key(request.message, request.session_id, request.builder_mode)
+    if idempotency_key:
+        cached = IDEMPOTENCY_CACHE.get(idempotency_key)
+        if cached is not None:
+            if cached[0] != fingerprint:
+                raise HTTPException(status_code=422,
+                                    detail="Idempotency-Key was already used for a different request")
+            return trusted_response(cached[1], headers={"Idempotent-Replayed": "true"})
 
-        return {
-            "id":         output.get("id", 1),
-            "name":       output["name"],
-            "nodes":      output["nodes"],
-            "edges":      output["edges"],
-            "viewport":   output.get("viewport", {"x": 0, "y": 0, "zoom": 1}),
-            "publish":    output.get("publish", 0),
-            "response":   assistant_message,
-            "session_id": request.session_id or "default",
-        }
+    try:
+        t0 = time.perf_counter()
+        payload, stage_timings = await run_workflow(request.message, request.session_id, request.builder_mode)
+        # Built by to_output_dict() — encoded once, not re-validated (VALIDATE_RESPONSES=true in debug)
+        response = trusted_response(payload, WorkflowResponse, headers={
+            "Server-Timing": server_timing_header(stage_timings, (time.perf_counter() - t0) * 1000),
+        })
+        if idempotency_key:
+            IDEMPOTENCY_CACHE.put(idempotency_key, fingerprint, response.body)
+        return response
 
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error building workflow: {str(e)}")
 
+
+# ------------------------------------------------------------------
+# Async jobs — submit, poll, cancel (backend/engines/job_queue.py)
+# ------------------------------------------------------------------
+
+async def run_job(job: Job) -> dict:
+    """Job worker body: same pipeline as POST /workflow."""
+    result = await orchestrator.process_message(
+        job.message,
+        builder_mode=job.builder_mode,
+        session_id=job.session_id or f"job-{job.id}",
+        remember=job.session_id is not None,
+    )
+    return build_workflow_payload(result, job.session_id)
+
+
+def _job_body(job: Job) -> dict:
+    body = job.to_dict()
+    position = job_queue.position(job)
+    if position is not None:
+        body["queue_position"] = position
+    return body
+
+
+def _get_job(job_id: str) -> Job:
+    if not job_queue:
+        raise HTTPException(status_code=503, detail="Job queue not running")
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found (or expired)")
+    return job
+
+
+@app.post("/workflow/jobs", status_code=202)
+async def submit_job(request: JobRequest, response: Response):
+    """Queue a workflow build and return its job id immediately."""
+    if not orchestrator or not job_queue:
+        raise HTTPException(status_code=503, detail="Orchestrator not initialized")
+    if not request.message.strip():
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+    try:
+        job = job_queue.submit(
+            request.message,
+            session_id=request.session_id,
+            builder_mode=request.builder_mode,
+            priority=request.priority,
+        )
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=f"Job queue full: {e}", headers={"Retry-After": "5"})
+    response.headers["Location"] = f"/workflow/jobs/{job.id}"
+    return _job_body(job)
+
+
+@app.get("/workflow/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status of a job; `result` holds the WorkflowResponse once status is done."""
+    return trusted_response(_job_body(_get_job(job_id)))
+
+
+@app.post("/workflow/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job. Finished jobs are returned unchanged."""
+    _get_job(job_id)
+    return _job_body(job_queue.cancel(job_id))
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+
+@app.post("/workflow/stream")
+async def stream_workflow(request: WorkflowRequest):
+    """
+    Same pipeline as POST /workflow, streamed as server-sent events:
+
+      event: session   {"session_id"}                       — immediately
+      event: stage     {"step", "status", "message", ...}   — every stage start / end
+      event: node      {"meta": {"node": {id, name, type, role}}} — each node the builder adds
+      event: result    WorkflowResponse dict                 — final output
+      event: error     {"detail"}                            — pipeline failed
+      event: done      {"ttfe_ms", "total_ms"}               — end of stream
+
+    ttfe_ms = time to the first pipeline event, tracked apart from total_ms
+    (yzero_stream_first_event_seconds / yzero_stream_duration_seconds).
+    Disconnecting cancels the pipeline. Concurrent streams with one session_id
+    each get every stage / node event, but only their own result / error / done.
+    """
+    if not orchestrator:
+        raise HTTPException(status_code=503, detail="Orchestrator not initialized")
+    if not request.message.strip():
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+
+    session_id = request.session_id or f"stream-{uuid.uuid4().hex}"
+    # Tags this stream's result / error / done — other streams of the same
+    # session get them too (every subscriber sees every event)
+    run = uuid.uuid4().hex
+
+    async def run_pipeline():
+        try:
+            result = await orchestrator.process_message(
+                request.message, builder_mode=request.builder_mode, session_id=session_id,
+                remember=request.session_id is not None,
+            )
+            await emit(session_id, "result", StepStatus.DONE, "Workflow ready", meta={
+                "kind": "result", "run": run,
+                "output": build_workflow_payload(result, request.session_id),
+            })
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            await emit(session_id, "pipeline", StepStatus.ERROR, f"Error building workflow: {e}",
+                       meta={"kind": "error", "run": run})
+        finally:
+            await emit_done(session_id, run)
+
+    async def events():
+        t0 = time.perf_counter()
+        ttfe_ms = None
+        # Subscribe before the pipeline starts so no event is skipped
+        queue = subscribe(session_id)
+        task = asyncio.create_task(run_pipeline())
+        try:
+            yield _sse("session", {"session_id": session_id})
+            while True:
+                event = await queue.get()
+                if event.meta.get("run", run) != run:
+                    continue        # another stream's result / error / done
+                if ttfe_ms is None:
+                    ttfe_ms = (time.perf_counter() - t0) * 1000
+                    metrics.STREAM_FIRST_EVENT_SECONDS.observe(ttfe_ms / 1000)
+
+                if event.step == "__done__":
+                    total_ms = (time.perf_counter() - t0) * 1000
+                    metrics.STREAM_SECONDS.observe(total_ms / 1000)
+                    yield _sse("done", {"ttfe_ms": round(ttfe_ms, 1), "total_ms": round(total_ms, 1)})
+                    break
+
+                kind = event.meta.get("kind")
+                if kind == "result":
+                    yield _sse("result", event.meta["output"])
+                elif kind == "error":
+                    yield _sse("error", {"detail": event.message})
+                elif kind == "node":
+                    yield _sse("node", event.to_dict())
+                else:
+                    yield _sse("stage", event.to_dict())
+        finally:
+            # Client gone or stream finished — stop the pipeline, free the queue
+            if not task.done():
+                task.cancel()
+            unsubscribe(session_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/workflow/batch")
+async def batch_workflow(request: BatchRequest):
+    """
+    Many workflow requests in one call, streamed back as NDJSON in completion order:
+
+      {"index": 3, "status": "ok", "ms": 812.4, "result": WorkflowResponse}
+      {"index": 0, "status": "error", "ms": 40.1, "error": "..."}
+      {"done": true, "ok": 9, "errors": 1, "total_ms": 5120.3}   — last line
+
+    Items run through run_workflow (so identical items coalesce with each
+    other and with live /workflow calls), at most `concurrency` at a time.
+    A failed item is reported on its line; the batch carries on.
+    """
+    if not orchestrator:
+        raise HTTPException(status_code=503, detail="Orchestrator not initialized")
+    if len(request.items) > Config.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {Config.BATCH_MAX_ITEMS} items per batch")
+
+    concurrency = min(request.concurrency or Config.BATCH_CONCURRENCY, Config.BATCH_MAX_CONCURRENCY)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_item(index: int, item: WorkflowRequest) -> dict:
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                if not item.message.strip():
+                    raise ValueError("Message cannot be empty")
+                payload, _ = await run_workflow(item.message, item.session_id, item.builder_mode)
+                line = {"index": index, "status": "ok", "result": payload}
+            except Exception as e:
+                print(f"X Batch item {index} failed: {e}")
+                line = {"index": index, "status": "error", "error": f"Error building workflow: {e}"}
+            line["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+            metrics.BATCH_ITEMS.labels(line["status"]).inc()
+            return line
+
+    async def lines():
+        t0 = time.perf_counter()
+        tasks = [asyncio.create_task(run_item(i, item)) for i, item in enumerate(request.items)]
+        counts = {"ok": 0, "error": 0}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                line = await next_done
+                counts[line["status"]] += 1
+                yield dumps(line) + b"\n"
+            yield dumps({
+                "done": True, "ok": counts["ok"], "errors": counts["error"],
+                "total_ms": round((time.perf_counter() - t0) * 1000, 1),
+            }) + b"\n"
+        finally:
+            # Client gone → items not started yet are dropped
+            for task in tasks:
+                task.cancel()
+
+    print(f"--> Batch: {len(request.items)} items, concurrency {concurrency}")
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # from backend.utils.Workflow_trans import transform_workflow
 
 # @app.post("/workflow/publish")
@@ -544,6 +1017,9 @@ async def es_status():
         return {"es_available": True, "error": str(e)}
 
 
+_APP_IMPORTED = time.perf_counter()
+
+
 if __name__ == "__main__":
     import uvicorn
     print("🚀 Starting Workflow Builder API on http://localhost:8000")
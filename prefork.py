@@ -0,0 +1,201 @@
+# prefork.py - Pre-fork multi-worker launcher
+"""
+Runs main.app in N worker processes that share ONE copy of the node catalogue.
+
+`uvicorn main:app --workers N` spawns fresh interpreters: every worker
+fetches the catalogue from ES, normalizes it, builds `_by_name` /
+`_NODE_REGISTRY` and keeps its own copy of every node's properties, so
+memory grows linearly with workers. Here the parent does that once:
+
+  1. import main and submain (langchain / langgraph / agents — main itself
+     imports them lazily, here they are wanted before the fork)
+  2. load + normalize + dedupe + index the catalogue (NodeSearchEngine)
+  3. gc.collect(); gc.freeze() — the surviving objects move to the permanent
+     generation, so the collector in the workers never writes to their
+     pages and copy-on-write keeps them shared
+  4. bind the listening socket, fork the workers; each runs its own
+     uvicorn server + event loop + orchestrator (LLM clients, ES client,
+     checkpointer) on the inherited socket
+
+Worker crashes are respawned; SIGINT / SIGTERM stop all workers.
+
+--report N prints RSS / PSS / USS per process from /proc/<pid>/smaps_rollup
+N seconds after start. PSS is the fair share (shared pages divided by the
+processes mapping them) — the sum is what the deployment really uses.
+--no-share skips step 2 (each worker loads its own catalogue, like
+--workers) for comparison; benchmarks/bench_prefork.py runs both.
+
+Sessions, the job queue and single-flight are per worker. Durable sessions
+go through the shared SQLite checkpoint file, but a worker's in-memory
+session copy is not invalidated by turns served by another worker — route
+a session_id to one worker (sticky load balancing) or set
+SESSION_MAX_COUNT=0 to always read the checkpoint.
+
+Usage:
+    python prefork.py --workers 4 --port 8000
+    python prefork.py --workers 4 --report 20
+"""
+
+import argparse
+import asyncio
+import gc
+import importlib
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List
+
+import uvicorn
+
+import main
+
+_ROLLUP_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def prepare_catalog() -> int:
+    """Load the catalogue in the parent and freeze everything allocated so far."""
+    from backend.engines.node_search_engine import NodeSearchEngine
+
+    t0 = time.perf_counter()
+    node_types = asyncio.run(main.load_node_types())
+    engine = NodeSearchEngine(node_types)   # normalize, dedupe, ES index, register_node_types
+    if engine._es is not None:
+        engine._es.close()                  # workers open their own connections
+    main.SHARED_NODE_TYPES = engine.node_types
+    del engine, node_types
+
+    gc.collect()
+    gc.freeze()
+    print(f"-->> Catalogue ready in parent: {len(main.SHARED_NODE_TYPES)} nodes, "
+          f"{gc.get_freeze_count()} objects frozen ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+    return len(main.SHARED_NODE_TYPES)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, log_level: str) -> None:
+    """Child process body — never returns."""
+    code = 0
+    try:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        config = uvicorn.Config(main.app, log_level=log_level)
+        uvicorn.Server(config).run(sockets=[sock])
+    except BaseException as e:
+        print(f"X Worker {os.getpid()} crashed: {e}")
+        code = 1
+    finally:
+        sys.stdout.flush()
+        os._exit(code)
+
+
+def memory(pid: int) -> Dict[str, int]:
+    """smaps_rollup fields in kB, plus USS (private pages only)."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in _ROLLUP_FIELDS:
+                values[key] = int(rest.split()[0])
+    values["Uss"] = values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)
+    return values
+
+
+def report_memory(parent: int, workers: List[int]) -> Dict[str, int]:
+    print(f"\n{'process':<16}{'RSS MB':>10}{'PSS MB':>10}{'USS MB':>10}{'shared MB':>11}")
+    totals = {"Rss": 0, "Pss": 0, "Uss": 0}
+    for label, pid in [("parent", parent)] + [(f"worker {i}", p) for i, p in enumerate(workers)]:
+        try:
+            m = memory(pid)
+        except OSError:
+            continue
+        for k in totals:
+            totals[k] += m[k]
+        print(f"{label + ' ' + str(pid):<16}{m['Rss'] / 1024:>10.1f}{m['Pss'] / 1024:>10.1f}"
+              f"{m['Uss'] / 1024:>10.1f}{(m['Rss'] - m['Uss']) / 1024:>11.1f}")
+    print(f"{'TOTAL':<16}{totals['Rss'] / 1024:>10.1f}{totals['Pss'] / 1024:>10.1f}{totals['Uss'] / 1024:>10.1f}")
+    print(f"-->> Memory actually used (sum of PSS): {totals['Pss'] / 1024:.1f} MB "
+          f"for {len(workers)} workers\n", flush=True)
+    return totals
+
+
+def main_loop(args) -> None:
+    importlib.import_module("submain")   # code + module objects shared by all workers
+    if args.no_share:
+        print("--> --no-share: every worker loads its own catalogue")
+        gc.collect()
+        gc.freeze()
+    else:
+        prepare_catalog()
+
+    sock = bind_socket(args.host, args.port)
+    print(f"🚀 Starting Workflow Builder API on http://{args.host}:{args.port} ({args.workers} workers)")
+
+    workers: Dict[int, int] = {}   # pid → slot
+    stopping = False
+
+    def spawn(slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            run_worker(sock, args.log_level)
+        workers[pid] = slot
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    for slot in range(args.workers):
+        spawn(slot)
+
+    report_at = time.monotonic() + args.report if args.report else None
+    while workers:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid == 0:
+            if report_at and time.monotonic() >= report_at:
+                report_at = None
+                report_memory(os.getpid(), sorted(workers, key=workers.get))
+            time.sleep(0.2)
+            continue
+        slot = workers.pop(pid, None)
+        if slot is not None and not stopping:
+            print(f"⚠️  Worker {pid} exited (status {status}) — respawning")
+            spawn(slot)
+
+    sock.close()
+    print("-->> All workers stopped")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Pre-fork multi-worker launcher for main.app")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "4")))
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--report", type=float, default=0,
+                        help="print per-process RSS/PSS/USS this many seconds after start")
+    parser.add_argument("--no-share", action="store_true",
+                        help="workers load the catalogue themselves (comparison baseline)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main_loop(parse_args())
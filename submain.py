@@ -2,8 +2,9 @@
 # submain.py
 """
 Key fixes applied:
-1. Tools are now bound to the workflow INSTANCE (not state dict) so mutations persist
-2. Tools are recreated each request so they bind to the fresh workflow object
+1. Tools act on the request's workflow INSTANCE (not state dict) so mutations persist
+2. Tools are created and bound to the LLM once; the per-request workflow is
+   passed through backend/tools/context.py (workflow_context ContextVar)
 3. WorkflowState no longer tries to serialize dataclasses through LangGraph checkpointer
 4. Supervisor uses deterministic routing instead of LLM (avoids infinite loops)
 5. Messages in state are handled as dicts consistently
@@ -16,35 +17,58 @@ from backend.agents.greeter import GreeterAgent
 from llm_provider import get_llm, get_llm_no_tools
 from typing import Dict, Any, Optional
 from backend.state.workflow_state import WorkflowState, create_initial_state
+from backend.state.session_store import SESSION_STORE
+from backend.state.sqlite_checkpointer import create_checkpointer
+from backend.utils.config import Config
 from backend.engines.node_search_engine import NodeSearchEngine
 from backend.agents.supervisor import SupervisorAgent
 from backend.agents.discovery import DiscoveryAgent
 from backend.agents.builder import BuilderAgent
+from backend.agents.plan_builder import PlanBuilderAgent
+from backend.agents.modifier import ModifierAgent
 from backend.agents.configurator import ConfiguratorAgent
 from backend.tools.search_nodes import create_search_nodes_tool
 from backend.tools.get_node_details import create_get_node_details_tool
 from backend.tools.add_node import create_add_node_tool
 from backend.tools.connect_nodes import create_connect_nodes_tool
 from backend.tools.update_parameters import create_update_parameters_tool
+from backend.tools.remove_node import create_remove_node_tool
+from backend.tools.rewire_connection import create_rewire_connection_tool
 from backend.tools.validate_workflow import create_validate_workflow_tool
 from backend.tools.resolve_node_type import create_resolve_node_type_tool
+from backend.tools.context import workflow_context
 from backend.types.coordination import CoordinationLogEntry
 from backend.types.workflow import SimpleWorkflow
 from datetime import datetime
 import json
+import time
 from backend.tracker.pipeline_tracker import emit, emit_done, StepStatus
+from backend.utils import metrics
+from backend.utils.llm_metrics import TOOL_CALLBACK
+
+
+# Human-readable stage labels for pipeline events
+STAGE_MESSAGES = {
+    "greeter":      "Understanding your request",
+    "supervisor":   "Routing",
+    "discovery":    "Finding the right nodes",
+    "builder":      "Building the workflow",
+    "configurator": "Configuring node parameters",
+    "responder":    "Preparing the response",
+}
 
 
 class WorkflowBuilderOrchestrator:
     """Main orchestrator for workflow building"""
 
-    def __init__(self, api_key: str, node_types: list):
+    def __init__(self, api_key: str, node_types: list, catalog_prepared: bool = False):
         self.llm = get_llm()              # tool-calling capable (for builder/configurator)
         self.llm_fast = get_llm_no_tools()   # plain LLM (for discovery/supervisor)
         self.node_types = node_types
 
         # Initialize search engine (stateless - can be shared)
-        self.search_engine = NodeSearchEngine(node_types)
+        # catalog_prepared: prefork workers get the parent's normalized, indexed list
+        self.search_engine = NodeSearchEngine(node_types, prepared=catalog_prepared)
         print(f" --> Node search engine initialized with {len(node_types)} node types")
 
         # Agents that don't depend on per-request workflow state
@@ -52,27 +76,45 @@ class WorkflowBuilderOrchestrator:
         self.supervisor = SupervisorAgent(self.llm_fast)
         self.discovery = DiscoveryAgent(self.llm_fast)
 
-        # Build graph (builder/configurator tools are recreated per request)
+        # Builder/configurator tools: schemas generated and bound ONCE here.
+        # Each request binds its workflow via workflow_context() in the graph node.
+        builder_tools, configurator_tools, modifier_tools = self._create_tools()
+        self.builder = BuilderAgent(self.llm, builder_tools, self.search_engine)
+        self.plan_builder = PlanBuilderAgent(self.llm, self.search_engine, builder_tools[-1])
+        self.modifier = ModifierAgent(self.llm, modifier_tools, self.search_engine, builder_tools[-1])
+        self.configurator = ConfiguratorAgent(self.llm, configurator_tools)
+
+        # Multi-turn conversations (process_message(..., remember=True)):
+        # hot states in memory, durable copy in the SQLite checkpointer
+        self.sessions = SESSION_STORE
+        self.checkpointer = create_checkpointer()
+
         self.graph = self._build_graph()
+        # Remembered turns run on a checkpointed copy (needs a thread_id per run)
+        self.durable_graph = (
+            self._build_graph(self.checkpointer) if self.checkpointer else self.graph
+        )
         print(" --> LangGraph workflow graph compiled successfully")
 
-    def _create_request_tools(self, workflow: SimpleWorkflow):
+    def _create_tools(self):
         """
-        Create tools bound to a specific workflow instance.
-        Must be called per-request since tools mutate the workflow object.
+        Create the builder/configurator tools once per orchestrator.
+        Workflow-mutating tools read the request's workflow from
+        backend/tools/context.py, so the same instances serve every request.
 
         Builder tools: search, inspect, add nodes, connect nodes
         Configurator tools: update parameters, validate
+        Modifier tools: edit an existing workflow (validate runs outside the LLM loop)
         """
         # connect_nodes returns a tuple of (by_name_tool, by_id_tool)
-        connect_by_name, connect_by_id = create_connect_nodes_tool(workflow)
+        connect_by_name, connect_by_id = create_connect_nodes_tool()
 
         # validate_workflow is shared - builder uses it to verify, configurator uses it too
-        validate_tool = create_validate_workflow_tool(workflow)
+        validate_tool = create_validate_workflow_tool()
 
         builder_tools = [
             create_search_nodes_tool(self.search_engine),        # search to find exact node names
-            create_add_node_tool(workflow, self.search_engine),  # auto-resolves unknown types
+            create_add_node_tool(self.search_engine),            # auto-resolves unknown types
             connect_by_name,   # primary - LLM uses node names
             connect_by_id,     # fallback - LLM uses UUIDs from add_node response
             validate_tool,     # call ONCE at the end
@@ -82,26 +124,38 @@ class WorkflowBuilderOrchestrator:
         #     validate_tool,     # reuse same instance
         # ]
 
-        # _create_request_tools mein configurator_tools update karo:
+        # _create_tools mein configurator_tools update karo:
         configurator_tools = [
-            create_update_parameters_tool(workflow),   # ← sirf workflow pass karo, llm aur search_engine nahi
+            create_update_parameters_tool(),   # ← workflow comes from workflow_context()
             validate_tool,
         ]
 
 
-        return builder_tools, configurator_tools
+        modifier_tools = [
+            configurator_tools[0],             # update_parameters
+            create_remove_node_tool(),
+            create_rewire_connection_tool(),
+            builder_tools[1],                  # add_node
+            connect_by_name,
+            builder_tools[0],                  # search_nodes
+        ]
+
+        for t in {id(t): t for t in builder_tools + configurator_tools + modifier_tools}.values():
+            t.callbacks = [TOOL_CALLBACK]
+
+        return builder_tools, configurator_tools, modifier_tools
 
-    def _build_graph(self):
+    def _build_graph(self, checkpointer=None):
         """Build the LangGraph state graph"""
 
         graph = StateGraph(WorkflowState)
 
-        graph.add_node("greeter", self._greeter_node)      
-        graph.add_node("supervisor", self._supervisor_node)
-        graph.add_node("discovery", self._discovery_node)
-        graph.add_node("builder", self._builder_node)
-        graph.add_node("configurator", self._configurator_node)
-        graph.add_node("responder", self._responder_node)
+        graph.add_node("greeter", self._timed("greeter", self._greeter_node))
+        graph.add_node("supervisor", self._timed("supervisor", self._supervisor_node))
+        graph.add_node("discovery", self._timed("discovery", self._discovery_node))
+        graph.add_node("builder", self._timed("builder", self._builder_node))
+        graph.add_node("configurator", self._timed("configurator", self._configurator_node))
+        graph.add_node("responder", self._timed("responder", self._responder_node))
 
         graph.set_entry_point("greeter")
 
@@ -135,7 +189,47 @@ class WorkflowBuilderOrchestrator:
         graph.add_edge("configurator", "supervisor")
         graph.add_edge("responder", END)
 
-        return graph.compile()
+        return graph.compile(checkpointer=checkpointer)
+
+    @staticmethod
+    def _timed(stage: str, node_fn):
+        """
+        Wrap a graph node so its wall time (ms) is added to state["stage_timings"].
+        Stages that run more than once per turn (supervisor) accumulate.
+        Also the metrics stage label for the LLM / tool calls made inside it,
+        and the running / done events streamed by /workflow/stream.
+        """
+        stage_seconds = metrics.STAGE_SECONDS.labels(stage)
+        label = STAGE_MESSAGES.get(stage, stage)
+
+        async def run(state: WorkflowState) -> Dict[str, Any]:
+            session_id = state.get("session_id")
+            if session_id:
+                await emit(session_id, stage, StepStatus.RUNNING, label)
+
+            t0 = time.perf_counter()
+            try:
+                with metrics.stage_context(stage):
+                    update = await node_fn(state)
+            except Exception as e:
+                metrics.STAGE_ERRORS.labels(stage).inc()
+                if session_id:
+                    await emit(session_id, stage, StepStatus.ERROR, str(e)[:200])
+                raise
+            finally:
+                stage_seconds.observe(time.perf_counter() - t0)
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+
+            if session_id:
+                await emit(session_id, stage, StepStatus.DONE, label,
+                           meta={"elapsed_ms": round(elapsed_ms, 1)})
+
+            timings = dict(state.get("stage_timings") or {})
+            timings[stage] = timings.get(stage, 0.0) + elapsed_ms
+            return {**update, "stage_timings": timings}
+
+        run.__name__ = f"{stage}_node"
+        return run
 
     # -------------------------------------------------------------------------
     # Graph node implementations
@@ -152,17 +246,28 @@ class WorkflowBuilderOrchestrator:
         user_message = self._extract_last_user_message(state)
         print(f" --> Greeter agent checking: {user_message[:60]}...")
 
-        result = await self.greeter.handle(user_message)
+        workflow = state.get("workflow_json")
+        result = await self.greeter.handle(user_message, current_workflow=workflow)
         intent = result["intent"]
         should_proceed = result["should_proceed"]
 
         if should_proceed:
             # Real workflow request → continue pipeline
             print(f"   → Intent: {intent} — proceeding to workflow pipeline")
-            return {
+            update = {
                 "greeter_proceed": True,
                 "greeter_intent": intent,
             }
+            if intent == "WORKFLOW_REQUEST" and workflow is not None and workflow.nodes:
+                # New workflow in an existing session — start over, keep the chat history
+                print("   → New request in session — previous workflow discarded")
+                update.update({
+                    "workflow_json": SimpleWorkflow(name="New Workflow"),
+                    "categorization": None,
+                    "best_practices": None,
+                    "node_configurations": {},
+                })
+            return update
         else:
             # Greeting / Guide / Out-of-scope → respond and stop
             reply = result["response"]
@@ -211,18 +316,29 @@ class WorkflowBuilderOrchestrator:
         """Run builder agent using workflow-bound tools"""
         print("🏗️  Builder agent building workflow...")
         workflow = state["workflow_json"]
+        mode = state.get("builder_mode") or "tools"
+        builder = self.plan_builder if mode == "plan" else self.builder
+        if state.get("greeter_intent") == "WORKFLOW_MODIFY" and workflow.nodes:
+            # Existing session workflow → edit it in place instead of rebuilding
+            mode, builder = "modify", self.modifier
 
-        builder_tools, _ = self._create_request_tools(workflow)
-        builder = BuilderAgent(self.llm, builder_tools, self.search_engine)
+        with workflow_context(workflow):
+            result = await builder.build_workflow(state)
 
-        result = await builder.build_workflow(state)
+        metrics.BUILDER_ITERATIONS.labels(mode).observe(result.get("llm_calls", 0))
+        metrics.BUILDER_NODES.labels(mode).observe(result["nodes_added"])
 
         log_entry = CoordinationLogEntry(
             phase="builder",
             status="completed",
             timestamp=datetime.now().timestamp(),
             summary=result["summary"],
-            metadata={"nodes_added": result["nodes_added"]},
+            metadata={
+                "mode": mode,
+                "nodes_added": result["nodes_added"],
+                "llm_calls": result.get("llm_calls", 0),
+                "token_usage": result.get("token_usage", {}),
+            },
         )
 
         print(f"   → {result['nodes_added']} nodes in workflow")
@@ -233,10 +349,8 @@ class WorkflowBuilderOrchestrator:
         print("⚙️  Configurator agent configuring nodes...")
         workflow = state["workflow_json"]
 
-        _, configurator_tools = self._create_request_tools(workflow)
-        configurator = ConfiguratorAgent(self.llm, configurator_tools)
-
-        result = await configurator.configure_workflow(state)
+        with workflow_context(workflow):
+            result = await self.configurator.configure_workflow(state)
 
         log_entry = CoordinationLogEntry(
             phase="configurator",
@@ -287,8 +401,18 @@ class WorkflowBuilderOrchestrator:
         # Optional: build a single-line flow with arrows
         flow_line = " → ".join(node.name for node in workflow.nodes)
 
+        builder_log = next(
+            (e for e in reversed(state.get("coordination_log", [])) if e.phase == "builder"), None
+        )
+        modified = (
+            builder_log is not None
+            and builder_log.metadata.get("mode") == "modify"
+            and builder_log.timestamp >= state.get("turn_started_at", 0.0)
+        )
+
         response = (
-            f"-->> Workflow '{workflow.name}' has been built successfully!\n\n"
+            f"-->> Workflow '{workflow.name}' has been "
+            f"{'updated' if modified else 'built'} successfully!\n\n"
             f"📊 Summary:\n"
             f"  - {len(workflow.nodes)} nodes added\n"
             f"  - {connection_count} connections created\n\n"
@@ -330,7 +454,12 @@ class WorkflowBuilderOrchestrator:
         return ""
 
     async def process_message(
-        self, user_message: str, state: Optional[WorkflowState] = None
+        self,
+        user_message: str,
+        state: Optional[WorkflowState] = None,
+        builder_mode: Optional[str] = None,
+        session_id: Optional[str] = None,
+        remember: bool = False,
     ) -> WorkflowState:
         """
         Process a user message and build a workflow.
@@ -338,12 +467,57 @@ class WorkflowBuilderOrchestrator:
         Args:
             user_message: Natural language description of the desired workflow
             state: Optional existing state for multi-turn conversations
+            builder_mode: "tools" | "plan" — overrides Config.BUILDER_MODE for this request
+            session_id: when set, stage / node events are emitted to pipeline_tracker
+            remember: continue the session_id conversation (session store, then the
+                      checkpointer after an eviction or restart) and store the result;
+                      turns of one session run one at a time
 
         Returns:
             Final WorkflowState after graph execution
         """
+        if not (remember and session_id):
+            return await self._run_turn(user_message, state, builder_mode, session_id)
+
+        async with self.sessions.lock(session_id):
+            if state is None:
+                state = self.sessions.get(session_id)
+            if state is None and self.checkpointer is not None:
+                state = await self._load_checkpoint(session_id)
+            result = await self._run_turn(
+                user_message, state, builder_mode, session_id, durable=True
+            )
+            self.sessions.put(session_id, result)
+            return result
+
+    def _thread_config(self, session_id: str) -> Dict[str, Any]:
+        return {"configurable": {"thread_id": session_id}}
+
+    async def _load_checkpoint(self, session_id: str) -> Optional[WorkflowState]:
+        """Last checkpointed state of a session (None if it never ran here)."""
+        snapshot = await self.durable_graph.aget_state(self._thread_config(session_id))
+        metrics.record_cache("session_checkpoint", bool(snapshot.values))
+        return dict(snapshot.values) if snapshot.values else None
+
+    async def close(self) -> None:
+        if self.checkpointer is not None:
+            await self.checkpointer.close()
+
+    async def _run_turn(
+        self,
+        user_message: str,
+        state: Optional[WorkflowState],
+        builder_mode: Optional[str],
+        session_id: Optional[str],
+        durable: bool = False,
+    ) -> WorkflowState:
         if state is None:
             state = create_initial_state()
+        if builder_mode:
+            state["builder_mode"] = builder_mode
+        state["session_id"] = session_id
+        state["stage_timings"] = {}
+        state["turn_started_at"] = datetime.now().timestamp()
 
         # Append user message to history
         state["messages"].append({"role": "user", "content": user_message})
@@ -353,6 +527,12 @@ class WorkflowBuilderOrchestrator:
         print(f"{'='*60}")
 
         # Run the graph
-        result = await self.graph.ainvoke(state)
+        if durable and self.checkpointer is not None:
+            result = await self.durable_graph.ainvoke(
+                state, config=self._thread_config(session_id),
+                durability=Config.CHECKPOINT_DURABILITY,
+            )
+        else:
+            result = await self.graph.ainvoke(state)
 
         return result
\ No newline at end of file